@@ -4,20 +4,107 @@
 
 from abc import ABCMeta, abstractmethod, abstractproperty
 from collections import namedtuple
+import copy
 import os.path as osp
 
 from six import with_metaclass
 
+from hpcbench.toolbox.class_lib import ClassRegistrar
+from hpcbench.toolbox.loader import (
+    load_eggs,
+    load_entry_point,
+)
+
 __all__ = [
+    'ArrayMetric',
+    'Metric',
     'MetricsExtractor',
     'Benchmark',
+    'Exporter',
 ]
 
+
+class PluginRegistrar(ClassRegistrar, ABCMeta):
+    """Metaclass of the abstract classes that plugins extend.
+    Concrete subclasses, direct or not, are indexed by name.
+    """
+
+
+def find_subclass(clazz, group, name):
+    """Get subclass by name, loading plugins of the given entry points
+    group only if the subclass is not already indexed.
+    Plugins whose entry point name matches the looked up name are loaded
+    first. In that case, the entry point name becomes an alias of the
+    class it refers to.
+
+    :param clazz: top-level class, using ``PluginRegistrar`` metaclass
+    :param group: entry points group providing ``clazz`` subclasses
+    :param name: name of the subclass to retrieve
+    :return: subclass if found, ``None`` otherwise
+    """
+    classes = clazz.SUB_CLASSES
+    if name not in classes:
+        registered = set(classes.values())
+        for symbol in load_entry_point(group, name):
+            if isinstance(symbol, type) and issubclass(symbol, clazz):
+                clazz.register_subclass(symbol, name)
+        loaded = set(classes.values()) - registered
+        if name not in classes and len(loaded) == 1:
+            clazz.register_subclass(loaded.pop(), name)
+    if name not in classes:
+        load_eggs(group)()
+    return classes.get(name)
+
+
 # Metrics have simply a unit and a type
 # namedtuples are compact and have a nice str representation
 Metric = namedtuple("Metric", "unit type")
 
 
+class ArrayMetric(namedtuple("ArrayMetric", "unit type shape")):
+    """Metric whose value is an array of ``type`` elements,
+    for instance one value per message size, or a latency histogram.
+
+    Extractors provide a list or a NumPy array. Values are stored
+    in binary sidecar files, see ``hpcbench.arrays``.
+
+    ``shape`` provides the array dimensions, ``None`` for
+    dimensions of any size. Default is a one-dimensional array.
+    """
+    __slots__ = ()
+
+    # pylint: disable=redefined-builtin
+    def __new__(cls, unit, type, shape=(None,)):
+        return super(ArrayMetric, cls).__new__(cls, unit, type, tuple(shape))
+
+    @property
+    def dtype(self):
+        """Get NumPy data type of the array elements"""
+        import numpy
+        return numpy.dtype(self.type)
+
+    def accepts(self, value):
+        """Tell whether a value is valid for this metric
+
+        :param value: list or NumPy array
+        :rtype: bool
+        """
+        import numpy
+        try:
+            array = numpy.asarray(value)
+        except ValueError:  # ragged nested lists
+            return False
+        if len(array.shape) != len(self.shape) or any(
+                expected is not None and expected != actual
+                for expected, actual in zip(self.shape, array.shape)):
+            return False
+        if not array.size:
+            return True
+        return array.dtype != object and numpy.can_cast(
+            array.dtype, self.dtype, 'same_kind'
+        )
+
+
 class Metrics(object):  # pragma pylint: disable=too-few-public-methods
     """List of common metrics
     """
@@ -82,7 +169,7 @@ class MetricsExtractor(with_metaclass(ABCMeta, object)):
         return osp.join(outdir, 'sterrr.txt')
 
 
-class Benchmark(with_metaclass(ABCMeta, object)):
+class Benchmark(with_metaclass(PluginRegistrar, object)):
     """Declare benchmark utility
     """
 
@@ -102,8 +189,22 @@ class Benchmark(with_metaclass(ABCMeta, object)):
         pass
     # ---
 
+    # default values of the attributes, overridden by the campaign
+    DEFAULT_ATTRIBUTES = {}
+
     def __init__(self, attributes=None):
-        self.attributes = attributes or {}
+        """
+        :param attributes: benchmark attributes, default is a copy
+        of ``DEFAULT_ATTRIBUTES``
+        """
+        if attributes is None:
+            attributes = copy.deepcopy(self.DEFAULT_ATTRIBUTES)
+        self.attributes = attributes
+
+    def attribute(self, name):
+        """Get attribute value, or its default value if unspecified
+        """
+        return self.attributes.get(name, self.DEFAULT_ATTRIBUTES[name])
 
     def __str__(self):
         return self.name
@@ -157,12 +258,37 @@ class Benchmark(with_metaclass(ABCMeta, object)):
         """
         raise NotImplementedError
 
-    def pre_execute(self):
+    def pre_execute(self, execution):
         """Method called before executing one of the command.
         Current working directory is the execution directory.
+
+        :param execution: one of the dictionaries provided by
+        ``execution_matrix``. Overrides without this parameter,
+        ``pre_execute(self)``, are still called but deprecated.
         """
         pass
 
+    def post_execute(self, execution):
+        """Method called after executing one of the command, even if
+        the command failed. Current working directory is the execution
+        directory.
+
+        :param execution: one of the dictionaries provided by
+        ``execution_matrix``. Overrides without this parameter,
+        ``post_execute(self)``, are still called but deprecated.
+        """
+        pass
+
+    def estimated_duration(self, execution):
+        """Estimate how long a command of the execution matrix takes
+
+        :param execution: one of the dictionaries provided by
+        ``execution_matrix``
+        :return: duration in seconds, ``None`` if unknown
+        :rtype: float
+        """
+        del execution  # unused
+
     @abstractproperty
     def metrics_extractors(self):
         """Describe how to extract metrics from files written by
@@ -205,16 +331,108 @@ class Benchmark(with_metaclass(ABCMeta, object)):
                list of metrics to use.
         plotter:
             callable object that will be given metrics to plot
+        errors (optional):
+            ``ci`` or ``stddev``. Data series are built from the
+            statistical summary of the runs having the same metas:
+            metrics provide the mean of every group, and metrics
+            suffixed by ``__error`` the ``(lower, upper)`` error bars.
+            ``hpcbench.plot.plot_errorbars`` is a suitable plotter.
         """
         raise NotImplementedError
 
+    @property
+    def derived_metrics(self):
+        """Describe metrics computed from the metrics and metas of all
+        runs of a category, once they are gathered.
+        See ``hpcbench.derived`` for the expression syntax.
+
+        :return: derived metrics of every category
+        :rtype: dictionary of string (category) -> dictionary of
+        string (metric name) -> dict (description)
+        A description is either an expression, or a dictionary made of
+        the following keys:
+
+        expression:
+            string providing the expression to evaluate
+        unit (optional):
+            unit of the metric
+        reference (optional):
+            ``kwargsql`` expression over metas selecting the reference
+            runs, whose values are available with the ``ref.`` prefix.
+
+        For instance:
+
+        >>> def derived_metrics(self):
+                return dict(
+                    cpu=dict(
+                        throughput=dict(
+                            expression='metas.ops / cpu__total_time',
+                            unit='ops/s',
+                        ),
+                        speedup=dict(
+                            expression='ref.cpu__total_time / '
+                                       'cpu__total_time',
+                            reference=dict(threads=1),
+                        ),
+                    )
+                )
+        """
+        return dict()
+
     @classmethod
     def get_subclass(cls, name):
         """Get Benchmark subclass by name
-        :param name: name returned by ``Benchmark.name`` property
-        :return: instance of ``Benchmark`` class
+        :param name: name returned by ``Benchmark.name`` property,
+        or name of the entry point providing the benchmark
+        :return: subclass of ``Benchmark``
+        """
+        subclass = find_subclass(cls, 'hpcbench.benchmarks', name)
+        if subclass is None:
+            raise NameError("Not a valid Benchmark class: " + name)
+        return subclass
+
+
+class Exporter(with_metaclass(PluginRegistrar, object)):
+    """Export campaign data in an external data silo
+    """
+
+    @abstractproperty
+    def name(self):
+        """Get exporter name. It is also the key of the campaign
+        ``export`` section providing the exporter configuration.
+        :rtype: string
+        """
+        pass
+
+    def __init__(self, campaign):
+        """
+        :param campaign: instance of ``hpcbench.driver.CampaignDriver``
+        """
+        self.campaign = campaign
+
+    @property
+    def config(self):
+        """Get exporter configuration
+
+        :return: content of the ``export.<name>`` section of the campaign
+        :rtype: dictionary
+        """
+        return self.campaign.campaign.export.get(self.name) or {}
+
+    @abstractmethod
+    def export(self):
+        """Export data of the entire campaign.
+        Current working directory is the campaign directory.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_subclass(cls, name):
+        """Get Exporter subclass by name
+        :param name: name returned by ``Exporter.name`` property
+        :return: subclass of ``Exporter``
         """
-        for subclass in cls.__subclasses__():
-            if subclass.name == name:
-                return subclass
-        raise NameError("Not a valid Benchmark class: " + name)
+        subclass = find_subclass(cls, 'hpcbench.exporters', name)
+        if subclass is None:
+            raise NameError("Not a valid Exporter class: " + name)
+        return subclass
@@ -0,0 +1,128 @@
+"""Storage of array metrics values in binary sidecar files
+
+Values of ``hpcbench.api.ArrayMetric`` metrics are not written in
+YAML and JSON reports. They are saved in NumPy ``.npy`` files in the
+run directory, and reports provide a reference to the file instead,
+a dictionary made of the following keys:
+
+array:
+    path to the ``.npy`` file, relative to the directory of the report
+dtype:
+    NumPy data type of the array elements
+shape:
+    array dimensions
+summary:
+    summary scalars of the array: ``min``, ``median``, ``p99``,
+    ``max`` and ``mean``. Empty for empty arrays.
+
+Files are memory-mapped when read, so that only the parts of the
+arrays actually used are loaded.
+
+NumPy is imported on-demand, because it takes time, and most
+commands only handle references.
+"""
+import os.path as osp
+
+REFERENCE_KEY = 'array'
+SUFFIX = '.npy'
+
+
+def save(category, name, value, metric, outdir='.'):
+    """Write value of an array metric in a sidecar file
+
+    :param category: category of the metric
+    :param name: metric name
+    :param value: sequence or NumPy array
+    :param metric: ``hpcbench.api.ArrayMetric`` instance
+    :param outdir: directory where the file is written
+    :return: reference to the file, to be written in reports
+    :rtype: dictionary
+    """
+    import numpy as np
+    array = np.asarray(value, dtype=metric.dtype)
+    filename = '%s.%s%s' % (category, name, SUFFIX)
+    np.save(osp.join(outdir, filename), array)
+    return {
+        REFERENCE_KEY: filename,
+        'dtype': str(array.dtype),
+        'shape': list(array.shape),
+        'summary': summary(array),
+    }
+
+
+def summary(array):
+    """Compute summary scalars of an array
+
+    :return: dictionary name -> float, empty if the array is empty
+    """
+    import numpy as np
+    array = np.asarray(array)
+    if not array.size:
+        return {}
+    return dict(
+        (name, float(value)) for name, value in [
+            ('min', np.min(array)),
+            ('median', np.median(array)),
+            ('p99', np.percentile(array, 99)),
+            ('max', np.max(array)),
+            ('mean', np.mean(array)),
+        ]
+    )
+
+
+def is_reference(value):
+    """Tell whether a metric value is a reference to a sidecar file"""
+    return isinstance(value, dict) and REFERENCE_KEY in value
+
+
+def relocate(reference, directory):
+    """Get reference relative to a parent directory
+
+    :param directory: directory of the report, relative to
+    the new base directory
+    """
+    reference = dict(reference)
+    reference[REFERENCE_KEY] = osp.join(directory, reference[REFERENCE_KEY])
+    return reference
+
+
+def load(reference):
+    """Read array of a reference, memory-mapped
+
+    :param reference: reference returned by ``save``, relative to
+    the current working directory
+    :rtype: numpy array
+    """
+    import numpy as np
+    mmap_mode = 'r' if np.prod(reference['shape']) else None
+    return np.load(reference[REFERENCE_KEY], mmap_mode=mmap_mode)
+
+
+def values(reference):
+    """Read array of a reference, as nested lists of Python objects"""
+    return load(reference).tolist()
+
+
+def resolve(data, func):
+    """Replace all references of a nested structure
+
+    :param data: nested dictionaries and lists
+    :param func: function called with every reference, providing
+    the replacement value, ``load``, ``values``, or ``summary`` for
+    instance
+    :return: copy of ``data``
+    """
+    if is_reference(data):
+        return func(data)
+    elif isinstance(data, dict):
+        return dict(
+            (key, resolve(value, func)) for key, value in data.items()
+        )
+    elif isinstance(data, list):
+        return [resolve(value, func) for value in data]
+    return data
+
+
+def summarize(reference):
+    """Get summary scalars of a reference"""
+    return dict(reference['summary'])
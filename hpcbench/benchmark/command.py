@@ -0,0 +1,202 @@
+"""HPCBench benchmark executing an arbitrary command, entirely
+described in the campaign file
+"""
+import re
+import shlex
+
+from cached_property import cached_property
+import six
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.re_ext import has_flags
+from hpcbench.toolbox.sweep import sweep
+
+
+class RegexExtractor(MetricsExtractor):
+    """Extract metrics from standard output with regular expressions
+
+    Expressions are combined in a single one, made of one optional
+    lookahead per expression, so that the output is scanned only once
+    and expressions may match the same text. Expressions with inline
+    flags, named groups or back-references are searched separately.
+    The first occurrence of every metric is kept.
+    """
+    TYPES = dict(
+        float=float,
+        int=int,
+        str=str,
+    )
+    # Python 2 does not support more than 100 groups, and every
+    # combined expression uses two groups
+    MAX_EXPRESSIONS = 49
+    BACK_REFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+    def __init__(self, metrics):
+        """
+        :param metrics: dictionary of metric name -> description,
+        providing the ``match`` regular expression, with exactly one
+        capturing group providing the metric value, and optional
+        ``type`` and ``unit``
+        """
+        self._metrics = {}
+        self._regexes = []
+        combinable = []
+        for name in sorted(metrics):
+            desc = metrics[name]
+            if desc.get('type', 'float') not in self.TYPES:
+                raise Exception('Unknown type of metric %s: %s' %
+                                (name, desc['type']))
+            self._metrics[name] = Metric(
+                desc.get('unit', ''),
+                self.TYPES[desc.get('type', 'float')]
+            )
+            regex = re.compile(desc['match'], re.MULTILINE)
+            if regex.groups != 1:
+                raise Exception('Regular expression of metric %s must '
+                                'have exactly one capturing group' % name)
+            if regex.groupindex or has_flags(regex, re.MULTILINE) or \
+                    self.BACK_REFERENCE.search(regex.pattern):
+                self._regexes.append((regex, {1: name}))
+            else:
+                combinable.append((name, regex))
+        for i in range(0, len(combinable), self.MAX_EXPRESSIONS):
+            self._regexes.append(
+                self._compile(combinable[i:i + self.MAX_EXPRESSIONS])
+            )
+
+    @classmethod
+    def _compile(cls, expressions):
+        """Build a regular expression made of optional lookaheads, one
+        per expression, matching the first occurrence of every one of
+        them in a single pass.
+
+        :param expressions: list of tuple (metric, compiled regex)
+        :return: compiled regex, and mapping group index -> metric
+        :rtype: tuple
+        """
+        regex = re.compile(
+            ''.join(
+                r'(?:(?=[\s\S]*?(?P<metric%d>%s)))?' % (i, expr.pattern)
+                for i, (_, expr) in enumerate(expressions)
+            ),
+            re.MULTILINE
+        )
+        # the capturing group of an expression follows its named group
+        return regex, dict(
+            (regex.groupindex['metric%d' % i] + 1, name)
+            for i, (name, _) in enumerate(expressions)
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        metrics = {}
+        with open(self.stdout(outdir)) as istr:
+            content = istr.read()
+        for regex, groups in self._regexes:
+            match = regex.search(content)
+            if match is None:
+                continue
+            for group, name in groups.items():
+                if match.group(group) is not None:
+                    metrics[name] = self._metrics[name].type(
+                        match.group(group)
+                    )
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class Command(Benchmark):
+    """Benchmark executing a command, for every combination of a
+    grid of parameters, and extracting metrics from its standard output
+    with regular expressions.
+
+    Attributes:
+
+    command:
+        command to execute, as a string or a list of strings, where
+        ``{name}`` fields are replaced by parameter values.
+    parameters (optional):
+        sweep of the parameters, see ``hpcbench.toolbox.sweep``.
+        For instance a dictionary of parameter name -> list of values
+        to test, every combination of values being executed.
+        Parameters are the metas of the execution.
+    environment (optional):
+        dictionary of additional environment variables, where
+        ``{name}`` fields are replaced by parameter values.
+    metrics:
+        dictionary of metric name -> description, where:
+
+        * **match** is a regular expression with exactly one capturing
+          group providing the metric value. ``^`` and ``$`` match the
+          beginning and end of lines.
+        * **type** is among ``float`` (default), ``int`` and ``str``.
+        * **unit** is the metric unit (optional)
+    category (optional):
+        category of the executions
+    """
+    DEFAULT_ATTRIBUTES = dict(
+        command=None,
+        parameters={},
+        environment={},
+        metrics={},
+        category='command',
+    )
+
+    name = 'command'
+
+    description = """
+        Execute a command described in the campaign file, and extract
+        metrics from its standard output with regular expressions.
+        """
+
+    @property
+    def parameters(self):
+        """Get every point of the parameters sweep
+
+        :rtype: generator of dictionary
+        """
+        return sweep(self.attribute('parameters'))
+
+    @property
+    def execution_matrix(self):
+        command = self.attribute('command')
+        if not command:
+            raise Exception('Missing "command" attribute')
+        if isinstance(command, six.string_types):
+            command = shlex.split(command)
+        environment = self.attribute('environment') or {}
+        for parameters in self.parameters:
+            execution = dict(
+                category=self.attribute('category'),
+                command=[
+                    str(arg).format(**parameters) for arg in command
+                ],
+                metas=parameters,
+            )
+            if environment:
+                execution.update(environment=dict(
+                    (name, str(value).format(**parameters))
+                    for name, value in environment.items()
+                ))
+            yield execution
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            self.attribute('category'):
+                RegexExtractor(self.attribute('metrics')),
+        }
+
+    @property
+    def plots(self):
+        return dict()
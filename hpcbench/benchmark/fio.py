@@ -0,0 +1,218 @@
+"""HPCBench benchmark driver for fio, the flexible I/O tester
+
+    https://github.com/axboe/fio
+"""
+import json
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    MetricsExtractor,
+)
+
+
+class FioExtractor(MetricsExtractor):
+    """Extract bandwidth, IOPS and completion latency percentiles
+    from fio JSON output, for every I/O direction of the job.
+    """
+    DIRECTIONS = ('read', 'write')
+    # fio percentile key -> metric suffix
+    PERCENTILES = {
+        '50.000000': 'clat_p50',
+        '95.000000': 'clat_p95',
+        '99.000000': 'clat_p99',
+        '99.900000': 'clat_p99_9',
+    }
+
+    def __init__(self):
+        self._metrics = dict()
+        for direction in self.DIRECTIONS:
+            self._metrics[direction + '_bandwidth'] = Metric('KiB/s', float)
+            self._metrics[direction + '_iops'] = Metric('ops/s', float)
+            for suffix in self.PERCENTILES.values():
+                self._metrics[direction + '_' + suffix] = Metric('us', float)
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        with open(self.stdout(outdir)) as istr:
+            # skip messages fio may write before the JSON document
+            lines = list(istr)
+        for index, line in enumerate(lines):
+            if line.startswith('{'):
+                data = json.loads(''.join(lines[index:]))
+                break
+        else:
+            raise Exception('Could not find fio JSON output')
+        metrics = {}
+        for job in data['jobs']:
+            for direction in self.DIRECTIONS:
+                stats = job.get(direction)
+                if not stats or not stats.get('io_bytes'):
+                    continue
+                self._extract_direction(direction, stats, metrics)
+        if not metrics:
+            raise Exception('No I/O reported by fio')
+        return metrics
+
+    def _extract_direction(self, direction, stats, metrics):
+        metrics[direction + '_bandwidth'] = float(stats['bw'])
+        metrics[direction + '_iops'] = float(stats['iops'])
+        # fio 3 reports latencies in nanoseconds, fio 2 in microseconds
+        if 'clat_ns' in stats:
+            clat, scale = stats['clat_ns'], 1e-3
+        else:
+            clat, scale = stats['clat'], 1.0
+        percentiles = clat.get('percentile') or {}
+        for key, suffix in self.PERCENTILES.items():
+            if key in percentiles:
+                metrics[direction + '_' + suffix] = (
+                    float(percentiles[key]) * scale
+                )
+
+
+class Fio(Benchmark):
+    """Benchmark wrapper for fio
+
+    Attributes, all optional:
+
+    target:
+        directory where fio creates its files, default is the output
+        directory of the command. Files are removed at the end of
+        every job.
+    block_size, iodepth, numjobs, rw:
+        values of the corresponding fio options to test
+    size:
+        size of the file of every job
+    runtime:
+        duration of every job, in seconds
+    ioengine:
+        fio I/O engine
+    direct:
+        whether to use non-buffered I/O
+    """
+    CATEGORY = 'io'
+
+    DEFAULT_ATTRIBUTES = dict(
+        target=None,
+        block_size=['4k', '1m'],
+        iodepth=[1, 32],
+        numjobs=[1],
+        rw=['read', 'write', 'randread', 'randwrite'],
+        size='1G',
+        runtime=30,
+        ioengine='libaio',
+        direct=True,
+    )
+
+    name = 'fio'
+
+    description = """
+        fio spawns a number of threads or processes doing a particular
+        type of I/O action, to measure storage bandwidth, IOPS and
+        latency.
+        """
+
+    @property
+    def execution_matrix(self):
+        for rw in self.attribute('rw'):
+            for numjobs in self.attribute('numjobs'):
+                for block_size in self.attribute('block_size'):
+                    for iodepth in self.attribute('iodepth'):
+                        yield dict(
+                            category=Fio.CATEGORY,
+                            command=self._command(
+                                rw, numjobs, block_size, iodepth
+                            ),
+                            metas=dict(
+                                rw=rw,
+                                numjobs=numjobs,
+                                block_size=block_size,
+                                iodepth=iodepth,
+                            )
+                        )
+
+    def _command(self, rw, numjobs, block_size, iodepth):
+        command = [
+            'fio',
+            '--name=hpcbench',
+            '--rw=%s' % rw,
+            '--bs=%s' % block_size,
+            '--iodepth=%s' % iodepth,
+            '--numjobs=%s' % numjobs,
+            '--size=%s' % self.attribute('size'),
+            '--runtime=%s' % self.attribute('runtime'),
+            '--time_based',
+            '--ioengine=%s' % self.attribute('ioengine'),
+            '--direct=%s' % int(bool(self.attribute('direct'))),
+            '--unlink=1',
+            '--group_reporting',
+            '--output-format=json',
+        ]
+        target = self.attribute('target')
+        if target:
+            command.append('--directory=%s' % target)
+        return command
+
+    def estimated_duration(self, execution):
+        del execution  # unused
+        return float(self.attribute('runtime'))
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            Fio.CATEGORY: FioExtractor(),
+        }
+
+    @property
+    def plots(self):
+        plots = []
+        for rw in self.attribute('rw'):
+            directions = [
+                direction for direction in FioExtractor.DIRECTIONS
+                if direction in rw or rw.endswith('rw')
+            ]
+            for numjobs in self.attribute('numjobs'):
+                for direction in directions:
+                    for metric, unit in [('iops', 'ops/s'),
+                                         ('clat_p99', 'us')]:
+                        name = "{hostname} {category} %s %s %s" % (
+                            rw, direction, metric
+                        )
+                        plots.append(dict(
+                            name=name + ", numjobs=%s" % numjobs,
+                            select=dict(
+                                metas__rw=rw,
+                                metas__numjobs=numjobs,
+                            ),
+                            series=dict(
+                                metas=['iodepth', 'block_size'],
+                                metrics=['io__%s_%s' % (direction, metric)],
+                            ),
+                            unit=unit,
+                            plotter=Fio.plot_by_iodepth
+                        ))
+        return {Fio.CATEGORY: plots}
+
+    @classmethod
+    def plot_by_iodepth(cls, plt, description, metas, metrics):
+        """Plot one line per block size, with queue depth on the X axis
+        """
+        metric = description['series']['metrics'][0]
+        lines = dict()
+        for iodepth, block_size, value in zip(metas['iodepth'],
+                                              metas['block_size'],
+                                              metrics[metric]):
+            line = lines.setdefault(block_size, ([], []))
+            line[0].append(iodepth)
+            line[1].append(value)
+        for block_size in sorted(lines):
+            plt.plot(lines[block_size][0], lines[block_size][1], 'o-',
+                     label='bs=%s' % block_size)
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('iodepth')
+        plt.ylabel(description['unit'])
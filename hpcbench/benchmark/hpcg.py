@@ -0,0 +1,186 @@
+"""HPCBench benchmark driver for HPCG, the High Performance
+Conjugate Gradients benchmark
+
+    http://www.hpcg-benchmark.org/
+"""
+import glob
+import multiprocessing
+import os.path as osp
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    Metrics,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import launcher_command
+from hpcbench.toolbox.sweep import values
+
+
+class HPCGExtractor(MetricsExtractor):
+    """Extract performance, time, and validation results from the
+    report file written by HPCG in the output directory
+    """
+    REPORT_FILE = 'HPCG-Benchmark*.txt'
+    RATING = 'Final Summary::HPCG result is '
+    TIME = 'Benchmark Time Summary::Total='
+    RESIDUAL = 'Reproducibility Information::Scaled residual mean='
+
+    def __init__(self):
+        self._metrics = dict(
+            gflops=Metric('Gflops', float),
+            time=Metrics.Second,
+            residual=Metric('', float),
+            passed=Metric('bool', bool),
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @classmethod
+    def report_file(cls, outdir):
+        """Get path to the HPCG report file"""
+        files = sorted(glob.glob(osp.join(outdir, cls.REPORT_FILE)))
+        if not files:
+            raise Exception('Could not find HPCG report file')
+        return files[-1]
+
+    def extract(self, outdir, metas):
+        metrics = {}
+        with open(self.report_file(outdir)) as istr:
+            for line in istr:
+                line = line.strip()
+                if line.startswith(self.RATING):
+                    # "VALID with a GFLOP/s rating of=1.234"
+                    status, rating = line[len(self.RATING):].split('=', 1)
+                    metrics['passed'] = status.split()[0] == 'VALID'
+                    metrics['gflops'] = float(rating)
+                elif line.startswith(self.TIME):
+                    metrics['time'] = float(line[len(self.TIME):])
+                elif line.startswith(self.RESIDUAL):
+                    metrics['residual'] = float(line[len(self.RESIDUAL):])
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class HPCG(Benchmark):
+    """Benchmark wrapper for HPCG
+
+    The ``hpcg.dat`` input file is written before every execution.
+
+    Attributes, all optional:
+
+    launcher:
+        MPI launcher command, where ``{process_count}`` is replaced
+        by the number of processes.
+    executable:
+        path to the ``xhpcg`` executable
+    process_count:
+        numbers of MPI processes to test, default is the number of CPUs
+    threads:
+        value of ``OMP_NUM_THREADS``
+    domain:
+        local domain dimensions of every process (nx, ny, nz), each
+        being a multiple of 8
+    runtime:
+        duration of the timed section, in seconds. Official results
+        require at least 1800 seconds.
+    """
+    CATEGORY = 'hpcg'
+    INPUT_FILE = 'hpcg.dat'
+    INPUT_TEMPLATE = """\
+HPCG benchmark input file
+Sandia National Laboratories; University of Tennessee, Knoxville
+{nx} {ny} {nz}
+{runtime}
+"""
+
+    DEFAULT_ATTRIBUTES = dict(
+        launcher='mpirun -np {process_count}',
+        executable='xhpcg',
+        process_count=None,
+        threads=1,
+        domain=[104, 104, 104],
+        runtime=60,
+    )
+
+    name = 'hpcg'
+
+    description = """
+        HPCG solves a sparse linear system with a preconditioned
+        conjugate gradient method, exercising memory and network
+        access patterns of real applications.
+        """
+
+    @property
+    def process_counts(self):
+        """Get numbers of MPI processes to test"""
+        return list(values(
+            self.attribute('process_count') or [multiprocessing.cpu_count()]
+        ))
+
+    @property
+    def execution_matrix(self):
+        nx, ny, nz = self.attribute('domain')
+        for process_count in self.process_counts:
+            yield dict(
+                category=HPCG.CATEGORY,
+                command=launcher_command(
+                    self.attribute('launcher'),
+                    [self.attribute('executable')],
+                    process_count=process_count
+                ),
+                environment=dict(
+                    OMP_NUM_THREADS=str(self.attribute('threads'))
+                ),
+                metas=dict(
+                    process_count=process_count,
+                    nx=nx,
+                    ny=ny,
+                    nz=nz,
+                    runtime=self.attribute('runtime'),
+                )
+            )
+
+    def pre_execute(self, execution):
+        with open(HPCG.INPUT_FILE, 'w') as ostr:
+            ostr.write(HPCG.INPUT_TEMPLATE.format(**execution['metas']))
+
+    def estimated_duration(self, execution):
+        return float(execution['metas']['runtime'])
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            HPCG.CATEGORY: HPCGExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            HPCG.CATEGORY: [
+                dict(
+                    name="{hostname} {category} performance",
+                    series=dict(
+                        metas=['process_count'],
+                        metrics=['hpcg__gflops'],
+                    ),
+                    plotter=HPCG.plot_performance
+                )
+            ]
+        }
+
+    @classmethod
+    def plot_performance(cls, plt, description, metas, metrics):
+        """Plot performance by number of processes
+        """
+        del description  # unused
+        plt.plot(metas['process_count'], metrics['hpcg__gflops'], 'o-')
+        plt.xlabel('processes')
+        plt.ylabel('Gflops')
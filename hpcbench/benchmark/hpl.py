@@ -0,0 +1,255 @@
+"""HPCBench benchmark driver for HPL, the High-Performance Linpack
+
+    http://www.netlib.org/benchmark/hpl/
+"""
+import math
+import multiprocessing
+import re
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    Metrics,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import (
+    launcher_command,
+    physical_memory,
+)
+
+
+class HPLExtractor(MetricsExtractor):
+    """Extract performance, time, and residual check of the first
+    test reported by HPL.
+    """
+    RESULT = re.compile(
+        r'^W\S+\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+([0-9.]+)\s+'
+        r'([0-9.eE+-]+)\s*$'
+    )
+    RESIDUAL = re.compile(r'^\|\|Ax-b\|\|.*=\s*([0-9.eE+-]+)\s+\.+\s+(\w+)')
+
+    def __init__(self):
+        self._metrics = dict(
+            gflops=Metric('Gflops', float),
+            time=Metrics.Second,
+            residual=Metric('', float),
+            passed=Metric('bool', bool),
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        metrics = {}
+        with open(self.stdout(outdir)) as istr:
+            for line in istr:
+                line = line.strip()
+                match = self.RESULT.match(line)
+                if match and 'gflops' not in metrics:
+                    metrics['time'] = float(match.group(5))
+                    metrics['gflops'] = float(match.group(6))
+                    continue
+                match = self.RESIDUAL.match(line)
+                if match and 'residual' not in metrics:
+                    metrics['residual'] = float(match.group(1))
+                    metrics['passed'] = match.group(2) == 'PASSED'
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class HPL(Benchmark):
+    """Benchmark wrapper for HPL
+
+    The ``HPL.dat`` input file is written before every execution.
+    Unless specified, the problem size fills a fraction of the node
+    memory, and processes are arranged in the most square P x Q grid,
+    with P <= Q.
+
+    Attributes, all optional:
+
+    launcher:
+        MPI launcher command, where ``{process_count}`` is replaced
+        by the number of processes.
+    executable:
+        path to the ``xhpl`` executable
+    process_count:
+        number of MPI processes, default is the number of CPUs
+    threads:
+        value of ``OMP_NUM_THREADS``
+    problem_size:
+        order of the matrix (N), default is computed from
+        ``memory_fraction``
+    memory_fraction:
+        fraction of the node physical memory used by the matrix
+    block_size:
+        block size (NB)
+    search:
+        when true, test every block size of ``search_block_size`` and
+        every P x Q grid of the processes, to look for the peak
+        performance (Rmax).
+    search_block_size:
+        block sizes tested by the search
+    """
+    CATEGORY = 'linpack'
+    INPUT_FILE = 'HPL.dat'
+    INPUT_TEMPLATE = """\
+HPLinpack benchmark input file
+Innovative Computing Laboratory, University of Tennessee
+HPL.out      output file name (if any)
+6            device out (6=stdout,7=stderr,file)
+1            # of problems sizes (N)
+{N}          Ns
+1            # of NBs
+{NB}         NBs
+0            PMAP process mapping (0=Row-,1=Column-major)
+1            # of process grids (P x Q)
+{P}          Ps
+{Q}          Qs
+16.0         threshold
+1            # of panel fact
+2            PFACTs (0=left, 1=Crout, 2=Right)
+1            # of recursive stopping criterium
+4            NBMINs (>= 1)
+1            # of panels in recursion
+2            NDIVs
+1            # of recursive panel fact.
+1            RFACTs (0=left, 1=Crout, 2=Right)
+1            # of broadcast
+1            BCASTs (0=1rg,1=1rM,2=2rg,3=2rM,4=Lng,5=LnM)
+1            # of lookahead depth
+1            DEPTHs (>=0)
+2            SWAP (0=bin-exch,1=long,2=mix)
+64           swapping threshold
+0            L1 in (0=transposed,1=no-transposed) form
+0            U  in (0=transposed,1=no-transposed) form
+1            Equilibration (0=no,1=yes)
+8            memory alignment in double (> 0)
+"""
+
+    DEFAULT_ATTRIBUTES = dict(
+        launcher='mpirun -np {process_count}',
+        executable='xhpl',
+        process_count=None,
+        threads=1,
+        problem_size=None,
+        memory_fraction=0.8,
+        block_size=192,
+        search=False,
+        search_block_size=[64, 96, 128, 192, 232, 256],
+    )
+
+    name = 'hpl'
+
+    description = """
+        HPL solves a random dense linear system in double precision
+        arithmetic on distributed-memory computers.
+        """
+
+    @property
+    def process_count(self):
+        """Get number of MPI processes"""
+        return (
+            self.attribute('process_count') or multiprocessing.cpu_count()
+        )
+
+    @classmethod
+    def process_grids(cls, process_count):
+        """Get P x Q grids of processes, with P <= Q,
+        from the most square one
+        """
+        return [
+            (p, process_count // p)
+            for p in range(int(math.sqrt(process_count)), 0, -1)
+            if process_count % p == 0
+        ]
+
+    def problem_size(self, block_size):
+        """Get order of the matrix, multiple of the block size,
+        whose elements fill ``memory_fraction`` of the memory
+        """
+        problem_size = self.attribute('problem_size')
+        if problem_size is None:
+            memory = physical_memory() * self.attribute('memory_fraction')
+            problem_size = int(math.sqrt(memory / 8))
+            problem_size -= problem_size % block_size
+        return problem_size
+
+    @property
+    def execution_matrix(self):
+        process_count = self.process_count
+        grids = self.process_grids(process_count)
+        if self.attribute('search'):
+            block_sizes = self.attribute('search_block_size')
+        else:
+            block_sizes = [self.attribute('block_size')]
+            grids = grids[:1]
+        for block_size in block_sizes:
+            for p, q in grids:
+                yield dict(
+                    category=HPL.CATEGORY,
+                    command=launcher_command(
+                        self.attribute('launcher'),
+                        [self.attribute('executable')],
+                        process_count=process_count
+                    ),
+                    environment=dict(
+                        OMP_NUM_THREADS=str(self.attribute('threads'))
+                    ),
+                    metas=dict(
+                        process_count=process_count,
+                        N=self.problem_size(block_size),
+                        NB=block_size,
+                        P=p,
+                        Q=q,
+                    )
+                )
+
+    def pre_execute(self, execution):
+        metas = execution['metas']
+        with open(HPL.INPUT_FILE, 'w') as ostr:
+            ostr.write(HPL.INPUT_TEMPLATE.format(**metas))
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            HPL.CATEGORY: HPLExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            HPL.CATEGORY: [
+                dict(
+                    name="{hostname} {category} Rmax",
+                    series=dict(
+                        metas=['NB', 'P', 'Q'],
+                        metrics=['linpack__gflops'],
+                    ),
+                    plotter=HPL.plot_rmax
+                )
+            ]
+        }
+
+    @classmethod
+    def plot_rmax(cls, plt, description, metas, metrics):
+        """Plot performance by block size, one line per process grid
+        """
+        del description  # unused
+        lines = dict()
+        for nb, p, q, gflops in zip(metas['NB'], metas['P'], metas['Q'],
+                                    metrics['linpack__gflops']):
+            line = lines.setdefault((p, q), ([], []))
+            line[0].append(nb)
+            line[1].append(gflops)
+        for grid in sorted(lines):
+            plt.plot(lines[grid][0], lines[grid][1], 'o-',
+                     label='%sx%s' % grid)
+        plt.legend(loc='lower right', frameon=False)
+        plt.xlabel('NB')
+        plt.ylabel('Gflops')
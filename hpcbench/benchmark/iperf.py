@@ -0,0 +1,250 @@
+"""HPCBench benchmark driver for iperf3, the TCP network
+throughput benchmark
+
+    https://software.es.net/iperf/
+"""
+import json
+import socket
+import subprocess
+import time
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import launcher_command
+from hpcbench.toolbox.sweep import values
+
+
+class IperfExtractor(MetricsExtractor):
+    """Extract throughput, retransmits and CPU utilization from
+    the JSON output of an iperf3 client
+    """
+    def __init__(self):
+        self._metrics = dict(
+            sent_throughput=Metric('bits/s', float),
+            received_throughput=Metric('bits/s', float),
+            retransmits=Metric('', int),
+            local_cpu=Metric('%', float),
+            remote_cpu=Metric('%', float),
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        with open(self.stdout(outdir)) as istr:
+            data = json.load(istr)
+        if 'error' in data:
+            raise Exception('iperf3 error: ' + data['error'])
+        end = data['end']
+        metrics = dict(
+            sent_throughput=float(end['sum_sent']['bits_per_second']),
+            received_throughput=float(
+                end['sum_received']['bits_per_second']
+            ),
+            retransmits=int(end['sum_sent'].get('retransmits', 0)),
+            local_cpu=float(end['cpu_utilization_percent']['host_total']),
+            remote_cpu=float(
+                end['cpu_utilization_percent']['remote_total']
+            ),
+        )
+        return metrics
+
+
+class Iperf(Benchmark):
+    """Benchmark wrapper for iperf3
+
+    Every execution runs one client connected to an iperf3 server.
+    Unless the ``server`` attribute is given, the server is started on
+    the loopback interface before the execution, and stopped
+    afterward.
+
+    Attributes, all optional:
+
+    executable:
+        path to the ``iperf3`` executable
+    server:
+        host of the iperf3 server, ``null`` to use the loopback interface
+    server_launcher:
+        command prefixed to the iperf3 server command line,
+        where ``{server}`` is replaced by the server host, for instance
+        ``ssh -tt {server}`` to start the server on a peer node.
+        ``null`` to start the server locally, or not at all when
+        ``server`` is given.
+    port:
+        TCP port of the server
+    parallel:
+        numbers of parallel client streams to test
+    window:
+        socket buffer sizes to test, for instance ``256K``,
+        ``null`` to use the system default.
+    duration:
+        duration of every execution, in seconds
+    server_timeout:
+        how long to wait for the server to listen, in seconds
+    """
+    CATEGORY = 'tcp'
+    LOOPBACK = '127.0.0.1'
+    SERVER_LOG = 'iperf3-server.log'
+
+    DEFAULT_ATTRIBUTES = dict(
+        executable='iperf3',
+        server=None,
+        server_launcher=None,
+        port=5201,
+        parallel=[1, 2, 4, 8],
+        window=[None],
+        duration=10,
+        server_timeout=10,
+    )
+
+    def __init__(self):
+        super(Iperf, self).__init__()
+        self._server = None
+
+    name = 'iperf3'
+
+    description = """
+        iperf3 measures the TCP throughput between a client and a
+        server, on the loopback interface or between two nodes.
+        """
+
+    @property
+    def server(self):
+        """Get host of the iperf3 server"""
+        return self.attribute('server') or Iperf.LOOPBACK
+
+    @property
+    def starts_server(self):
+        """Tell whether the benchmark starts the iperf3 server"""
+        return (
+            self.attribute('server') is None or
+            self.attribute('server_launcher') is not None
+        )
+
+    @property
+    def execution_matrix(self):
+        for parallel in values(self.attribute('parallel')):
+            for window in values(self.attribute('window')):
+                command = [
+                    self.attribute('executable'),
+                    '--client', self.server,
+                    '--port', str(self.attribute('port')),
+                    '--parallel', str(parallel),
+                    '--time', str(self.attribute('duration')),
+                    '--json',
+                ]
+                if window is not None:
+                    command += ['--window', str(window)]
+                yield dict(
+                    category=Iperf.CATEGORY,
+                    command=command,
+                    metas=dict(
+                        server=self.server,
+                        parallel=parallel,
+                        window=window,
+                    )
+                )
+
+    def pre_execute(self, execution):
+        del execution  # unused
+        if not self.starts_server:
+            return
+        command = launcher_command(
+            self.attribute('server_launcher'),
+            [
+                self.attribute('executable'),
+                '--server',
+                '--port', str(self.attribute('port')),
+            ],
+            server=self.server
+        )
+        with open(Iperf.SERVER_LOG, 'w') as log:
+            self._server = subprocess.Popen(
+                command, stdout=log, stderr=subprocess.STDOUT
+            )
+        try:
+            self._wait_server()
+        except Exception:
+            self._stop_server()
+            raise
+
+    def post_execute(self, execution):
+        del execution  # unused
+        self._stop_server()
+
+    def _wait_server(self):
+        """Wait until the server accepts connections"""
+        address = (self.server, self.attribute('port'))
+        deadline = time.time() + self.attribute('server_timeout')
+        while True:
+            if self._server.poll() is not None:
+                raise Exception(
+                    'iperf3 server exited with status %s, see %s' %
+                    (self._server.returncode, Iperf.SERVER_LOG)
+                )
+            try:
+                # iperf3 server keeps listening after this bogus client
+                socket.create_connection(address, timeout=1).close()
+                return
+            except socket.error:
+                if time.time() > deadline:
+                    raise Exception('iperf3 server is not listening on '
+                                    '%s:%s' % address)
+                time.sleep(0.1)
+
+    def _stop_server(self):
+        if self._server is None:
+            return
+        if self._server.poll() is None:
+            self._server.terminate()
+            self._server.wait()
+        self._server = None
+
+    def estimated_duration(self, execution):
+        del execution  # unused
+        return float(self.attribute('duration'))
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            Iperf.CATEGORY: IperfExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            Iperf.CATEGORY: [
+                dict(
+                    name="{hostname} {category} throughput",
+                    series=dict(
+                        metas=['parallel', 'window'],
+                        metrics=['tcp__received_throughput'],
+                    ),
+                    plotter=Iperf.plot_throughput
+                )
+            ]
+        }
+
+    @classmethod
+    def plot_throughput(cls, plt, description, metas, metrics):
+        """Plot throughput by number of streams, one line per window size
+        """
+        metric = description['series']['metrics'][0]
+        lines = dict()
+        windows = metas.get('window') or [None] * len(metas['parallel'])
+        for parallel, window, value in zip(metas['parallel'], windows,
+                                           metrics[metric]):
+            line = lines.setdefault(window or 'default', ([], []))
+            line[0].append(parallel)
+            line[1].append(value / 1e9)
+        for window in sorted(lines):
+            plt.plot(lines[window][0], lines[window][1], 'o-', label=window)
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('parallel streams')
+        plt.ylabel('Gbits/s')
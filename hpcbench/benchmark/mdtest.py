@@ -0,0 +1,375 @@
+"""HPCBench benchmark driver for filesystem metadata performance
+
+Executions either use mdtest, from the IOR project:
+
+    https://github.com/hpc/ior
+
+or the mdtest-like stressor provided by this module, written in
+Python, that writes the same SUMMARY table on standard output.
+"""
+from __future__ import print_function
+
+import argparse
+import math
+import multiprocessing
+import os
+import os.path as osp
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import launcher_command
+from hpcbench.toolbox.sweep import values
+
+
+# mdtest operation -> metric name
+OPERATIONS = [
+    ('Directory creation', 'directory_creation'),
+    ('Directory stat', 'directory_stat'),
+    ('Directory removal', 'directory_removal'),
+    ('File creation', 'file_creation'),
+    ('File stat', 'file_stat'),
+    ('File removal', 'file_removal'),
+    ('Tree creation', 'tree_creation'),
+    ('Tree removal', 'tree_removal'),
+]
+
+
+def tree_directories(root, rank, branching, depth):
+    """Get directories of the tree of a process, parents first
+
+    >>> tree_directories('d', 0, 1, 2)
+    ['d/mdtest_tree.0.0', 'd/mdtest_tree.0.0/mdtest_tree.0.1', \
+'d/mdtest_tree.0.0/mdtest_tree.0.1/mdtest_tree.0.2']
+    """
+    directories = [osp.join(root, 'mdtest_tree.%d.0' % rank)]
+    level = directories[:]
+    for _ in range(depth):
+        children = []
+        for parent in level:
+            for _ in range(branching):
+                index = len(directories) + len(children)
+                children.append(
+                    osp.join(parent, 'mdtest_tree.%d.%d' % (rank, index))
+                )
+        directories += children
+        level = children
+    return directories
+
+
+def _run_phase(args):
+    """Execute one phase of the stressor in a worker process
+
+    :return: number of operations performed
+    """
+    phase, root, rank, items, branching, depth = args
+    directories = tree_directories(root, rank, branching, depth)
+    if phase == 'tree_creation':
+        for directory in directories:
+            os.mkdir(directory)
+        return len(directories)
+    elif phase == 'tree_removal':
+        for directory in reversed(directories):
+            os.rmdir(directory)
+        return len(directories)
+    kind, operation = phase.split('_')
+    for item in range(items):
+        path = osp.join(
+            directories[item % len(directories)],
+            '%s.mdtest.%d.%d' % (
+                'dir' if kind == 'directory' else 'file', rank, item
+            )
+        )
+        if operation == 'stat':
+            os.stat(path)
+        elif kind == 'directory':
+            if operation == 'creation':
+                os.mkdir(path)
+            else:
+                os.rmdir(path)
+        elif operation == 'creation':
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        else:
+            os.unlink(path)
+    return items
+
+
+# phases of the stressor, in order of execution
+PHASES = [
+    'tree_creation',
+    'directory_creation',
+    'directory_stat',
+    'directory_removal',
+    'file_creation',
+    'file_stat',
+    'file_removal',
+    'tree_removal',
+]
+
+
+def stress(directory, processes, items, branching, depth):
+    """Execute every phase of the stressor once
+
+    :return: operation rate of every phase, in ops/s
+    :rtype: dictionary
+    """
+    root = tempfile.mkdtemp(prefix='mdtest.', dir=directory)
+    pool = multiprocessing.Pool(processes)
+    rates = {}
+    try:
+        for phase in PHASES:
+            args = [
+                (phase, root, rank, items, branching, depth)
+                for rank in range(processes)
+            ]
+            start = time.time()
+            operations = sum(pool.map(_run_phase, args))
+            rates[phase] = operations / max(time.time() - start, 1e-9)
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(root, ignore_errors=True)
+    return rates
+
+
+def main(argv=None):
+    """Filesystem metadata stressor, with mdtest options and output"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('-P', dest='processes', type=int, default=1,
+                        help='number of processes')
+    parser.add_argument('-n', dest='items', type=int, default=1000,
+                        help='files and directories created per process')
+    parser.add_argument('-b', dest='branching', type=int, default=1,
+                        help='branching factor of the tree')
+    parser.add_argument('-z', dest='depth', type=int, default=0,
+                        help='depth of the tree')
+    parser.add_argument('-i', dest='iterations', type=int, default=1,
+                        help='number of iterations')
+    parser.add_argument('-d', dest='directory', default='.',
+                        help='directory where the tree is created')
+    args = parser.parse_args(argv)
+    print('-- started at %s --' % time.strftime('%m/%d/%Y %H:%M:%S'))
+    print()
+    print('mdtest-like Python stressor was launched with %d total task(s)'
+          ' on 1 node(s)' % args.processes)
+    print('Command line used: %s' % ' '.join(sys.argv))
+    print('Path: %s' % osp.abspath(args.directory))
+    print()
+    print('%d tasks, %d files/directories' % (
+        args.processes, args.processes * args.items))
+    iterations = [
+        stress(args.directory, args.processes, args.items,
+               args.branching, args.depth)
+        for _ in range(args.iterations)
+    ]
+    print()
+    print('SUMMARY rate: (of %d iterations)' % args.iterations)
+    print('   %-24s   %14s %14s %14s %14s' % (
+        'Operation', 'Max', 'Min', 'Mean', 'Std Dev'))
+    print('   %-24s   %14s %14s %14s %14s' % (
+        '---------', '---', '---', '----', '-------'))
+    for operation, phase in OPERATIONS:
+        rates = [iteration[phase] for iteration in iterations]
+        mean = sum(rates) / len(rates)
+        stddev = math.sqrt(
+            sum((rate - mean) ** 2 for rate in rates) / len(rates)
+        )
+        print('   %-24s : %14.3f %14.3f %14.3f %14.3f' % (
+            operation, max(rates), min(rates), mean, stddev))
+    print('-- finished at %s --' % time.strftime('%m/%d/%Y %H:%M:%S'))
+
+
+class MdtestExtractor(MetricsExtractor):
+    """Extract mean operation rates of the SUMMARY table
+    written by mdtest
+    """
+    SUMMARY = re.compile(r'^SUMMARY( \w+)?:')
+    RATE = re.compile(
+        r'^\s*([A-Za-z ]+?)\s*:\s+([0-9.]+)\s+([0-9.]+)\s+([0-9.]+)'
+    )
+
+    def __init__(self):
+        self._metrics = dict(
+            (metric, Metric('ops/s', float)) for _, metric in OPERATIONS
+        )
+        self._operations = dict(OPERATIONS)
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        metrics = {}
+        in_summary = False
+        with open(self.stdout(outdir)) as istr:
+            for line in istr:
+                if self.SUMMARY.match(line):
+                    # only the first table provides rates
+                    if in_summary or metrics:
+                        break
+                    in_summary = True
+                    continue
+                if not in_summary:
+                    continue
+                match = self.RATE.match(line)
+                if match:
+                    metric = self._operations.get(match.group(1))
+                    if metric:
+                        metrics[metric] = float(match.group(4))
+                elif line.startswith('--'):
+                    break
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class Mdtest(Benchmark):
+    """Filesystem metadata benchmark
+
+    Every execution creates, stats and removes directories and files
+    in a tree, and reports the rate of every operation. Unless the
+    ``executable`` attribute is specified, the Python stressor of this
+    module is used instead of mdtest.
+
+    Attributes, all optional:
+
+    executable:
+        path to the ``mdtest`` executable, ``null`` to use the bundled
+        Python stressor.
+    launcher:
+        MPI launcher of mdtest, where ``{process_count}`` is replaced
+        by the number of processes.
+    directory:
+        directory in the tested filesystem, default is the execution
+        directory.
+    process_count:
+        numbers of processes to test
+    branching:
+        branching factors of the tree to test, i.e. the number of
+        child directories of every directory.
+    depth:
+        depth of the tree
+    items:
+        number of files and directories created by every process
+    iterations:
+        number of times every execution is repeated
+    """
+    CATEGORY = 'metadata'
+
+    DEFAULT_ATTRIBUTES = dict(
+        executable=None,
+        launcher='mpirun -np {process_count}',
+        directory=None,
+        process_count=[1, 4],
+        branching=[1, 10],
+        depth=1,
+        items=1000,
+        iterations=1,
+    )
+
+    name = 'mdtest'
+
+    description = """
+        Measure filesystem metadata performance: creation, stat
+        and removal rates of files and directories.
+        """
+
+    def command(self, process_count, branching):
+        """Build command of an execution
+
+        :rtype: list of string
+        """
+        options = [
+            '-n', str(self.attribute('items')),
+            '-b', str(branching),
+            '-z', str(self.attribute('depth')),
+            '-i', str(self.attribute('iterations')),
+            '-d', self.attribute('directory') or '.',
+        ]
+        executable = self.attribute('executable')
+        if executable is None:
+            return [
+                sys.executable, '-m', __name__,
+                '-P', str(process_count)
+            ] + options
+        return launcher_command(
+            self.attribute('launcher'),
+            [executable, '-u'] + options,
+            process_count=process_count
+        )
+
+    @property
+    def execution_matrix(self):
+        for process_count in values(self.attribute('process_count')):
+            for branching in values(self.attribute('branching')):
+                yield dict(
+                    category=Mdtest.CATEGORY,
+                    command=self.command(process_count, branching),
+                    metas=dict(
+                        process_count=process_count,
+                        branching=branching,
+                        depth=self.attribute('depth'),
+                        items=self.attribute('items'),
+                    )
+                )
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            Mdtest.CATEGORY: MdtestExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            Mdtest.CATEGORY: [
+                dict(
+                    name="{hostname} {category} %s rates" % kind,
+                    series=dict(
+                        metas=['process_count', 'branching'],
+                        metrics=[
+                            'metadata__%s_%s' % (kind, operation)
+                            for operation in ['creation', 'stat', 'removal']
+                        ],
+                    ),
+                    plotter=Mdtest.plot_rates
+                )
+                for kind in ['file', 'directory']
+            ]
+        }
+
+    @classmethod
+    def plot_rates(cls, plt, description, metas, metrics):
+        """Plot operation rates by number of processes, one line per
+        operation and branching factor
+        """
+        for metric in description['series']['metrics']:
+            lines = dict()
+            for process_count, branching, value in zip(
+                    metas['process_count'], metas['branching'],
+                    metrics[metric]):
+                line = lines.setdefault(branching, ([], []))
+                line[0].append(process_count)
+                line[1].append(value)
+            operation = metric.rsplit('_', 1)[-1]
+            for branching in sorted(lines):
+                plt.plot(lines[branching][0], lines[branching][1], 'o-',
+                         label='%s b=%s' % (operation, branching))
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('processes')
+        plt.ylabel('ops/s')
+
+
+if __name__ == '__main__':
+    main()
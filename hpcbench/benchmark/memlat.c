@@ -0,0 +1,119 @@
+/*
+ * Memory load-to-use latency measurement with a pointer-chasing kernel.
+ *
+ * For every working set size given on the command line, a buffer is
+ * split in cache lines, linked in a random cyclic order, so that every
+ * load depends on the previous one and hardware prefetchers cannot
+ * guess the next address. The chain is traversed ACCESSES times and the
+ * average duration of one load is reported.
+ *
+ * Compilation:
+ *   cc -O2 memlat.c -o memlat
+ *
+ * Usage:
+ *   memlat ACCESSES SIZE [SIZE ...]
+ *
+ * Output: one line per working set size, in bytes, with the latency
+ * in nanoseconds.
+ */
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#define LINE_SIZE 64
+
+static double now(void) {
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (double)ts.tv_sec + (double)ts.tv_nsec * 1.e-9;
+}
+
+static uint64_t xorshift(uint64_t *state) {
+  uint64_t x = *state;
+  x ^= x << 13;
+  x ^= x >> 7;
+  x ^= x << 17;
+  return *state = x;
+}
+
+/* Link cache lines of the buffer in a random cycle (Sattolo's algorithm) */
+static void **chain(char *buffer, size_t lines) {
+  size_t *order = malloc(lines * sizeof(size_t));
+  uint64_t state = 88172645463325252ULL;
+  size_t i;
+  if (order == NULL) {
+    fprintf(stderr, "Failed to allocate %zu lines\n", lines);
+    exit(1);
+  }
+  for (i = 0; i < lines; ++i) {
+    order[i] = i;
+  }
+  for (i = lines - 1; i > 0; --i) {
+    size_t j = xorshift(&state) % i;
+    size_t tmp = order[i];
+    order[i] = order[j];
+    order[j] = tmp;
+  }
+  for (i = 0; i < lines; ++i) {
+    *(void **)(buffer + order[i] * LINE_SIZE) =
+        buffer + order[(i + 1) % lines] * LINE_SIZE;
+  }
+  free(order);
+  return (void **)buffer;
+}
+
+static void **chase(void **p, long accesses) {
+  long i;
+  for (i = 0; i < accesses; i += 8) {
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+    p = (void **)*p;
+  }
+  return p;
+}
+
+int main(int argc, char **argv) {
+  long accesses;
+  int arg;
+  void **sink = NULL;
+  if (argc < 3) {
+    fprintf(stderr, "Usage: %s ACCESSES SIZE [SIZE ...]\n", argv[0]);
+    return 1;
+  }
+  accesses = atol(argv[1]);
+  printf("# memlat: pointer chasing, %d bytes lines, %ld accesses\n",
+         LINE_SIZE, accesses);
+  printf("# %14s %14s\n", "size (B)", "latency (ns)");
+  for (arg = 2; arg < argc; ++arg) {
+    size_t size = strtoull(argv[arg], NULL, 10);
+    size_t lines = size / LINE_SIZE;
+    char *buffer = NULL;
+    void **p;
+    double start, elapsed;
+    if (lines < 2) {
+      fprintf(stderr, "Working set too small: %zu\n", size);
+      return 1;
+    }
+    if (posix_memalign((void **)&buffer, LINE_SIZE, lines * LINE_SIZE)) {
+      fprintf(stderr, "Failed to allocate %zu bytes\n", size);
+      return 1;
+    }
+    p = chain(buffer, lines);
+    /* warm up caches and TLB */
+    p = chase(p, (long)lines);
+    start = now();
+    p = chase(p, accesses);
+    elapsed = now() - start;
+    sink = p;
+    printf("%16zu %14.3f\n", lines * LINE_SIZE, elapsed * 1.e9 / accesses);
+    fflush(stdout);
+    free(buffer);
+  }
+  return sink == (void **)1;
+}
@@ -0,0 +1,197 @@
+"""HPCBench benchmark driver for memory load-to-use latency
+
+The pointer-chasing kernel is compiled from the ``memlat.c`` source file
+bundled with this module, once per build configuration. The
+executable is shared by the executions of a benchmark category.
+"""
+import os.path as osp
+import shlex
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    ArrayMetric,
+    Benchmark,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import (
+    build_once,
+    cache_sizes,
+)
+
+
+class MemlatExtractor(MetricsExtractor):
+    """Extract the latency curve written by the pointer-chasing kernel,
+    as array metrics: working set sizes, and one latency per size.
+    """
+    def __init__(self):
+        self._metrics = dict(
+            size=ArrayMetric('B', int),
+            latency=ArrayMetric('ns', float),
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        sizes = []
+        latencies = []
+        with open(self.stdout(outdir)) as istr:
+            for line in istr:
+                fields = line.split()
+                if not fields or fields[0].startswith('#'):
+                    continue
+                sizes.append(int(fields[0]))
+                latencies.append(float(fields[1]))
+        if not sizes:
+            raise Exception('Could not extract some metrics: latency size')
+        return dict(size=sizes, latency=latencies)
+
+
+class Memlat(Benchmark):
+    """Memory latency benchmark
+
+    Every execution measures the latency of dependent loads for
+    working set sizes going from ``min_size`` to ``max_size``,
+    two sizes per octave: 4K, 6K, 8K, 12K, 16K, ...
+
+    Attributes, all optional:
+
+    min_size:
+        smallest working set size, in bytes
+    max_size:
+        largest working set size, in bytes, default is 4 times the
+        last level cache size.
+    accesses:
+        number of loads timed for every working set size
+    compiler:
+        C compiler command
+    cflags:
+        compilation flags to test, as strings
+    """
+    CATEGORY = 'latency'
+    SOURCE = osp.join(osp.dirname(__file__), 'memlat.c')
+    EXECUTABLE = 'memlat'
+    # used when the cache hierarchy is unknown
+    DEFAULT_MAX_SIZE = 256 * 1024 ** 2
+
+    DEFAULT_ATTRIBUTES = dict(
+        min_size=4096,
+        max_size=None,
+        accesses=2 ** 24,
+        compiler='cc',
+        cflags=['-O2'],
+    )
+
+    name = 'memlat'
+
+    description = """
+        Measure memory load-to-use latency with a pointer-chasing
+        kernel, from the L1 cache to the main memory.
+        """
+
+    @property
+    def max_size(self):
+        """Get largest working set size"""
+        max_size = self.attribute('max_size')
+        if max_size is None:
+            caches = cache_sizes()
+            if caches:
+                max_size = 4 * caches[max(caches)]
+            else:
+                max_size = Memlat.DEFAULT_MAX_SIZE
+        return max_size
+
+    @classmethod
+    def working_set_sizes(cls, min_size, max_size):
+        """Get working set sizes between two bounds, inclusive:
+        powers of 2 and the sizes in the middle of every octave.
+
+        >>> Memlat.working_set_sizes(4096, 16384)
+        [4096, 6144, 8192, 12288, 16384]
+        """
+        sizes = []
+        size = 1
+        while size <= max_size:
+            for candidate in (size, size * 3 // 2):
+                if min_size <= candidate <= max_size and \
+                        candidate not in sizes:
+                    sizes.append(candidate)
+            size *= 2
+        return sizes
+
+    @property
+    def execution_matrix(self):
+        caches = cache_sizes()
+        sizes = self.working_set_sizes(self.attribute('min_size'),
+                                       self.max_size)
+        for cflags in self.attribute('cflags'):
+            yield dict(
+                category=Memlat.CATEGORY,
+                command=[
+                    './' + Memlat.EXECUTABLE,
+                    str(self.attribute('accesses'))
+                ] + [str(size) for size in sizes],
+                metas=dict(
+                    cflags=cflags,
+                    accesses=self.attribute('accesses'),
+                    caches=[caches[level] for level in sorted(caches)],
+                )
+            )
+
+    def build_command(self, metas):
+        """Get command compiling the kernel in the current directory
+
+        :param metas: metas of an execution
+        """
+        return (
+            shlex.split(self.attribute('compiler')) +
+            shlex.split(metas['cflags']) +
+            ['-o', Memlat.EXECUTABLE, Memlat.SOURCE]
+        )
+
+    def pre_execute(self, execution):
+        build_once(self.build_command(execution['metas']),
+                   Memlat.EXECUTABLE)
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            Memlat.CATEGORY: MemlatExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            Memlat.CATEGORY: [
+                dict(
+                    name="{hostname} {category} curve",
+                    series=dict(
+                        metas=['cflags', 'caches'],
+                        metrics=['latency__size', 'latency__latency'],
+                    ),
+                    plotter=Memlat.plot_latency
+                )
+            ]
+        }
+
+    @classmethod
+    def plot_latency(cls, plt, description, metas, metrics):
+        """Plot latency by working set size, one line per run.
+        Cache sizes are drawn as vertical lines, to highlight the
+        latency plateau of every cache level.
+        """
+        size_metric, metric = description['series']['metrics']
+        for cflags, sizes, values in zip(metas['cflags'],
+                                         metrics[size_metric],
+                                         metrics[metric]):
+            plt.plot(sizes, values, 'o-', label=cflags)
+        for caches in metas['caches'][:1]:
+            for level, size in enumerate(caches, 1):
+                plt.axvline(size, color='gray', linestyle='--')
+                plt.text(size, 0, ' L%d' % level, color='gray')
+        plt.xscale('log', basex=2)
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('working set size (B)')
+        plt.ylabel('latency (ns)')
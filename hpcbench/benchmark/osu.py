@@ -0,0 +1,195 @@
+"""HPCBench benchmark driver for the OSU MPI micro-benchmarks
+
+    http://mvapich.cse.ohio-state.edu/benchmarks/
+"""
+import os.path as osp
+import shlex
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    ArrayMetric,
+    Benchmark,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import (
+    launcher_command,
+    thread_counts,
+)
+from hpcbench.toolbox.sweep import values
+
+
+class OSUExtractor(MetricsExtractor):
+    """Extract the per message size table written by an OSU test,
+    as array metrics: message sizes, and one value per size.
+    """
+    def __init__(self, metric, unit):
+        """
+        :param metric: name of the metric provided by the second
+        column of the table
+        :param unit: unit of the metric
+        """
+        self.metric = metric
+        self._metrics = dict(
+            size=ArrayMetric('B', int),
+        )
+        self._metrics[metric] = ArrayMetric(unit, float)
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        sizes = []
+        values = []
+        with open(self.stdout(outdir)) as istr:
+            for line in istr:
+                fields = line.split()
+                if not fields or line.startswith('#'):
+                    continue
+                try:
+                    size, value = int(fields[0]), float(fields[1])
+                except (IndexError, ValueError):
+                    continue
+                sizes.append(size)
+                values.append(value)
+        if not sizes:
+            raise Exception('Could not extract OSU results table')
+        metrics = dict(size=sizes)
+        metrics[self.metric] = values
+        return metrics
+
+
+class OSU(Benchmark):
+    """Benchmark wrapper for the OSU MPI micro-benchmarks
+
+    Attributes, all optional:
+
+    tests:
+        categories to execute, among ``latency`` (osu_latency),
+        ``bandwidth`` (osu_bw), and ``allreduce`` (osu_allreduce)
+    launcher:
+        MPI launcher command, where ``{process_count}`` is replaced
+        by the number of processes. For instance
+        ``mpirun -np {process_count}`` or ``srun -n {process_count}``
+    process_count:
+        numbers of processes of the collective tests, default is
+        powers of 2 from 2 up to the number of CPUs. Point-to-point
+        tests always use 2 processes.
+    path:
+        directory of the OSU executables, default is to look them up
+        in the ``PATH``.
+    options:
+        additional options given to every OSU executable, ``-m 1:4096``
+        for instance
+    """
+    LATENCY = 'latency'
+    BANDWIDTH = 'bandwidth'
+    ALLREDUCE = 'allreduce'
+    # category -> executable, whether the test is collective
+    TESTS = {
+        LATENCY: ('osu_latency', False),
+        BANDWIDTH: ('osu_bw', False),
+        ALLREDUCE: ('osu_allreduce', True),
+    }
+
+    DEFAULT_ATTRIBUTES = dict(
+        tests=[LATENCY, BANDWIDTH, ALLREDUCE],
+        launcher='mpirun -np {process_count}',
+        process_count=None,
+        path=None,
+        options='',
+    )
+
+    name = 'osu'
+
+    description = """
+        OSU micro-benchmarks measure the latency and bandwidth of MPI
+        point-to-point and collective operations.
+        """
+
+    @property
+    def process_counts(self):
+        """Get numbers of processes of the collective tests"""
+        process_count = self.attribute('process_count')
+        if process_count is None:
+            process_count = thread_counts()[1:] or [2]
+        return list(values(process_count))
+
+    @property
+    def execution_matrix(self):
+        for category in [OSU.LATENCY, OSU.BANDWIDTH, OSU.ALLREDUCE]:
+            if category not in self.attribute('tests'):
+                continue
+            executable, collective = OSU.TESTS[category]
+            process_counts = self.process_counts if collective else [2]
+            for process_count in process_counts:
+                yield dict(
+                    category=category,
+                    command=self.command(executable, process_count),
+                    metas=dict(process_count=process_count),
+                )
+
+    def command(self, executable, process_count):
+        """Build command executing an OSU test through the MPI launcher
+
+        :param executable: OSU executable name
+        :param process_count: number of MPI processes
+        :rtype: list of string
+        """
+        path = self.attribute('path')
+        if path:
+            executable = osp.join(path, executable)
+        return launcher_command(
+            self.attribute('launcher'),
+            [executable] + shlex.split(self.attribute('options')),
+            process_count=process_count
+        )
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            OSU.LATENCY: OSUExtractor('latency', 'us'),
+            OSU.BANDWIDTH: OSUExtractor('bandwidth', 'MB/s'),
+            OSU.ALLREDUCE: OSUExtractor('latency', 'us'),
+        }
+
+    @property
+    def plots(self):
+        return dict(
+            (category, [
+                dict(
+                    name="{hostname} {category} %s" % metric,
+                    series=dict(
+                        metas=['process_count'],
+                        metrics=[
+                            '%s__size' % category,
+                            '%s__%s' % (category, metric),
+                        ],
+                    ),
+                    unit=unit,
+                    plotter=OSU.plot_by_message_size,
+                )
+            ])
+            for category, metric, unit in [
+                (OSU.LATENCY, 'latency', 'us'),
+                (OSU.BANDWIDTH, 'bandwidth', 'MB/s'),
+                (OSU.ALLREDUCE, 'latency', 'us'),
+            ]
+        )
+
+    @classmethod
+    def plot_by_message_size(cls, plt, description, metas, metrics):
+        """Plot one line per run, with message size on the X axis
+        """
+        size_metric, metric = description['series']['metrics']
+        for process_count, sizes, series in zip(metas['process_count'],
+                                                metrics[size_metric],
+                                                metrics[metric]):
+            plt.plot(sizes, series, 'o-',
+                     label='%s processes' % process_count)
+        plt.xscale('symlog', basex=2)
+        plt.yscale('log')
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('message size (B)')
+        plt.ylabel(description['unit'])
@@ -0,0 +1,218 @@
+"""HPCBench benchmark driver for microbenchmarks of Python callables
+
+Callables are timed in a dedicated Python process, executing this
+module, with a harness similar to the ``timeit`` module one.
+Results are written in JSON on standard output.
+"""
+from __future__ import print_function
+
+import argparse
+import copy
+import importlib
+import json
+import sys
+import timeit
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    Metrics,
+    MetricsExtractor,
+)
+
+
+def load_callable(path):
+    """Get symbol referenced by a dotted path
+
+    :param path: ``package.module.symbol`` or ``package.module:symbol``
+    """
+    if ':' in path:
+        module, symbol = path.split(':', 1)
+    else:
+        module, symbol = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module), symbol)
+
+
+def autorange(func, min_time, timer=timeit.default_timer):
+    """Find the number of consecutive calls taking at least ``min_time``
+    seconds, among 1, 2, 5, 10, 20, 50, ...
+
+    :return: number of calls and their duration in seconds
+    :rtype: tuple
+    """
+    scale = 1
+    while True:
+        for factor in (1, 2, 5):
+            loops = scale * factor
+            elapsed = time_loops(func, loops, timer)
+            if elapsed >= min_time:
+                return loops, elapsed
+        scale *= 10
+
+
+def time_loops(func, loops, timer=timeit.default_timer):
+    """Get duration of ``loops`` consecutive calls of ``func``"""
+    start = timer()
+    for _ in range(loops):
+        func()
+    return timer() - start
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """Time a callable
+
+    :param func: callable without argument
+    :param repeat: number of measures
+    :param min_time: minimum duration of a measure, in seconds
+    :return: ``best`` and ``median`` durations of one call in seconds,
+    number of ``loops`` of a measure, and number of measures
+    (``repeat``).
+    :rtype: dictionary
+    """
+    loops, _ = autorange(func, min_time)
+    timings = sorted(
+        time_loops(func, loops) / loops for _ in range(repeat)
+    )
+    middle = len(timings) // 2
+    if len(timings) % 2:
+        median = timings[middle]
+    else:
+        median = (timings[middle - 1] + timings[middle]) / 2
+    return dict(
+        best=timings[0],
+        median=median,
+        loops=loops,
+        repeat=repeat,
+    )
+
+
+def main(argv=None):
+    """Time a workload, and write results in JSON on standard output"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('workload', help='dotted path to the workload')
+    parser.add_argument('params', nargs='?', default='{}',
+                        help='workload parameters, as a JSON object')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    workload = load_callable(args.workload)(**json.loads(args.params))
+    operations = None
+    if isinstance(workload, tuple):
+        workload, operations = workload
+    results = measure(workload, repeat=args.repeat, min_time=args.min_time)
+    if operations is not None:
+        results['rate'] = operations / results['best']
+    json.dump(results, sys.stdout)
+    print()
+
+
+class PythonExtractor(MetricsExtractor):
+    """Extract timings written by the Python worker process"""
+    def __init__(self):
+        self._metrics = dict(
+            best=Metrics.Second,
+            median=Metrics.Second,
+            loops=Metric('', int),
+            repeat=Metric('', int),
+            rate=Metric('ops/s', float),
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        with open(self.stdout(outdir)) as istr:
+            metrics = json.load(istr)
+        metrics['best'] = float(metrics['best'])
+        metrics['median'] = float(metrics['median'])
+        if 'rate' in metrics:
+            metrics['rate'] = float(metrics['rate'])
+        return metrics
+
+
+class Python(Benchmark):
+    """Benchmark timing Python callables, without external
+    executables.
+
+    Attributes, all optional:
+
+    workloads:
+        dictionary of name -> workload, the name being the category.
+        A workload provides the dotted path to a ``callable`` and the
+        list of ``params`` to test, the keyword arguments given to the
+        callable. The callable returns the function to time, or a
+        tuple with the function and the number of operations it
+        performs, used to compute the ``rate`` metric. See the
+        ``hpcbench.benchmark.python_workloads`` module.
+    repeat:
+        number of measures of every workload
+    min_time:
+        minimum duration of a measure, in seconds
+    """
+    WORKLOADS = 'hpcbench.benchmark.python_workloads.'
+    DEFAULT_ATTRIBUTES = dict(
+        workloads=dict(
+            dgemm=dict(
+                callable=WORKLOADS + 'dgemm',
+                params=[dict(size=256), dict(size=1024)],
+            ),
+            fft=dict(
+                callable=WORKLOADS + 'fft',
+                params=[dict(size=2 ** 16), dict(size=2 ** 20)],
+            ),
+            memcpy=dict(
+                callable=WORKLOADS + 'memcpy',
+                params=[dict(size=1024 ** 2), dict(size=64 * 1024 ** 2)],
+            ),
+        ),
+        repeat=5,
+        min_time=0.2,
+    )
+
+    name = 'python'
+
+    description = """
+        Time Python callables in a dedicated process, for instance
+        NumPy kernels, with a harness similar to the timeit module one.
+        """
+
+    @property
+    def execution_matrix(self):
+        workloads = self.attribute('workloads')
+        for name in sorted(workloads):
+            workload = workloads[name]
+            for params in workload.get('params') or [{}]:
+                yield dict(
+                    category=name,
+                    command=[
+                        sys.executable, '-m', __name__,
+                        '--repeat', str(self.attribute('repeat')),
+                        '--min-time', str(self.attribute('min_time')),
+                        workload['callable'],
+                        json.dumps(params, sort_keys=True),
+                    ],
+                    metas=copy.deepcopy(params),
+                )
+
+    def estimated_duration(self, execution):
+        del execution  # unused
+        # calibration, then measures, each lasting about min_time
+        return (self.attribute('repeat') + 2) * self.attribute('min_time')
+
+    @cached_property
+    def metrics_extractors(self):
+        return dict(
+            (name, PythonExtractor())
+            for name in self.attribute('workloads')
+        )
+
+    @property
+    def plots(self):
+        return dict()
+
+
+if __name__ == '__main__':
+    main()
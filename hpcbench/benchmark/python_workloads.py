@@ -0,0 +1,46 @@
+"""Workloads of the ``python`` benchmark
+
+Every workload is a function taking its parameters as keyword
+arguments, and returning the callable to time, possibly with
+the number of operations performed by every call.
+"""
+
+
+def dgemm(size=1024):
+    """Product of two square matrices of double with NumPy.
+    Operations are floating point operations.
+    """
+    import numpy
+    lhs = numpy.random.rand(size, size)
+    rhs = numpy.random.rand(size, size)
+    out = numpy.empty((size, size))
+
+    def _dgemm():
+        numpy.dot(lhs, rhs, out=out)
+    return _dgemm, 2.0 * size ** 3
+
+
+def fft(size=2 ** 20):
+    """Fast Fourier transform of a complex vector with NumPy.
+    Operations are floating point operations, estimated as
+    ``5 N log2(N)``.
+    """
+    import math
+    import numpy
+    data = numpy.random.rand(size) + 1j * numpy.random.rand(size)
+
+    def _fft():
+        numpy.fft.fft(data)
+    return _fft, 5.0 * size * math.log(size, 2)
+
+
+def memcpy(size=64 * 1024 ** 2):
+    """Copy between two buffers of ``size`` bytes.
+    Operations are copied bytes.
+    """
+    src = memoryview(bytearray(size))
+    dst = memoryview(bytearray(size))
+
+    def _memcpy():
+        dst[:] = src
+    return _memcpy, float(size)
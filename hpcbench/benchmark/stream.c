@@ -0,0 +1,203 @@
+/*
+ * Sustainable memory bandwidth measurement, following the STREAM
+ * benchmark methodology and output format:
+ *
+ *   https://www.cs.virginia.edu/stream/
+ *
+ * The Copy, Scale, Add and Triad kernels are executed NTIMES times on
+ * three arrays of STREAM_ARRAY_SIZE double precision elements. The best
+ * time of every kernel, excluding the first iteration, is used to compute
+ * the reported bandwidth.
+ *
+ * Compilation:
+ *   cc -O3 -fopenmp -DSTREAM_ARRAY_SIZE=10000000 -DNTIMES=10 stream.c
+ *
+ * The number of threads is controlled by the OMP_NUM_THREADS environment
+ * variable when compiled with OpenMP support.
+ */
+#include <float.h>
+#include <math.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <sys/time.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#ifndef STREAM_ARRAY_SIZE
+#define STREAM_ARRAY_SIZE 10000000
+#endif
+
+#ifndef NTIMES
+#define NTIMES 10
+#endif
+
+#if NTIMES < 2
+#error "NTIMES must be at least 2"
+#endif
+
+#define STREAM_TYPE double
+#define ALIGNMENT 64
+#define HLINE "-------------------------------------------------------------\n"
+
+static const char *labels[4] = {"Copy:      ", "Scale:     ", "Add:       ",
+                                "Triad:     "};
+
+static double mysecond(void) {
+  struct timeval tp;
+  gettimeofday(&tp, NULL);
+  return (double)tp.tv_sec + (double)tp.tv_usec * 1.e-6;
+}
+
+static STREAM_TYPE *allocate(size_t n) {
+  void *ptr = NULL;
+  if (posix_memalign(&ptr, ALIGNMENT, n * sizeof(STREAM_TYPE)) != 0) {
+    fprintf(stderr, "Failed to allocate %zu bytes\n",
+            n * sizeof(STREAM_TYPE));
+    exit(1);
+  }
+  return (STREAM_TYPE *)ptr;
+}
+
+static int check_results(const STREAM_TYPE *a, const STREAM_TYPE *b,
+                         const STREAM_TYPE *c, size_t n, STREAM_TYPE scalar) {
+  const double epsilon = 1.e-13;
+  STREAM_TYPE aj = 1.0, bj = 2.0, cj = 0.0;
+  double aerr = 0.0, berr = 0.0, cerr = 0.0;
+  size_t j;
+  int k;
+
+  /* reproduce the initialization and the timing loop */
+  aj = 2.0E0 * aj;
+  for (k = 0; k < NTIMES; k++) {
+    cj = aj;
+    bj = scalar * cj;
+    cj = aj + bj;
+    aj = bj + scalar * cj;
+  }
+  for (j = 0; j < n; j++) {
+    aerr += fabs(a[j] - aj);
+    berr += fabs(b[j] - bj);
+    cerr += fabs(c[j] - cj);
+  }
+  aerr /= (double)n;
+  berr /= (double)n;
+  cerr /= (double)n;
+  if (fabs(aerr / aj) > epsilon || fabs(berr / bj) > epsilon ||
+      fabs(cerr / cj) > epsilon) {
+    printf("Failed Validation: average errors %e %e %e\n", aerr, berr, cerr);
+    return 1;
+  }
+  printf("Solution Validates: avg error less than %e on all three arrays\n",
+         epsilon);
+  return 0;
+}
+
+int main(void) {
+  const size_t n = STREAM_ARRAY_SIZE;
+  const STREAM_TYPE scalar = 3.0;
+  const double bytes[4] = {2 * sizeof(STREAM_TYPE) * (double)n,
+                           2 * sizeof(STREAM_TYPE) * (double)n,
+                           3 * sizeof(STREAM_TYPE) * (double)n,
+                           3 * sizeof(STREAM_TYPE) * (double)n};
+  double avgtime[4] = {0}, maxtime[4] = {0};
+  double mintime[4] = {FLT_MAX, FLT_MAX, FLT_MAX, FLT_MAX};
+  double times[4][NTIMES];
+  STREAM_TYPE *a, *b, *c;
+  long j;
+  int k, i, threads = 1;
+
+  a = allocate(n);
+  b = allocate(n);
+  c = allocate(n);
+
+  printf(HLINE);
+  printf("STREAM kernels, hpcbench implementation\n");
+  printf(HLINE);
+  printf("This system uses %d bytes per array element.\n",
+         (int)sizeof(STREAM_TYPE));
+  printf(HLINE);
+  printf("Array size = %lu (elements), Offset = 0 (elements)\n",
+         (unsigned long)n);
+  printf("Memory per array = %.1f MiB (= %.1f GiB).\n",
+         sizeof(STREAM_TYPE) * (double)n / 1024.0 / 1024.0,
+         sizeof(STREAM_TYPE) * (double)n / 1024.0 / 1024.0 / 1024.0);
+  printf("Total memory required = %.1f MiB (= %.1f GiB).\n",
+         3.0 * sizeof(STREAM_TYPE) * (double)n / 1024.0 / 1024.0,
+         3.0 * sizeof(STREAM_TYPE) * (double)n / 1024.0 / 1024.0 / 1024.);
+  printf("Each kernel will be executed %d times.\n", NTIMES);
+  printf(" The *best* time for each kernel (excluding the first iteration)\n");
+  printf(" will be used to compute the reported bandwidth.\n");
+
+#ifdef _OPENMP
+  printf(HLINE);
+#pragma omp parallel
+  {
+#pragma omp master
+    threads = omp_get_num_threads();
+  }
+  printf("Number of Threads requested = %i\n", threads);
+#endif
+  printf("Number of Threads counted = %i\n", threads);
+  printf(HLINE);
+
+  /* first touch, with the same threads placement as the kernels */
+#pragma omp parallel for
+  for (j = 0; j < (long)n; j++) {
+    a[j] = 1.0;
+    b[j] = 2.0;
+    c[j] = 0.0;
+  }
+#pragma omp parallel for
+  for (j = 0; j < (long)n; j++)
+    a[j] = 2.0E0 * a[j];
+
+  for (k = 0; k < NTIMES; k++) {
+    times[0][k] = mysecond();
+#pragma omp parallel for
+    for (j = 0; j < (long)n; j++)
+      c[j] = a[j];
+    times[0][k] = mysecond() - times[0][k];
+
+    times[1][k] = mysecond();
+#pragma omp parallel for
+    for (j = 0; j < (long)n; j++)
+      b[j] = scalar * c[j];
+    times[1][k] = mysecond() - times[1][k];
+
+    times[2][k] = mysecond();
+#pragma omp parallel for
+    for (j = 0; j < (long)n; j++)
+      c[j] = a[j] + b[j];
+    times[2][k] = mysecond() - times[2][k];
+
+    times[3][k] = mysecond();
+#pragma omp parallel for
+    for (j = 0; j < (long)n; j++)
+      a[j] = b[j] + scalar * c[j];
+    times[3][k] = mysecond() - times[3][k];
+  }
+
+  for (k = 1; k < NTIMES; k++) {
+    for (i = 0; i < 4; i++) {
+      avgtime[i] += times[i][k];
+      mintime[i] = times[i][k] < mintime[i] ? times[i][k] : mintime[i];
+      maxtime[i] = times[i][k] > maxtime[i] ? times[i][k] : maxtime[i];
+    }
+  }
+
+  printf("Function    Best Rate MB/s  Avg time     Min time     Max time\n");
+  for (i = 0; i < 4; i++) {
+    avgtime[i] = avgtime[i] / (double)(NTIMES - 1);
+    printf("%s%12.1f  %11.6f  %11.6f  %11.6f\n", labels[i],
+           1.0E-06 * bytes[i] / mintime[i], avgtime[i], mintime[i],
+           maxtime[i]);
+  }
+  printf(HLINE);
+  i = check_results(a, b, c, n, scalar);
+  printf(HLINE);
+  free(a);
+  free(b);
+  free(c);
+  return i;
+}
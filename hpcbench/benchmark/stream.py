@@ -0,0 +1,191 @@
+"""HPCBench benchmark driver for STREAM, the sustainable memory
+bandwidth benchmark
+
+    https://www.cs.virginia.edu/stream/
+
+The STREAM kernels are compiled from the ``stream.c`` source file
+bundled with this module, once per build configuration. The
+executable is shared by the executions of a benchmark category.
+"""
+import os.path as osp
+import re
+import shlex
+
+from cached_property import cached_property
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import (
+    build_once,
+    thread_counts,
+)
+from hpcbench.toolbox.sweep import values
+
+
+class StreamExtractor(MetricsExtractor):
+    """Extract best bandwidth of every STREAM kernel"""
+    KERNELS = ('copy', 'scale', 'add', 'triad')
+    KERNEL_RESULT = re.compile(
+        r'^(Copy|Scale|Add|Triad):\s+([0-9.]+)\s+[0-9.]+\s+[0-9.]+\s+[0-9.]+'
+    )
+    VALIDATION = 'Solution Validates'
+
+    def __init__(self):
+        self._metrics = dict(
+            (kernel + '_bandwidth', Metric('MB/s', float))
+            for kernel in self.KERNELS
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        metrics = {}
+        validated = False
+        with open(self.stdout(outdir)) as istr:
+            for line in istr:
+                match = self.KERNEL_RESULT.match(line)
+                if match:
+                    kernel, bandwidth = match.groups()
+                    metrics[kernel.lower() + '_bandwidth'] = float(bandwidth)
+                elif line.startswith(self.VALIDATION):
+                    validated = True
+        if not validated:
+            raise Exception('STREAM solution does not validate')
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class Stream(Benchmark):
+    """Benchmark wrapper for STREAM
+
+    Attributes, all optional:
+
+    array_size:
+        numbers of elements of the arrays. Every array should be at
+        least 4 times larger than the last level cache.
+    ntimes:
+        number of times every kernel is executed
+    compiler:
+        C compiler command
+    cflags:
+        compilation flags to test, as strings
+    threads:
+        values of ``OMP_NUM_THREADS``, default is powers of 2 up to
+        the number of CPUs.
+    """
+    CATEGORY = 'bandwidth'
+    SOURCE = osp.join(osp.dirname(__file__), 'stream.c')
+    EXECUTABLE = 'stream'
+
+    DEFAULT_ATTRIBUTES = dict(
+        array_size=[10000000],
+        ntimes=10,
+        compiler='cc',
+        cflags=['-O3 -fopenmp'],
+        threads=None,
+    )
+
+    name = 'stream'
+
+    description = """
+        STREAM measures sustainable memory bandwidth with simple
+        vector kernels: Copy, Scale, Add and Triad.
+        """
+
+    @property
+    def threads(self):
+        """Get values of ``OMP_NUM_THREADS`` to test"""
+        threads = self.attribute('threads')
+        if threads is None:
+            threads = thread_counts()
+        return list(values(threads))
+
+    @property
+    def execution_matrix(self):
+        for cflags in self.attribute('cflags'):
+            for array_size in self.attribute('array_size'):
+                for thread in self.threads:
+                    yield dict(
+                        category=Stream.CATEGORY,
+                        command=['./' + Stream.EXECUTABLE],
+                        environment=dict(OMP_NUM_THREADS=str(thread)),
+                        metas=dict(
+                            thread=thread,
+                            array_size=array_size,
+                            cflags=cflags,
+                        )
+                    )
+
+    def build_command(self, metas):
+        """Get command compiling STREAM in the current directory
+
+        :param metas: metas of an execution
+        """
+        return (
+            shlex.split(self.attribute('compiler')) +
+            shlex.split(metas['cflags']) +
+            [
+                '-DSTREAM_ARRAY_SIZE=%s' % metas['array_size'],
+                '-DNTIMES=%s' % self.attribute('ntimes'),
+                '-o', Stream.EXECUTABLE,
+                Stream.SOURCE,
+                '-lm',
+            ]
+        )
+
+    def pre_execute(self, execution):
+        build_once(self.build_command(execution['metas']),
+                   Stream.EXECUTABLE)
+
+    @cached_property
+    def metrics_extractors(self):
+        return {
+            Stream.CATEGORY: StreamExtractor(),
+        }
+
+    @property
+    def plots(self):
+        return {
+            Stream.CATEGORY: [
+                dict(
+                    name="{hostname} {category} %s %s elements" % (
+                        cflags, array_size
+                    ),
+                    select=dict(
+                        metas__cflags=cflags,
+                        metas__array_size=array_size,
+                    ),
+                    series=dict(
+                        metas=['thread'],
+                        metrics=[
+                            'bandwidth__%s_bandwidth' % kernel
+                            for kernel in StreamExtractor.KERNELS
+                        ],
+                    ),
+                    plotter=Stream.plot_bandwidth
+                )
+                for cflags in self.attribute('cflags')
+                for array_size in self.attribute('array_size')
+            ]
+        }
+
+    @classmethod
+    def plot_bandwidth(cls, plt, description, metas, metrics):
+        """Generate bandwidth plot, one line per kernel
+        """
+        del description  # unused
+        for kernel in StreamExtractor.KERNELS:
+            plt.plot(metas['thread'], metrics['bandwidth__%s_bandwidth' %
+                                              kernel],
+                     'o-', label=kernel)
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('OMP_NUM_THREADS')
+        plt.ylabel('MB/s')
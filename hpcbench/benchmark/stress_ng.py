@@ -0,0 +1,193 @@
+"""HPCBench benchmark driver for stress-ng
+
+    https://kernel.ubuntu.com/~cking/stress-ng/
+"""
+import os.path as osp
+
+from cached_property import cached_property
+import yaml
+
+from hpcbench.api import (
+    Benchmark,
+    Metric,
+    Metrics,
+    MetricsExtractor,
+)
+from hpcbench.toolbox.process import thread_counts
+from hpcbench.toolbox.sweep import values
+
+
+class StressNgExtractor(MetricsExtractor):
+    """Extract throughput of a stressor from the YAML metrics file
+    written by stress-ng
+    """
+    YAML_FILE = 'stress-ng.yaml'
+    # stress-ng metric -> metric name
+    FIELDS = {
+        'bogo-ops': 'bogo_ops',
+        'bogo-ops-per-second-real-time': 'bogo_ops_per_second',
+        'bogo-ops-per-second-usr-sys-time': 'bogo_ops_per_second_usr_sys',
+        'wall-clock-time': 'wall_clock_time',
+    }
+
+    def __init__(self):
+        self._metrics = dict(
+            bogo_ops=Metric('bogo ops', float),
+            bogo_ops_per_second=Metric('bogo ops/s', float),
+            bogo_ops_per_second_usr_sys=Metric('bogo ops/s', float),
+            wall_clock_time=Metrics.Second,
+        )
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    def extract(self, outdir, metas):
+        with open(osp.join(outdir, self.YAML_FILE)) as istr:
+            data = yaml.safe_load(istr)
+        for stressor in data.get('metrics') or []:
+            if stressor.get('stressor') == metas['stressor']:
+                break
+        else:
+            raise Exception('No metrics reported for stressor %s' %
+                            metas['stressor'])
+        metrics = dict(
+            (name, float(stressor[field]))
+            for field, name in self.FIELDS.items()
+            if field in stressor
+        )
+        unset_attributes = set(self.metrics) - set(metrics)
+        if any(unset_attributes):
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
+        return metrics
+
+
+class StressNg(Benchmark):
+    """Benchmark wrapper for stress-ng
+
+    Every execution runs one stressor, the category being the
+    stressor name.
+
+    Attributes, all optional:
+
+    stressors:
+        dictionary of stressor name -> list of methods to test, or
+        ``null`` to use the stressor default method.
+    workers:
+        numbers of workers of every stressor, default is powers of 2
+        up to the number of CPUs.
+    timeout:
+        duration of every execution, in seconds
+    """
+    DEFAULT_ATTRIBUTES = dict(
+        stressors=dict(
+            cpu=['matrixprod', 'fft', 'int64'],
+            vm=None,
+            cache=None,
+            matrix=None,
+            pipe=None,
+        ),
+        workers=None,
+        timeout=10,
+    )
+
+    name = 'stress-ng'
+
+    description = """
+        stress-ng exercises various physical subsystems and operating
+        system kernel interfaces, and reports their throughput in
+        bogo operations per second.
+        """
+
+    @property
+    def stressors(self):
+        """Get stressors to execute
+
+        :return: stressor name -> list of methods, ``[None]`` for
+        the stressors default method
+        :rtype: dictionary
+        """
+        return dict(
+            (stressor, methods or [None])
+            for stressor, methods in self.attribute('stressors').items()
+        )
+
+    @property
+    def workers(self):
+        """Get numbers of workers to test"""
+        workers = self.attribute('workers')
+        if workers is None:
+            workers = thread_counts()
+        return list(values(workers))
+
+    @property
+    def execution_matrix(self):
+        stressors = self.stressors
+        for stressor in sorted(stressors):
+            for method in stressors[stressor]:
+                for workers in self.workers:
+                    command = [
+                        'stress-ng',
+                        '--%s' % stressor, str(workers),
+                    ]
+                    if method is not None:
+                        command.append('--%s-method=%s' % (stressor, method))
+                    command += [
+                        '--timeout', '%ss' % self.attribute('timeout'),
+                        '--metrics-brief',
+                        '--yaml', StressNgExtractor.YAML_FILE,
+                    ]
+                    yield dict(
+                        category=stressor,
+                        command=command,
+                        metas=dict(
+                            stressor=stressor,
+                            method=method,
+                            workers=workers,
+                        )
+                    )
+
+    def estimated_duration(self, execution):
+        del execution  # unused
+        return float(self.attribute('timeout'))
+
+    @cached_property
+    def metrics_extractors(self):
+        return dict(
+            (stressor, StressNgExtractor()) for stressor in self.stressors
+        )
+
+    @property
+    def plots(self):
+        return dict(
+            (stressor, [
+                dict(
+                    name="{hostname} {category} throughput",
+                    series=dict(
+                        metas=['workers', 'method'],
+                        metrics=['%s__bogo_ops_per_second' % stressor],
+                    ),
+                    plotter=StressNg.plot_throughput
+                )
+            ])
+            for stressor in self.stressors
+        )
+
+    @classmethod
+    def plot_throughput(cls, plt, description, metas, metrics):
+        """Plot throughput by number of workers, one line per method
+        """
+        metric = description['series']['metrics'][0]
+        lines = dict()
+        methods = metas.get('method') or [None] * len(metas['workers'])
+        for workers, method, value in zip(metas['workers'], methods,
+                                          metrics[metric]):
+            line = lines.setdefault(method or 'default', ([], []))
+            line[0].append(workers)
+            line[1].append(value)
+        for method in sorted(lines):
+            plt.plot(lines[method][0], lines[method][1], 'o-', label=method)
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('workers')
+        plt.ylabel('bogo ops/s')
@@ -1,22 +1,41 @@
 """HPCBench benchmark driver for sysbench
 
     https://github.com/akopytov/sysbench
+
+Outputs of both the legacy (0.4, 0.5) and the 1.x versions of sysbench
+are supported. Commands are written with the legacy options, still
+accepted by sysbench 1.x.
 """
 import re
 
 from cached_property import cached_property
+import six
 
 from hpcbench.api import (
     Benchmark,
+    Metric,
     Metrics,
     MetricsExtractor,
 )
+from hpcbench.toolbox.process import thread_counts
+from hpcbench.toolbox.sweep import values
 
 
-class CpuExtractor(MetricsExtractor):
-    """Ignore stdout until this line"""
-    STDOUT_IGNORE_PRIOR = 'Test execution summary:'
+class SysbenchExtractor(MetricsExtractor):
+    """Extract statistics provided by every sysbench test"""
     KEEP_NUMBERS = re.compile('[^0-9.]')
+    STATISTIC = re.compile(r'^\s*([^:]+):\s+(\S+)')
+    # Statistics sections, legacy then 1.x output
+    SECTIONS = ('Test execution summary:', 'General statistics:')
+    # Statistic label -> metric name
+    STATISTICS = {
+        'total time': 'total_time',
+        'min': 'minimum',
+        'avg': 'average',
+        'max': 'maximum',
+        'approx.  95 percentile': 'percentile95',
+        '95th percentile': 'percentile95',
+    }
 
     def __init__(self):
         self._metrics = dict(
@@ -35,43 +54,163 @@ class CpuExtractor(MetricsExtractor):
         return self._metrics
 
     def extract(self, outdir, metas):
-        mapping = {
-            'min': 'minimum',
-            'avg': 'average',
-            'max': 'maximum',
-            'approx.  95 percentile': 'percentile95',
-            'total time': 'total_time',
-        }
         metrics = {}
-        # parse stdout and extract desired metrics
         with open(self.stdout(outdir)) as istr:
+            test_output = []
             for line in istr:
-                if line.strip() == self.STDOUT_IGNORE_PRIOR:
+                if line.strip() in self.SECTIONS:
                     break
+                test_output.append(line)
+            self.extract_test_metrics(test_output, metrics)
             for line in istr:
-                line = line.strip()
-                for attr, metric in mapping.items():
-                    if line.startswith(attr + ':'):
-                        value = line[len(attr + ':'):].lstrip()
-                        value = self.KEEP_NUMBERS.sub('', value)
-                        metrics[metric] = float(value)
+                match = self.STATISTIC.match(line)
+                if match is None:
+                    continue
+                metric = self.STATISTICS.get(match.group(1))
+                if metric is not None:
+                    value = self.KEEP_NUMBERS.sub('', match.group(2))
+                    metrics[metric] = float(value)
         # ensure all metrics have been extracted
-        unset_attributes = set(mapping.values()) - set(metrics)
+        unset_attributes = set(self.metrics) - set(metrics)
         if any(unset_attributes):
-            raise Exception('Could not extract some metrics: %s',
-                            ' '.join(unset_attributes))
+            raise Exception('Could not extract some metrics: %s' %
+                            ' '.join(sorted(unset_attributes)))
         return metrics
 
+    def extract_test_metrics(self, lines, metrics):
+        """Extract metrics specific to a sysbench test
+
+        :param lines: output written before the statistics section
+        :param metrics: dictionary to fill
+        """
+        del lines, metrics  # unused
+
+
+class CpuExtractor(SysbenchExtractor):
+    """Extract metrics of the sysbench cpu test"""
+
+
+class MemoryExtractor(SysbenchExtractor):
+    """Extract metrics of the sysbench memory test"""
+    OPERATIONS = re.compile(
+        r'^(?:Operations performed|Total operations):\s*\d+\s*'
+        r'\(\s*([0-9.]+) (?:ops/sec|per second)\)'
+    )
+    # sysbench legacy "MB" are MiB
+    TRANSFERRED = re.compile(
+        r'^[0-9.]+ (?:MB|MiB) transferred \(([0-9.]+) (?:MB|MiB)/sec\)'
+    )
+
+    def __init__(self):
+        super(MemoryExtractor, self).__init__()
+        self._metrics.update(
+            operations_rate=Metric('ops/s', float),
+            bandwidth=Metric('MiB/s', float),
+        )
+
+    def extract_test_metrics(self, lines, metrics):
+        for line in lines:
+            line = line.strip()
+            match = self.OPERATIONS.match(line)
+            if match:
+                metrics['operations_rate'] = float(match.group(1))
+            match = self.TRANSFERRED.match(line)
+            if match:
+                metrics['bandwidth'] = float(match.group(1))
+
+
+class FileioExtractor(SysbenchExtractor):
+    """Extract metrics of the sysbench fileio test"""
+    # legacy output
+    LEGACY_TRANSFERRED = re.compile(
+        r'Total transferred .*\(([0-9.]+)([KMGT]?b)/sec\)'
+    )
+    LEGACY_REQUESTS = re.compile(r'^([0-9.]+) Requests/sec executed')
+    # sysbench legacy "Mb" are MiB
+    LEGACY_UNITS = dict(b=1.0 / 1024 ** 2, Kb=1.0 / 1024, Mb=1.0,
+                        Gb=1024.0, Tb=1024.0 ** 2)
+    # 1.x output
+    REQUESTS = ('reads/s', 'writes/s')
+    THROUGHPUT = ('read, MiB/s', 'written, MiB/s')
+
+    def __init__(self):
+        super(FileioExtractor, self).__init__()
+        self._metrics.update(
+            requests_rate=Metric('ops/s', float),
+            throughput=Metric('MiB/s', float),
+        )
+
+    def extract_test_metrics(self, lines, metrics):
+        for line in lines:
+            line = line.strip()
+            match = self.LEGACY_TRANSFERRED.search(line)
+            if match:
+                metrics['throughput'] = (
+                    float(match.group(1)) *
+                    self.LEGACY_UNITS[match.group(2)]
+                )
+                continue
+            match = self.LEGACY_REQUESTS.match(line)
+            if match:
+                metrics['requests_rate'] = float(match.group(1))
+                continue
+            match = self.STATISTIC.match(line)
+            if match:
+                label, value = match.groups()
+                if label in self.REQUESTS:
+                    metrics['requests_rate'] = (
+                        metrics.get('requests_rate', 0.0) + float(value)
+                    )
+                elif label in self.THROUGHPUT:
+                    metrics['throughput'] = (
+                        metrics.get('throughput', 0.0) + float(value)
+                    )
+
 
 class Sysbench(Benchmark):
     """Benchmark wrapper for the sysbench utility
+
+    Attributes, all optional:
+
+    features:
+        sysbench tests to execute, among ``cpu``, ``memory``,
+        ``fileio``, ``threads``, and ``mutex``. Default is ``cpu``
+        only, other tests have to be enabled explicitly.
+    threads:
+        number of threads, default is powers of 2 up to the number
+        of CPUs.
+    max_prime:
+        upper limits of the cpu test primes generator
+    memory_block_size, memory_access_mode:
+        block sizes (``4K`` for instance) and access modes
+        (``seq`` and ``rnd``) of the memory test.
+    memory_total_size:
+        amount of memory transferred by the memory test
+    file_test_mode, file_total_size:
+        workloads (``seqwr``, ``rndrw``, ...) and size of the files
+        of the fileio test.
+    scratch_dir:
+        directory where the fileio test creates its files. Default
+        is the output directory of the command.
     """
     FEATURE_CPU = 'cpu'
+    FEATURE_MEMORY = 'memory'
+    FEATURE_FILEIO = 'fileio'
+    FEATURE_THREADS = 'threads'
+    FEATURE_MUTEX = 'mutex'
 
-    def __init__(self):
-        super(Sysbench, self).__init__(
-            attributes=dict(features=[Sysbench.FEATURE_CPU])
-        )
+    DEFAULT_ATTRIBUTES = dict(
+        features=[FEATURE_CPU],
+        threads=None,
+        max_prime=[30],
+        memory_block_size=['1K', '1M'],
+        memory_access_mode=['seq', 'rnd'],
+        memory_total_size='1G',
+        file_test_mode=['seqwr', 'rndrw'],
+        file_total_size='1G',
+        scratch_dir=None,
+    )
+    SIZE_UNITS = dict(K=1024, M=1024 ** 2, G=1024 ** 3, T=1024 ** 4)
 
     name = 'sysbench'
 
@@ -81,30 +220,146 @@ class Sysbench(Benchmark):
         performance, and even MySQL benchmarking.
         """
 
+    @property
+    def threads(self):
+        """Get numbers of threads to test"""
+        threads = self.attribute('threads')
+        if threads is None:
+            threads = thread_counts()
+        return list(values(threads))
+
     @property
     def execution_matrix(self):
-        if Sysbench.FEATURE_CPU in self.attributes['features']:
-            for thread in [1, 4, 16]:
-                for max_prime in [30]:
+        features = self.attribute('features')
+        for feature in [Sysbench.FEATURE_CPU, Sysbench.FEATURE_MEMORY,
+                        Sysbench.FEATURE_FILEIO, Sysbench.FEATURE_THREADS,
+                        Sysbench.FEATURE_MUTEX]:
+            if feature in features:
+                executions = getattr(self, '_{}_executions'.format(feature))
+                for execution in executions():
+                    yield execution
+
+    def _command(self, test, thread, *options):
+        return [
+            'sysbench',
+            '--test=%s' % test,
+            '--num-threads=%s' % thread,
+        ] + list(options)
+
+    def _cpu_executions(self):
+        for thread in self.threads:
+            for max_prime in self.attribute('max_prime'):
+                yield dict(
+                    category=Sysbench.FEATURE_CPU,
+                    command=self._command(
+                        'cpu', thread,
+                        '--cpu-max-prime=%s' % max_prime,
+                        'run'
+                    ),
+                    metas=dict(
+                        thread=thread,
+                        max_prime=max_prime
+                    )
+                )
+
+    def _memory_executions(self):
+        for thread in self.threads:
+            for access_mode in self.attribute('memory_access_mode'):
+                for block_size in self.attribute('memory_block_size'):
                     yield dict(
-                        category='cpu',
-                        command=[
-                            'sysbench',
-                            '--test=cpu',
-                            '--num-threads=%s' % thread,
-                            '--cpu-max-prime=%s' % max_prime,
+                        category=Sysbench.FEATURE_MEMORY,
+                        command=self._command(
+                            'memory', thread,
+                            '--memory-block-size=%s' % block_size,
+                            '--memory-total-size=%s' %
+                            self.attribute('memory_total_size'),
+                            '--memory-access-mode=%s' % access_mode,
                             'run'
-                        ],
+                        ),
                         metas=dict(
                             thread=thread,
-                            max_prime=max_prime
+                            block_size=self.size_in_bytes(block_size),
+                            access_mode=access_mode,
                         )
                     )
 
+    def _fileio_executions(self):
+        total_size = self.attribute('file_total_size')
+        for thread in self.threads:
+            for test_mode in self.attribute('file_test_mode'):
+                command = self._command(
+                    'fileio', thread,
+                    '--file-total-size=%s' % total_size,
+                    '--file-test-mode=%s' % test_mode,
+                )
+                yield dict(
+                    category=Sysbench.FEATURE_FILEIO,
+                    command=['sh', '-c', self._fileio_script(command)],
+                    metas=dict(
+                        thread=thread,
+                        test_mode=test_mode,
+                        total_size=self.size_in_bytes(total_size),
+                    )
+                )
+
+    def _fileio_script(self, command):
+        """Shell script creating the test files, running the test,
+        and removing the files, in a dedicated directory
+        of ``scratch_dir`` if specified.
+        """
+        command = ' '.join(six.moves.shlex_quote(arg) for arg in command)
+        script = []
+        scratch_dir = self.attribute('scratch_dir')
+        if scratch_dir:
+            script.append(
+                'cd "$(mktemp -d {}/sysbench.XXXXXX)" || exit 1'.format(
+                    six.moves.shlex_quote(scratch_dir)
+                )
+            )
+        script += [
+            '{} prepare >/dev/null || exit 1'.format(command),
+            '{} run'.format(command),
+            'status=$?',
+            '{} cleanup >/dev/null'.format(command),
+        ]
+        if scratch_dir:
+            script.append('cd .. && rmdir "$OLDPWD"')
+        script.append('exit $status')
+        return '\n'.join(script)
+
+    def _threads_executions(self):
+        for thread in self.threads:
+            yield dict(
+                category=Sysbench.FEATURE_THREADS,
+                command=self._command('threads', thread, 'run'),
+                metas=dict(thread=thread)
+            )
+
+    def _mutex_executions(self):
+        for thread in self.threads:
+            yield dict(
+                category=Sysbench.FEATURE_MUTEX,
+                command=self._command('mutex', thread, 'run'),
+                metas=dict(thread=thread)
+            )
+
+    @classmethod
+    def size_in_bytes(cls, size):
+        """Convert sysbench size option, like ``4K``, in bytes"""
+        size = str(size)
+        unit = cls.SIZE_UNITS.get(size[-1:].upper())
+        if unit is None:
+            return int(size)
+        return int(size[:-1]) * unit
+
     @cached_property
     def metrics_extractors(self):
         return {
             Sysbench.FEATURE_CPU: CpuExtractor(),
+            Sysbench.FEATURE_MEMORY: MemoryExtractor(),
+            Sysbench.FEATURE_FILEIO: FileioExtractor(),
+            Sysbench.FEATURE_THREADS: SysbenchExtractor(),
+            Sysbench.FEATURE_MUTEX: SysbenchExtractor(),
         }
 
     @property
@@ -115,7 +370,7 @@ class Sysbench(Benchmark):
                     name="{hostname} {category} timing",
                     #  for_each=['max_prime'],  TODO
                     select=dict(
-                        metas__max_prime=30
+                        metas__max_prime=max_prime
                     ),
                     series=dict(
                         metas=['-thread'],
@@ -123,21 +378,98 @@ class Sysbench(Benchmark):
                                  'cpu__maximum', 'cpu__percentile95'],
                     ),
                     plotter=Sysbench.plot_timing
+                )
+                for max_prime in self.attribute('max_prime')
+            ],
+            Sysbench.FEATURE_MEMORY: [
+                dict(
+                    name="{hostname} {category} %s bandwidth" % access_mode,
+                    select=dict(
+                        metas__access_mode=access_mode
+                    ),
+                    series=dict(
+                        metas=['thread', 'block_size'],
+                        metrics=['memory__bandwidth'],
+                    ),
+                    plotter=Sysbench.plot_by_thread
+                )
+                for access_mode in self.attribute('memory_access_mode')
+            ],
+            Sysbench.FEATURE_FILEIO: [
+                dict(
+                    name="{hostname} {category} throughput",
+                    series=dict(
+                        metas=['thread', 'test_mode'],
+                        metrics=['fileio__throughput'],
+                    ),
+                    plotter=Sysbench.plot_by_thread
                 ),
-            ]
+            ],
+            Sysbench.FEATURE_THREADS: [
+                dict(
+                    name="{hostname} {category} timing",
+                    series=dict(
+                        metas=['-thread'],
+                        metrics=['threads__minimum', 'threads__average',
+                                 'threads__maximum',
+                                 'threads__percentile95'],
+                    ),
+                    plotter=Sysbench.plot_timing
+                ),
+            ],
+            Sysbench.FEATURE_MUTEX: [
+                dict(
+                    name="{hostname} {category} total time",
+                    series=dict(
+                        metas=['thread'],
+                        metrics=['mutex__total_time'],
+                    ),
+                    plotter=Sysbench.plot_total_time
+                ),
+            ],
         }
 
     @classmethod
     def plot_timing(cls, plt, description, metas, metrics):
         """Generate timings plot
         """
-        del description  # unused
-        plt.plot(metas['thread'], metrics['cpu__minimum'],
+        category = description['series']['metrics'][0].split('__')[0]
+        plt.plot(metas['thread'], metrics[category + '__minimum'],
                  'r--', label='minimum')
-        plt.plot(metas['thread'], metrics['cpu__maximum'],
+        plt.plot(metas['thread'], metrics[category + '__maximum'],
                  'bs-', label='maximum')
-        plt.plot(metas['thread'], metrics['cpu__average'],
+        plt.plot(metas['thread'], metrics[category + '__average'],
                  'g^', label='average')
         plt.legend(loc='upper right', frameon=False)
         plt.xlabel('thread')
+        plt.ylabel("t (ms)")
+
+    @classmethod
+    def plot_total_time(cls, plt, description, metas, metrics):
+        """Generate total time plot
+        """
+        metric = description['series']['metrics'][0]
+        plt.plot(metas['thread'], metrics[metric], 'bs-')
+        plt.xlabel('thread')
         plt.ylabel("t (sec)")
+
+    @classmethod
+    def plot_by_thread(cls, plt, description, metas, metrics):
+        """Plot one line per value of the second meta of the series,
+        with number of threads on the X axis
+        """
+        serie = description['series']['metas'][1]
+        metric = description['series']['metrics'][0]
+        lines = dict()
+        for thread, value, metric_value in zip(metas['thread'],
+                                               metas[serie],
+                                               metrics[metric]):
+            line = lines.setdefault(value, ([], []))
+            line[0].append(thread)
+            line[1].append(metric_value)
+        for value in sorted(lines):
+            plt.plot(lines[value][0], lines[value][1], 'o-',
+                     label='{} {}'.format(serie, value))
+        plt.legend(loc='upper left', frameon=False)
+        plt.xlabel('thread')
+        plt.ylabel('MiB/s')
@@ -2,10 +2,13 @@
 """
 import re
 
+from . import arrays
 from . toolbox.collections_ext import (
     Configuration,
     nameddict,
 )
+from . toolbox.hostlist import expand_hostlist
+from . toolbox.re_ext import has_flags
 
 
 def from_file(campaign_file):
@@ -32,8 +35,9 @@ def fill_default_campaign_values(campaign):
     )
     for key, value in default_campaign.items():
         campaign.setdefault(key, value)
-    campaign.setdefault('network', {})
+    campaign.setdefault('network', nameddict())
     campaign['network'].setdefault('nodes', ['localhost'])
+    campaign.network.nodes = expand_hostlists(campaign.network.nodes)
     campaign.network.setdefault('tags', {})
     campaign.benchmarks.setdefault('*', {})
     for tag in list(campaign.network.tags):
@@ -49,14 +53,119 @@ def fill_default_campaign_values(campaign):
                     if not isinstance(pattern[mode], list):
                         raise Exception('Invalid "nodes" value type.'
                                         ' list expected')
-                    pattern[mode] = set(pattern[mode])
+                    pattern[mode] = set(expand_hostlists(pattern[mode]))
                 else:
                     raise Exception('Unknown tag association pattern: %s',
                                     mode)
+    campaign.network.tags_index = TagsIndex(campaign.network.tags,
+                                            campaign.network.nodes)
     set_export_campaign_section(campaign)
     return campaign
 
 
+def expand_hostlists(hostlists):
+    """Expand a list of hostlist expressions
+
+    :param hostlists: list of string, ``['srv[01-16]', 'gpu01']``
+    for instance
+    :return: hostnames
+    :rtype: list of string
+    """
+    return [
+        host
+        for hostlist in hostlists
+        for host in expand_hostlist(str(hostlist))
+    ]
+
+
+class TagsIndex(object):
+    """Provide tags associated to a node.
+
+    Tags of the campaign nodes are computed once. Regular expressions
+    of all tags are combined in a single pattern, so that a hostname
+    is matched only once, whatever the number of tags. Expressions
+    with groups or inline flags are matched separately.
+    """
+
+    # Python 2 does not support more than 100 named groups
+    MAX_GROUPS = 99
+
+    def __init__(self, tags, nodes):
+        """
+        :param tags: normalized ``network.tags`` campaign section
+        :param nodes: list of nodes to index
+        """
+        self._explicit = dict()
+        patterns = []
+        self._automata = []
+        for tag, configs in tags.items():
+            for config in configs:
+                for mode, kconfig in config.items():
+                    if mode == 'nodes':
+                        for node in kconfig:
+                            self._explicit.setdefault(node, set()).add(tag)
+                    elif kconfig.groups or has_flags(kconfig):
+                        # groups, back-references and flags, applying
+                        # to the whole pattern, prevent combination
+                        self._automata.append((kconfig, {0: tag}))
+                    else:
+                        patterns.append((tag, kconfig))
+        for i in range(0, len(patterns), self.MAX_GROUPS):
+            self._automata.append(
+                self._compile(patterns[i:i + self.MAX_GROUPS])
+            )
+        self._index = dict()
+        for node in nodes:
+            self.get(node)
+
+    @classmethod
+    def _compile(cls, patterns):
+        """Build a regular expression made of optional lookaheads, one
+        per pattern, to get all matching patterns in a single pass.
+
+        :param patterns: list of tuple (tag, compiled regex without group)
+        :return: compiled regex, and mapping group name -> tag
+        :rtype: tuple
+        """
+        return (
+            re.compile(''.join(
+                '(?:(?=(?P<tag%d>%s)))?' % (i, pattern.pattern)
+                for i, (_, pattern) in enumerate(patterns)
+            )),
+            dict(
+                ('tag%d' % i, tag) for i, (tag, _) in enumerate(patterns)
+            )
+        )
+
+    def get(self, node):
+        """Get tags associated to a node
+
+        :param node: hostname
+        :rtype: frozenset of string
+        """
+        tags = self._index.get(node)
+        if tags is None:
+            tags = set(self._explicit.get(node, []))
+            for automaton, groups in self._automata:
+                match = automaton.match(node)
+                if match is None:
+                    continue
+                for group, tag in groups.items():
+                    if match.group(group) is not None:
+                        tags.add(tag)
+            tags = frozenset(tags)
+            self._index[node] = tags
+        return tags
+
+    @property
+    def nodes(self):
+        """Get indexed nodes and their tags
+
+        :rtype: dictionary of string -> frozenset of string
+        """
+        return self._index
+
+
 def set_export_campaign_section(campaign):
     """Add default values for the ``export`` section
     """
@@ -66,6 +175,14 @@ def set_export_campaign_section(campaign):
     campaign.export.elasticsearch.setdefault('connection_params', {})
     campaign.export.elasticsearch.setdefault('index_name',
                                              'hpcbench-{date}')
+    for exporter in ['csv', 'ndjson', 'parquet']:
+        campaign.export.setdefault(exporter, nameddict())
+        campaign.export[exporter].setdefault('path', 'hpcbench.' + exporter)
+        campaign.export[exporter].setdefault('batch_size', 1000)
+    campaign.export.ndjson.setdefault('bulk', False)
+    campaign.export.setdefault('openmetrics', nameddict())
+    campaign.export.openmetrics.setdefault('path', 'hpcbench.prom')
+    campaign.export.openmetrics.setdefault('textfile', None)
     return campaign
 
 
@@ -99,3 +216,24 @@ def get_metrics(campaign):
                         ),
                         cat_obj.metrics
                     )
+
+
+def get_runs(campaign, array=None):
+    """Get all runs of a campaign
+
+    :param array: optional function called with every reference to
+    the file of an array metric, providing the value exported instead,
+    ``hpcbench.arrays.values`` for instance. Relative paths of
+    references are valid when the function is called.
+    :return: runs, augmented with the hostname, tag, category
+    and suite they belong to
+    :rtype: dictionary generator
+    """
+    for attrs, metrics in get_metrics(campaign):
+        for run in metrics:
+            eax = dict()
+            eax.update(attrs)
+            eax.update(run)
+            if array is not None:
+                eax = arrays.resolve(eax, array)
+            yield eax
@@ -3,10 +3,8 @@
 import logging
 
 from docopt import docopt
-import matplotlib
 
 from hpcbench import __version__
-from hpcbench.toolbox.loader import load_components
 
 
 def setup_logger(verbose):
@@ -22,10 +20,9 @@ def setup_logger(verbose):
 
 
 def cli_common(doc, **kwargs):
-    """Program initialization for all provided executables
+    """Program initialization for all provided executables.
+    Plugins are loaded on-demand, when a campaign refers to them.
     """
     arguments = docopt(doc, version='hpcbench ' + __version__, **kwargs)
     setup_logger(arguments['-v'])
-    load_components()
-    matplotlib.use('PS')
     return arguments
@@ -0,0 +1,73 @@
+"""ben-diff - Compare two campaigns to detect performance regressions
+
+Runs are aligned by host, tag, benchmark, category and metas.
+The verdict is written in JSON. Exit status is 1 if any metric
+regressed, 0 otherwise.
+
+Usage:
+  ben-diff [-v | -vv] [-c FILE] [-o FILE] [--threshold RATIO]
+           [--alpha LEVEL] [--min-samples COUNT] BASE NEW
+  ben-diff (-h | --help)
+  ben-diff --version
+
+Arguments:
+  BASE  reference campaign directory, or NDJSON export
+  NEW   compared campaign directory, or NDJSON export
+
+Options:
+  -c, --config FILE     YAML file providing comparison options,
+                        and the threshold and direction of metrics
+  -o, --output FILE     Write verdict to specified file
+                        instead of standard output
+  --threshold RATIO     Minimal relative change of a metric mean
+                        [default: 0.05]
+  --alpha LEVEL         Significance level of the statistical tests
+                        [default: 0.05]
+  --min-samples COUNT   Minimal number of runs to perform statistical
+                        tests [default: 4]
+  -h, --help            Show this screen
+  --version             Show version
+  -v -vv -vvv           Increase program verbosity
+"""
+import json
+import sys
+
+import yaml
+
+from hpcbench.diff import (
+    Comparison,
+    load_runs,
+)
+from . import cli_common
+
+# exit status when a regression is detected
+EXIT_REGRESSION = 1
+
+
+def main(argv=None):
+    """ben-diff entry point"""
+    arguments = cli_common(__doc__, argv=argv)
+    config = dict(
+        threshold=float(arguments['--threshold']),
+        alpha=float(arguments['--alpha']),
+        min_samples=int(arguments['--min-samples']),
+    )
+    if arguments['--config']:
+        with open(arguments['--config']) as istr:
+            config.update(yaml.safe_load(istr) or {})
+    base_runs, base_units = load_runs(arguments['BASE'])
+    new_runs, units = load_runs(arguments['NEW'])
+    for category, names in base_units.items():
+        units.setdefault(category, {}).update(names)
+    verdict = Comparison(config)(base_runs, new_runs, units)
+    if arguments['--output']:
+        with open(arguments['--output'], 'w') as ostr:
+            json.dump(verdict, ostr, indent=2)
+    else:
+        json.dump(verdict, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return EXIT_REGRESSION if verdict['regressions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
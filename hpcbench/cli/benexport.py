@@ -0,0 +1,46 @@
+"""ben-export - Export campaign data
+
+Usage:
+  ben-export [-v | -vv] [-t TYPE] [-o FILE] CAMPAIGN-DIR
+  ben-export (-h | --help)
+  ben-export --version
+
+Options:
+  -t, --type TYPE    Exporter to use, for instance csv, ndjson,
+                     parquet or elasticsearch [default: ndjson]
+  -o, --output FILE  Output file of the exporters writing local files.
+                     Default is specified in the campaign ``export``
+                     section.
+  -h, --help         Show this screen
+  --version          Show version
+  -v -vv -vvv        Increase program verbosity
+"""
+
+import os.path as osp
+
+from hpcbench.api import Exporter
+from hpcbench.driver import CampaignDriver
+from hpcbench.toolbox.collections_ext import nameddict
+from hpcbench.toolbox.contextlib_ext import pushd
+from . import cli_common
+
+
+def main(argv=None):
+    """ben-export entry point"""
+    arguments = cli_common(__doc__, argv=argv)
+    campaign_path = arguments['CAMPAIGN-DIR']
+    driver = CampaignDriver(campaign_path=campaign_path)
+    exporter_name = arguments['--type']
+    if arguments['--output']:
+        export_conf = driver.campaign.export.setdefault(exporter_name,
+                                                        nameddict())
+        export_conf['path'] = osp.abspath(arguments['--output'])
+    exporter = Exporter.get_subclass(exporter_name)(driver)
+    with pushd(campaign_path):
+        exporter.export()
+    if __name__ != '__main__':
+        return exporter
+
+
+if __name__ == '__main__':
+    main()
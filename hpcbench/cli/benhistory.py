@@ -0,0 +1,73 @@
+"""ben-history - Detect change points in the history of campaigns metrics
+
+The history is written by ben-umb. Change points are written in JSON.
+Exit status is 1 if any change point is detected, 0 otherwise.
+
+Usage:
+  ben-history [-v | -vv] [-c FILE] [-o FILE] [-m METHOD]
+              [--statistic STAT] [--min-size COUNT] [--metric PATTERN]...
+              HISTORY-FILE
+  ben-history (-h | --help)
+  ben-history --version
+
+Arguments:
+  HISTORY-FILE  history file written by ben-umb
+
+Options:
+  -c, --config FILE     YAML file providing detection options
+  -o, --output FILE     Write change points to specified file
+                        instead of standard output
+  -m, --method METHOD   Change point detection method, e-divisive
+                        or cusum [default: e-divisive]
+  --statistic STAT      Statistic of the metrics to analyze
+                        [default: mean]
+  --min-size COUNT      Minimal number of campaigns between change
+                        points [default: 3]
+  --metric PATTERN      Pattern of the metrics to analyze,
+                        ``<category>__<metric>``
+  -h, --help            Show this screen
+  --version             Show version
+  -v -vv -vvv           Increase program verbosity
+"""
+import json
+import sys
+
+import yaml
+
+from hpcbench.history import (
+    ChangePointDetector,
+    load,
+)
+from . import cli_common
+
+# exit status when a change point is detected
+EXIT_CHANGE = 1
+
+
+def main(argv=None):
+    """ben-history entry point"""
+    arguments = cli_common(__doc__, argv=argv)
+    config = dict(
+        method=arguments['--method'],
+        statistic=arguments['--statistic'],
+        min_size=int(arguments['--min-size']),
+    )
+    if arguments['--metric']:
+        config['metrics'] = arguments['--metric']
+    if arguments['--config']:
+        with open(arguments['--config']) as istr:
+            config.update(yaml.safe_load(istr) or {})
+    change_points = ChangePointDetector(config)(
+        load(arguments['HISTORY-FILE'])
+    )
+    if arguments['--output']:
+        with open(arguments['--output'], 'w') as ostr:
+            json.dump(change_points, ostr, indent=2)
+    else:
+        json.dump(change_points, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return EXIT_CHANGE if change_points else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,25 +1,66 @@
 """ben-sh
 
 Usage:
-  ben-sh [-v | -vv ] CAMPAIGN_FILE
+  ben-sh [-v | -vv ] [-n] CAMPAIGN_FILE
   ben-sh (-h | --help)
   ben-sh --version
 
 Options:
-  -h --help   Show this screen
-  --version   Show version
-  -v -vv -vvv Increase program verbosity
+  -n --dry-run  Print execution plan without running it
+  -h --help     Show this screen
+  --version     Show version
+  -v -vv -vvv   Increase program verbosity
 """
+import datetime
+import sys
+
+import six
 
 from hpcbench.driver import CampaignDriver
 from . import cli_common
 
 
+def print_plan(plan, ostr=None):
+    """Write execution plan in a stream
+
+    :param plan: ``hpcbench.plan.Plan`` instance
+    :param ostr: output stream, default is standard output
+    """
+    ostr = ostr or sys.stdout
+    for execution in plan:
+        duration = execution['estimated_duration']
+        ostr.write('{id} {location} {duration} {command}\n'.format(
+            id=execution['id'],
+            location='/'.join(
+                execution[field]
+                for field in ['host', 'tag', 'suite', 'category']
+            ),
+            duration='?' if duration is None else _format_duration(duration),
+            command=' '.join(
+                six.moves.shlex_quote(str(arg))
+                for arg in execution['execution']['command']
+            )
+        ))
+    duration, unknown = plan.estimated_duration
+    ostr.write(
+        '{} executions, estimated duration {}, {} unknown\n'.format(
+            len(plan), _format_duration(duration), unknown
+        )
+    )
+
+
+def _format_duration(seconds):
+    return str(datetime.timedelta(seconds=int(round(seconds))))
+
+
 def main(argv=None):
     """ben-sh entry point"""
     arguments = cli_common(__doc__, argv=argv)
     driver = CampaignDriver(campaign_file=arguments['CAMPAIGN_FILE'])
-    driver()
+    if arguments['--dry-run']:
+        print_plan(driver.plan)
+    else:
+        driver()
     if argv is not None:
         return driver
 
@@ -0,0 +1,49 @@
+"""ben-tags - Print tags associated to the nodes of a campaign
+
+Usage:
+  ben-tags [-v | -vv] CAMPAIGN_FILE
+  ben-tags (-h | --help)
+  ben-tags --version
+
+Options:
+  -h --help   Show this screen
+  --version   Show version
+  -v -vv -vvv Increase program verbosity
+"""
+from __future__ import print_function
+
+from hpcbench.campaign import from_file
+from . import cli_common
+
+
+def print_matrix(campaign, ostr=None):
+    """Print the node x tag matrix of a campaign
+
+    :param campaign: campaign, as returned by ``hpcbench.campaign.from_file``
+    :param ostr: output stream, default is standard output
+    """
+    tags = sorted(campaign.network.tags)
+    tags_index = campaign.network.tags_index
+    width = max([len(node) for node in campaign.network.nodes] + [4])
+    print('node'.ljust(width), *tags, file=ostr)
+    for node in campaign.network.nodes:
+        node_tags = tags_index.get(node)
+        print(
+            node.ljust(width),
+            *['x'.center(len(tag)) if tag in node_tags else ' ' * len(tag)
+              for tag in tags],
+            file=ostr
+        )
+
+
+def main(argv=None):
+    """ben-tags entry point"""
+    arguments = cli_common(__doc__, argv=argv)
+    campaign = from_file(arguments['CAMPAIGN_FILE'])
+    print_matrix(campaign)
+    if argv is not None:
+        return campaign
+
+
+if __name__ == '__main__':
+    main()
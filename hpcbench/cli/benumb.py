@@ -1,14 +1,16 @@
 """ben-umb - Rebuild metrics of an existing campaign
 
 Usage:
-  ben-umb [-v | -vv] CAMPAIGN-DIR
+  ben-umb [-v | -vv] [--history FILE] CAMPAIGN-DIR
   ben-umb (-h | --help)
   ben-umb --version
 
 Options:
-  -h --help   Show this screen
-  --version   Show version
-  -v -vv -vvv Increase program verbosity
+  --history FILE  Append summary of the campaign metrics
+                  to the specified history file
+  -h --help       Show this screen
+  --version       Show version
+  -v -vv -vvv     Increase program verbosity
 """
 
 from hpcbench.driver import CampaignDriver
@@ -20,6 +22,9 @@ def main(argv=None):
     arguments = cli_common(__doc__, argv=argv)
     driver = CampaignDriver(campaign_path=arguments['CAMPAIGN-DIR'])
     driver(no_exec=True)
+    if arguments['--history']:
+        from hpcbench import history
+        history.append(driver, arguments['--history'])
     return driver
 
 
@@ -0,0 +1,368 @@
+"""Metrics derived from the metrics and metas of the runs of a category
+
+Derived metrics are declared by benchmarks, with the
+``Benchmark.derived_metrics`` property, and in the ``derived`` section
+of campaign benchmarks. Every derived metric is a Python expression,
+evaluated with NumPy over all runs of a category at once, where:
+
+* ``<category>__<metric>`` is the value of a metric, ``NaN`` when
+  a run does not provide it
+* ``metas.<name>`` is the value of a meta
+* ``ref.<category>__<metric>`` and ``ref.metas.<name>`` are the values
+  of the reference run, when the derived metric has a ``reference``.
+* ``abs``, ``sqrt``, ``exp``, ``log``, ``log2``, ``log10``,
+  ``minimum``, ``maximum`` and ``where`` are applied element-wise,
+  whereas ``min``, ``max``, ``mean``, ``median`` and ``sum`` reduce
+  all runs of the category, ignoring missing values.
+
+Arithmetic and comparison operators are supported. Anything else,
+like arbitrary attribute access or function calls, is rejected
+before evaluation.
+"""
+import ast
+import json
+
+import numpy as np
+import six
+
+from . api import Metric
+from . toolbox.edsl import kwargsql
+
+FUNCTIONS = dict(
+    abs=np.abs,
+    sqrt=np.sqrt,
+    exp=np.exp,
+    log=np.log,
+    log2=np.log2,
+    log10=np.log10,
+    minimum=np.minimum,
+    maximum=np.maximum,
+    where=np.where,
+    min=np.nanmin,
+    max=np.nanmax,
+    mean=np.nanmean,
+    median=np.nanmedian,
+    sum=np.nansum,
+)
+
+BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.FloorDiv: np.floor_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+}
+
+COMPARISONS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+}
+
+# pseudo variables
+METAS = 'metas'
+REFERENCE = 'ref'
+
+
+class Expression(object):
+    """Arithmetic expression over the columns of a set of runs"""
+    def __init__(self, source):
+        self.source = source
+        try:
+            self._tree = ast.parse(source.strip(), mode='eval').body
+        except SyntaxError as exc:
+            raise Exception('Invalid expression %r: %s' % (source, exc))
+        self._check(self._tree)
+
+    def _error(self, node):
+        return Exception('Unsupported syntax in expression %r: %s' %
+                         (self.source, type(node).__name__))
+
+    def _check(self, node):
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in BINARY_OPERATORS:
+                raise self._error(node.op)
+            self._check(node.left)
+            self._check(node.right)
+        elif isinstance(node, ast.UnaryOp):
+            if type(node.op) not in UNARY_OPERATORS:
+                raise self._error(node.op)
+            self._check(node.operand)
+        elif isinstance(node, ast.Compare):
+            for operator in node.ops:
+                if type(operator) not in COMPARISONS:
+                    raise self._error(operator)
+            for operand in [node.left] + node.comparators:
+                self._check(operand)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or \
+                    node.func.id not in FUNCTIONS:
+                raise self._error(node.func)
+            if node.keywords or getattr(node, 'starargs', None) or \
+                    getattr(node, 'kwargs', None):
+                raise self._error(node)
+            for arg in node.args:
+                self._check(arg)
+        elif isinstance(node, (ast.Name, ast.Attribute)):
+            self._variable(node)
+        elif self._constant(node) is None:
+            raise self._error(node)
+
+    @classmethod
+    def _constant(cls, node):
+        constant = getattr(ast, 'Constant', None)
+        if constant is not None and isinstance(node, constant):
+            if isinstance(node.value, (int, float)) and \
+                    not isinstance(node.value, bool):
+                return node.value
+        elif isinstance(node, ast.Num):
+            return node.n
+
+    def _variable(self, node):
+        """Get variable referenced by a node
+
+        :return: tuple ``(reference, kind, name)`` where ``kind`` is
+        either ``metas`` or a metric category
+        """
+        path = []
+        while isinstance(node, ast.Attribute):
+            path.insert(0, node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            raise self._error(node)
+        path.insert(0, node.id)
+        reference = path[0] == REFERENCE
+        if reference:
+            path.pop(0)
+        if len(path) == 2 and path[0] == METAS:
+            return reference, METAS, path[1]
+        if len(path) == 1 and '__' in path[0]:
+            category, metric = path[0].split('__', 1)
+            return reference, category, metric
+        raise Exception('Unknown variable in expression %r: %s' %
+                        (self.source, '.'.join(
+                            ([REFERENCE] if reference else []) + path)))
+
+    @property
+    def variables(self):
+        """Get variables used by the expression
+
+        :return: set of tuples, as returned by ``Columns.get``
+        """
+        variables = set()
+        self._collect(self._tree, variables)
+        return variables
+
+    def _collect(self, node, variables):
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            variables.add(self._variable(node))
+        elif isinstance(node, ast.Call):
+            for arg in node.args:
+                self._collect(arg, variables)
+        else:
+            for child in ast.iter_child_nodes(node):
+                self._collect(child, variables)
+
+    def evaluate(self, columns):
+        """Evaluate expression
+
+        :param columns: ``Columns`` instance
+        :return: one value per run
+        :rtype: numpy array
+        """
+        with np.errstate(all='ignore'):
+            result = self._evaluate(self._tree, columns)
+        return np.broadcast_to(result, (len(columns),))
+
+    def _evaluate(self, node, columns):
+        if isinstance(node, ast.BinOp):
+            return BINARY_OPERATORS[type(node.op)](
+                self._evaluate(node.left, columns),
+                self._evaluate(node.right, columns)
+            )
+        elif isinstance(node, ast.UnaryOp):
+            return UNARY_OPERATORS[type(node.op)](
+                self._evaluate(node.operand, columns)
+            )
+        elif isinstance(node, ast.Compare):
+            result = True
+            left = self._evaluate(node.left, columns)
+            for operator, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, columns)
+                result = np.logical_and(
+                    result, COMPARISONS[type(operator)](left, right)
+                )
+                left = right
+            return result
+        elif isinstance(node, ast.Call):
+            return FUNCTIONS[node.func.id](*[
+                self._evaluate(arg, columns) for arg in node.args
+            ])
+        elif isinstance(node, (ast.Name, ast.Attribute)):
+            return columns.get(*self._variable(node))
+        return self._constant(node)
+
+
+class Columns(object):
+    """Values of metrics and metas of a set of runs,
+    as NumPy arrays, computed on demand.
+    """
+    def __init__(self, runs, reference=None):
+        """
+        :param runs: runs, as written in ``metrics.json``
+        :param reference: optional ``kwargsql`` expression over metas
+        selecting reference runs. The reference of a run is the first
+        selected run having the same metas, except those of
+        the expression.
+        """
+        self._runs = runs
+        self._cache = {}
+        self._references = None
+        if reference:
+            self._references = self._reference_indices(reference)
+
+    def __len__(self):
+        return len(self._runs)
+
+    def _reference_indices(self, reference):
+        names = set(expr.split('__', 1)[0] for expr in reference)
+
+        def _key(run):
+            metas = dict(run.get('metas') or {})
+            for name in names:
+                metas.pop(name, None)
+            return json.dumps(metas, sort_keys=True, default=str)
+
+        references = {}
+        for index, run in enumerate(self._runs):
+            metas = run.get('metas') or {}
+            if names <= set(metas) and kwargsql.and_(metas, **reference):
+                references.setdefault(_key(run), index)
+        return np.array(
+            [references.get(_key(run), -1) for run in self._runs],
+            dtype=int
+        )
+
+    def get(self, reference, kind, name):
+        """Get column
+
+        :param reference: ``True`` to get values of the reference runs
+        :param kind: ``metas`` or a metric category
+        :param name: meta or metric name
+        :rtype: numpy array
+        """
+        column = self._column(kind, name)
+        if not reference:
+            return column
+        if self._references is None:
+            raise Exception('No reference specified')
+        result = column[self._references]
+        result[self._references < 0] = np.nan
+        return result
+
+    def _column(self, kind, name):
+        key = (kind, name)
+        column = self._cache.get(key)
+        if column is None:
+            if kind == METAS:
+                values = [
+                    (run.get('metas') or {}).get(name)
+                    for run in self._runs
+                ]
+            else:
+                values = [
+                    ((run.get('metrics') or {}).get(kind) or {}).get(name)
+                    for run in self._runs
+                ]
+            try:
+                column = np.array(
+                    [np.nan if value is None else value for value in values],
+                    dtype=float
+                )
+            except (TypeError, ValueError):
+                column = np.array(values, dtype=object)
+            self._cache[key] = column
+        return column
+
+
+class DerivedMetric(object):
+    """Metric computed from the metrics and metas of the runs
+    of a category
+    """
+    def __init__(self, category, name, config):
+        """
+        :param category: category of the derived metric
+        :param name: metric name
+        :param config: expression, or dictionary providing the
+        ``expression``, and optional ``unit`` and ``reference``
+        """
+        if isinstance(config, six.string_types):
+            config = dict(expression=config)
+        self.category = category
+        self.name = name
+        self.expression = Expression(config['expression'])
+        self.metric = Metric(config.get('unit') or '', float)
+        self.reference = dict(config.get('reference') or {})
+
+    def evaluate(self, runs):
+        """Add metric to runs. Runs where the expression cannot be
+        computed, because of missing metrics for instance, are left
+        unchanged.
+
+        :param runs: runs, as written in ``metrics.json``
+        """
+        if not runs:
+            return
+        values = self.expression.evaluate(Columns(runs, self.reference))
+        for run, value in zip(runs, values):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise Exception('Derived metric %s is not a number: %r' %
+                                (self.name, value))
+            if np.isfinite(value):
+                run.setdefault('metrics', {}).setdefault(
+                    self.category, {}
+                )[self.name] = value
+
+
+def get_derived_metrics(benchmark, config, category):
+    """Get derived metrics of a category
+
+    :param benchmark: ``hpcbench.api.Benchmark`` instance
+    :param config: benchmark section of the campaign, whose ``derived``
+    section overrides the derived metrics of the benchmark
+    :return: list of ``DerivedMetric``, in evaluation order:
+    a derived metric is evaluated after the derived metrics it uses.
+    """
+    declared = dict(benchmark.derived_metrics.get(category) or {})
+    declared.update((config.get('derived') or {}).get(category) or {})
+    pending = dict(
+        (name, DerivedMetric(category, name, declared[name]))
+        for name in declared
+    )
+    ordered = []
+    while pending:
+        ready = [
+            name for name in sorted(pending)
+            if not any(
+                kind == category and dependency in pending
+                for _, kind, dependency in pending[name].expression.variables
+            )
+        ]
+        if not ready:
+            raise Exception('Circular dependency between derived '
+                            'metrics: %s' % ' '.join(sorted(pending)))
+        for name in ready:
+            ordered.append(pending.pop(name))
+    return ordered
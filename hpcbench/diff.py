@@ -0,0 +1,348 @@
+"""Compare the runs of two campaigns to detect performance regressions
+
+Runs are aligned by host, tag, benchmark, category and metas. For
+every metric provided by both campaigns, the relative change of the
+mean is compared to a threshold, and its significance is assessed with
+a Mann-Whitney U test and a bootstrap confidence interval. When the
+reference mean is zero, a count of errors for instance, the absolute
+difference of the means is used instead.
+
+The verdict is a dictionary providing:
+
+verdict:
+    ``fail`` if any metric regressed, ``pass`` otherwise
+regressions, improvements, unchanged:
+    number of metrics of every status
+missing, added:
+    metrics only provided by the reference, or the compared campaign
+comparisons:
+    comparison of every metric provided by both campaigns,
+    see ``Comparison.compare``
+"""
+import fnmatch
+import json
+import math
+import numbers
+import os
+import os.path as osp
+
+import numpy as np
+
+from . campaign import get_runs
+from . driver import (
+    CampaignDriver,
+    JSON_UNITS_FILE,
+)
+from . toolbox.contextlib_ext import pushd
+
+HIGHER = 'higher'
+LOWER = 'lower'
+DIRECTIONS = frozenset([HIGHER, LOWER])
+
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+
+# units of the metrics whose lower values are better
+LOWER_IS_BETTER_UNITS = frozenset(['s', 'ms', 'us', 'ns', 'sec', 'second'])
+
+DEFAULT_CONFIG = dict(
+    threshold=0.05,
+    alpha=0.05,
+    min_samples=4,
+    resamples=1000,
+    confidence=0.95,
+    metrics={},
+)
+SEED = 0
+
+
+def load_runs(path):
+    """Load runs of a campaign
+
+    :param path: campaign directory, or file written by the
+    ``ndjson`` exporter
+    :return: runs, and units of their metrics, category -> metric -> unit
+    :rtype: tuple (list, dict)
+    """
+    if osp.isfile(path):
+        return _load_ndjson(path), {}
+    driver = CampaignDriver(campaign_path=path)
+    runs = []
+    units = {}
+    categories = set()
+    with pushd(path):
+        for run in get_runs(driver):
+            runs.append(run)
+            # current directory is the category directory
+            category_dir = os.getcwd()
+            if category_dir in categories:
+                continue
+            categories.add(category_dir)
+            if osp.isfile(JSON_UNITS_FILE):
+                with open(JSON_UNITS_FILE) as istr:
+                    for category, names in json.load(istr).items():
+                        units.setdefault(category, {}).update(names)
+    return runs, units
+
+
+def _load_ndjson(path):
+    runs = []
+    with open(path) as istr:
+        for line in istr:
+            if line.strip():
+                document = json.loads(line)
+                # skip Elasticsearch bulk actions
+                if list(document) != ['index']:
+                    runs.append(document)
+    return runs
+
+
+def run_key(run):
+    """Get key aligning runs of different campaigns
+
+    :rtype: tuple of strings
+    """
+    return (
+        run.get('hostname'),
+        run.get('tag'),
+        run.get('suite'),
+        run.get('category'),
+        json.dumps(run.get('metas') or {}, sort_keys=True, default=str),
+    )
+
+
+def samples(runs):
+    """Group metric values by run key and metric
+
+    :return: dictionary ``(key, metric) -> list of values``, where
+    ``metric`` is ``<category>__<name>``
+    """
+    eax = dict()
+    for run in runs:
+        key = run_key(run)
+        for category, metrics in (run.get('metrics') or {}).items():
+            for name, value in (metrics or {}).items():
+                if isinstance(value, numbers.Number) and \
+                        not isinstance(value, bool):
+                    eax.setdefault(
+                        (key, category + '__' + name), []
+                    ).append(value)
+    return eax
+
+
+def rank(values):
+    """Get ranks of values, starting at 1. Tied values get the
+    average of their ranks.
+    """
+    order = np.argsort(values, kind='mergesort')
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    _, inverse = np.unique(values, return_inverse=True)
+    return (np.bincount(inverse, weights=ranks) /
+            np.bincount(inverse))[inverse]
+
+
+def mann_whitney(base, new):
+    """Two-sided Mann-Whitney U test, with the normal approximation
+    corrected for ties and continuity
+
+    :return: p-value
+    :rtype: float
+    """
+    base_count, new_count = len(base), len(new)
+    values = np.concatenate([
+        np.asarray(base, dtype=float), np.asarray(new, dtype=float)
+    ])
+    total = base_count + new_count
+    u_stat = rank(values)[:base_count].sum() - \
+        base_count * (base_count + 1) / 2.0
+    _, ties = np.unique(values, return_counts=True)
+    variance = base_count * new_count / 12.0 * (
+        total + 1 - (ties ** 3 - ties).sum() / float(total * (total - 1))
+    )
+    if variance <= 0:
+        return 1.0
+    mean = base_count * new_count / 2.0
+    z_score = max(abs(u_stat - mean) - 0.5, 0) / math.sqrt(variance)
+    return min(1.0, math.erfc(z_score / math.sqrt(2)))
+
+
+def bootstrap_change(base, new, confidence, resamples, random,
+                     relative=True):
+    """Percentile bootstrap confidence interval of the change of the
+    mean
+
+    :param relative: compute the interval of the relative change,
+    ignoring resamples whose mean of ``base`` is zero, or of the
+    absolute difference otherwise
+    :return: lower and upper bounds, ``None`` if the mean of every
+    resample of ``base`` is zero in relative mode
+    """
+    base = np.asarray(base, dtype=float)
+    new = np.asarray(new, dtype=float)
+    base_means = base[
+        random.randint(0, len(base), (resamples, len(base)))
+    ].mean(axis=1)
+    new_means = new[
+        random.randint(0, len(new), (resamples, len(new)))
+    ].mean(axis=1)
+    changes = new_means - base_means
+    if relative:
+        valid = base_means != 0
+        if not np.any(valid):
+            return None
+        changes = changes[valid] / np.abs(base_means[valid])
+    alpha = (1 - confidence) / 2 * 100
+    low, high = np.percentile(changes, [alpha, 100 - alpha])
+    return float(low), float(high)
+
+
+class Comparison(object):
+    """Compare the runs of two campaigns"""
+    def __init__(self, config=None):
+        """
+        :param config: optional dictionary overriding
+        ``DEFAULT_CONFIG``, providing:
+
+        * ``threshold``: minimal relative change of a metric mean
+          considered as a regression or improvement
+        * ``alpha``: significance level of the Mann-Whitney test
+        * ``min_samples``: minimal number of runs in both campaigns
+          to perform the statistical tests. With fewer runs, only
+          the threshold is considered.
+        * ``resamples``, ``confidence``: bootstrap parameters
+        * ``metrics``: pattern of ``<category>__<metric>`` names ->
+          dictionary overriding ``threshold`` and providing the
+          ``direction``, ``higher`` or ``lower`` is better.
+          Without direction, lower is better for durations, higher
+          otherwise.
+        """
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        for pattern, options in self.config['metrics'].items():
+            direction = (options or {}).get('direction')
+            if direction is not None and direction not in DIRECTIONS:
+                raise Exception('Unknown direction of %s: %s' %
+                                (pattern, direction))
+
+    def options(self, metric, units=None):
+        """Get comparison options of a metric
+
+        :param metric: ``<category>__<name>``
+        :param units: units of the metrics, category -> name -> unit
+        :return: dictionary providing ``threshold`` and ``direction``
+        """
+        options = dict(threshold=self.config['threshold'])
+        category, name = metric.split('__', 1)
+        unit = ((units or {}).get(category) or {}).get(name)
+        options['direction'] = \
+            LOWER if unit in LOWER_IS_BETTER_UNITS else HIGHER
+        for pattern in sorted(self.config['metrics']):
+            if fnmatch.fnmatchcase(metric, pattern):
+                options.update(self.config['metrics'][pattern] or {})
+        return options
+
+    def __call__(self, base_runs, new_runs, units=None):
+        """Compare runs
+
+        :param base_runs: runs of the reference campaign
+        :param new_runs: runs of the compared campaign
+        :param units: units of the metrics, category -> name -> unit
+        :return: verdict, see the module documentation
+        :rtype: dictionary
+        """
+        random = np.random.RandomState(SEED)
+        base = samples(base_runs)
+        new = samples(new_runs)
+        comparisons = []
+        for key, metric in sorted(set(base) & set(new)):
+            comparisons.append(self.compare(
+                key, metric, base[(key, metric)], new[(key, metric)],
+                self.options(metric, units), random
+            ))
+        counts = dict((status, 0) for status in
+                      [REGRESSION, IMPROVEMENT, UNCHANGED])
+        for comparison in comparisons:
+            counts[comparison['status']] += 1
+        return dict(
+            verdict='fail' if counts[REGRESSION] else 'pass',
+            regressions=counts[REGRESSION],
+            improvements=counts[IMPROVEMENT],
+            unchanged=counts[UNCHANGED],
+            missing=[
+                self._describe(key, metric)
+                for key, metric in sorted(set(base) - set(new))
+            ],
+            added=[
+                self._describe(key, metric)
+                for key, metric in sorted(set(new) - set(base))
+            ],
+            comparisons=comparisons,
+        )
+
+    @classmethod
+    def _describe(cls, key, metric):
+        host, tag, suite, category, metas = key
+        return dict(
+            hostname=host,
+            tag=tag,
+            suite=suite,
+            category=category,
+            metas=json.loads(metas),
+            metric=metric,
+        )
+
+    def compare(self, key, metric, base, new, options, random):
+        """Compare values of a metric
+
+        :return: description of the comparison, providing the
+        relative ``change`` of the mean, ``None`` if the mean of
+        ``base`` is zero, the absolute ``difference`` of the means,
+        the bootstrap confidence interval ``ci`` of the change, or of
+        the difference if the change is ``None``, the Mann-Whitney
+        ``p_value``, whether the change is ``significant``, and the
+        ``status``: ``regression``, ``improvement`` or ``unchanged``.
+        The threshold applies to the change, or to the difference if
+        the change is ``None``. Statistics that cannot be computed
+        are ``None``.
+        """
+        base_mean = float(np.mean(base))
+        new_mean = float(np.mean(new))
+        difference = new_mean - base_mean
+        change = None
+        if base_mean:
+            change = difference / abs(base_mean)
+        eax = self._describe(key, metric)
+        eax.update(
+            direction=options['direction'],
+            threshold=options['threshold'],
+            base=dict(count=len(base), mean=base_mean),
+            new=dict(count=len(new), mean=new_mean),
+            change=change,
+            difference=difference,
+            ci=None,
+            p_value=None,
+            significant=None,
+            status=UNCHANGED,
+        )
+        if min(len(base), len(new)) >= self.config['min_samples']:
+            eax['p_value'] = mann_whitney(base, new)
+            eax['ci'] = bootstrap_change(
+                base, new, self.config['confidence'],
+                self.config['resamples'], random,
+                relative=change is not None
+            )
+            eax['significant'] = bool(
+                eax['p_value'] < self.config['alpha'] and
+                eax['ci'] is not None and
+                (eax['ci'][0] > 0 or eax['ci'][1] < 0)
+            )
+        # relative change is undefined when the base mean is zero
+        delta = difference if change is None else change
+        if abs(delta) <= options['threshold'] or \
+                eax['significant'] is False:
+            return eax
+        better = delta > 0 if options['direction'] == HIGHER else delta < 0
+        eax['status'] = IMPROVEMENT if better else REGRESSION
+        return eax
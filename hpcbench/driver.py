@@ -8,6 +8,7 @@ from abc import (
 import copy
 import datetime
 from functools import wraps
+import inspect
 import json
 import os
 import os.path as osp
@@ -15,25 +16,49 @@ import shutil
 import socket
 import subprocess
 import types
-import uuid
+import warnings
 
 from cached_property import cached_property
 import six
 import yaml
 
-from . api import Benchmark
-from . campaign import from_file
+from . import arrays
+from . api import (
+    ArrayMetric,
+    Benchmark,
+)
+from . campaign import (
+    from_file,
+    get_benchmark_types,
+)
+from . export.openmetrics import Textfile
+from . plan import (
+    Plan,
+    PLAN_FILE,
+)
 from . plot import Plotter
+from . scaling import (
+    CATEGORY as SCALING_CATEGORY,
+    get_scaling,
+)
 from . toolbox.collections_ext import nameddict
 from . toolbox.contextlib_ext import (
     pushd,
     Timer,
 )
+from . toolbox.search import (
+    GOALS,
+    MAXIMIZE,
+    STRATEGIES,
+)
 
 
 YAML_REPORT_FILE = 'hpcbench.yaml'
 YAML_CAMPAIGN_FILE = 'campaign.yaml'
 JSON_METRICS_FILE = 'metrics.json'
+JSON_SEARCH_FILE = 'search.json'
+JSON_SUMMARY_FILE = 'summary.json'
+JSON_UNITS_FILE = 'units.json'
 
 
 def write_yaml_report(func):
@@ -61,8 +86,15 @@ def write_yaml_report(func):
 
 class Enumerator(six.with_metaclass(ABCMeta, object)):
     """Common class for every campaign node"""
-    def __init__(self, campaign):
+    def __init__(self, campaign, plan=None):
+        """
+        :param campaign: campaign configuration
+        :param plan: ``hpcbench.plan.Plan`` restricted to the node,
+        root node computes it
+        """
         self.campaign = campaign
+        if plan is not None:
+            self.plan = plan
 
     @abstractmethod
     def child_builder(self, child):
@@ -127,103 +159,149 @@ class CampaignDriver(Enumerator):
             self.existing_campaign = False
             now = datetime.datetime.now()
             self.campaign_path = now.strftime(self.campaign.output_dir)
+            textfile = self.campaign.export.openmetrics.textfile
+            if textfile:
+                self.campaign.export.openmetrics.textfile = osp.abspath(
+                    textfile
+                )
 
     def child_builder(self, child):
-        return HostDriver(self.campaign, child)
+        return HostDriver(self.campaign, child, self.plan.select(host=child))
 
     @cached_property
     def children(self):
         return [socket.gethostname()]
 
+    @cached_property
+    def plan(self):
+        """Execution plan of the campaign. Plan of an existing campaign
+        is read from ``PLAN_FILE``.
+        """
+        if self.existing_campaign:
+            plan_file = osp.join(self.campaign_path, PLAN_FILE)
+            if osp.isfile(plan_file):
+                return Plan.load(plan_file)
+            # campaign executed before plans were introduced
+            with pushd(self.campaign_path):
+                return Plan.build(self.campaign, self._children)
+        return Plan.build(self.campaign, self.children)
+
+    @cached_property
+    def benchmark_types(self):
+        """Resolve all benchmark types referenced in the campaign
+
+        :return: benchmark type -> ``Benchmark`` subclass
+        :rtype: dictionary
+        :raise NameError: if some types are unknown, all of them
+        being reported
+        """
+        types = dict()
+        unknown_types = set()
+        for benchmark_type in get_benchmark_types(self.campaign):
+            try:
+                types[benchmark_type] = Benchmark.get_subclass(benchmark_type)
+            except NameError:
+                unknown_types.add(benchmark_type)
+        if unknown_types:
+            raise NameError('Unknown benchmark types: ' +
+                            ', '.join(sorted(unknown_types)))
+        return types
+
     def __call__(self, **kwargs):
         """execute benchmarks"""
+        # resolve benchmark types first to report all unknown ones at once
+        self.benchmark_types  # pylint: disable=pointless-statement
         with pushd(self.campaign_path, mkdir=True):
             if not self.existing_campaign:
                 shutil.copy(self.campaign_file, YAML_CAMPAIGN_FILE)
+                self.plan.dump(PLAN_FILE)
             super(CampaignDriver, self).__call__(**kwargs)
 
 
 class HostDriver(Enumerator):
     """Abstract representation of the campaign for the current host"""
-    def __init__(self, campaign, name):
-        super(HostDriver, self).__init__(campaign)
+    def __init__(self, campaign, name, plan):
+        super(HostDriver, self).__init__(campaign, plan)
         self.name = name
 
     @cached_property
     def children(self):
         """Retrieve tags associated to the current node"""
-        hostnames = {'localhost', self.name}
-        benchmarks = {'*'}
-        for tag, configs in self.campaign.network.tags.items():
-            for config in configs:
-                for mode, kconfig in config.items():
-                    if mode == 'match':
-                        for host in hostnames:
-                            if kconfig.match(host):
-                                benchmarks.add(tag)
-                                break
-                    elif mode == 'nodes':
-                        if hostnames & kconfig:
-                            benchmarks.add(tag)
-                            break
-                    else:
-                        raise Exception('Unknown tag association pattern: %s',
-                                        mode)
-                if tag in benchmarks:
-                    break
-        return benchmarks
+        return self.plan.distinct('tag')
 
     def child_builder(self, child):
-        return BenchmarkTagDriver(self.campaign, child)
+        return BenchmarkTagDriver(self.campaign, child,
+                                  self.plan.select(tag=child))
 
 
 class BenchmarkTagDriver(Enumerator):
     """Abstract representation of a campaign tag
     (keys of "benchmark" YAML tag)"""
-    def __init__(self, campaign, name):
-        super(BenchmarkTagDriver, self).__init__(campaign)
+    def __init__(self, campaign, name, plan):
+        super(BenchmarkTagDriver, self).__init__(campaign, plan)
         self.name = name
 
     @cached_property
     def children(self):
-        return list(self.campaign.benchmarks[self.name])
+        return self.plan.distinct('suite')
 
     def child_builder(self, child):
-        conf = self.campaign.benchmarks[self.name][child]
-        benchmark = Benchmark.get_subclass(conf['type'])()
-        if 'attributes' in conf:
-            benchmark.attributes = copy.deepcopy(conf['attributes'])
-        return BenchmarkDriver(self.campaign, benchmark)
+        return BenchmarkDriver(self.campaign, self.name, child,
+                               self.plan.select(suite=child))
 
 
 class BenchmarkDriver(Enumerator):
-    def __init__(self, campaign, benchmark):
-        super(BenchmarkDriver, self).__init__(campaign)
-        self.benchmark = benchmark
+    """Abstract representation of a benchmark of a campaign tag"""
+    def __init__(self, campaign, tag, name, plan):
+        super(BenchmarkDriver, self).__init__(campaign, plan)
+        self.tag = tag
+        self.name = name
+
+    @cached_property
+    def benchmark(self):
+        """Get ``hpcbench.api.Benchmark`` instance"""
+        return self.plan.benchmark(self.campaign, self.tag, self.name)
+
+    @property
+    def benchmark_type(self):
+        """Get benchmark type, without importing benchmark class"""
+        return self.plan.suite(self.tag, self.name)['type']
+
+    @property
+    def description(self):
+        """Get benchmark description, without importing benchmark class"""
+        return self.plan.suite(self.tag, self.name)['description']
 
     @cached_property
     def children(self):
-        categories = set()
-        for execution in self.benchmark.execution_matrix:
-            categories.add(execution['category'])
-        return categories
+        return self.plan.distinct('category')
 
     def child_builder(self, child):
-        return BenchmarkCategoryDriver(self.campaign, child, self.benchmark)
+        return BenchmarkCategoryDriver(self.campaign, child, self,
+                                       self.plan.select(category=child))
 
 
 class BenchmarkCategoryDriver(Enumerator):
     """Abstract representation of one benchmark to execute
     (one of "benchmarks" YAML tag values")"""
-    def __init__(self, campaign, category, benchmark):
-        super(BenchmarkCategoryDriver, self).__init__(campaign)
+    def __init__(self, campaign, category, parent, plan):
+        """
+        :param parent: ``BenchmarkDriver`` instance
+        """
+        super(BenchmarkCategoryDriver, self).__init__(campaign, plan)
         self.category = category
-        self.benchmark = benchmark
+        self.parent = parent
+
+    @property
+    def benchmark(self):
+        """Get ``hpcbench.api.Benchmark`` instance"""
+        return self.parent.benchmark
 
     @cached_property
     def plot_files(self):
-        for plot in self.benchmark.plots[self.category]:
-            yield osp.join(os.getcwd(), Plotter.get_filename(plot))
+        plots = self.plan.suite(self.parent.tag, self.parent.name)['plots']
+        for plot_file in plots.get(self.category, []):
+            yield osp.join(os.getcwd(), plot_file)
 
     @cached_property
     def commands(self):
@@ -234,47 +312,107 @@ class BenchmarkCategoryDriver(Enumerator):
 
     @cached_property
     def children(self):
-        children = []
-        for execution in self.benchmark.execution_matrix:
-            category = execution.get('category')
-            if category != self.category:
-                continue
-            name = execution.get('name') or ''
-            children.append(osp.join(
-                name,
-                str(uuid.uuid4())
-            ))
-        return children
+        return [self.run_dir(execution) for execution in self.plan]
+
+    @classmethod
+    def run_dir(cls, execution):
+        """Get directory of a plan execution, relative to the category
+        directory.
+        """
+        return osp.join(
+            execution['execution'].get('name') or '',
+            execution['id']
+        )
 
     def child_builder(self, child):
         del child  # unused
 
+    @cached_property
+    def search(self):
+        """Adaptive search of the category, given in the ``search``
+        section of the campaign benchmark, ``None`` if unspecified
+        """
+        config = self.campaign.benchmarks[self.parent.tag][self.parent.name]
+        search = (config.get('search') or {}).get(self.category)
+        if search is not None:
+            search = dict(search)
+            search.setdefault('method', 'bisection')
+            search.setdefault('goal', MAXIMIZE)
+            search.setdefault('tolerance', 0.05)
+            if search['method'] not in STRATEGIES:
+                raise Exception('Unknown search method: %s' %
+                                search['method'])
+            if search['goal'] not in GOALS:
+                raise Exception('Unknown search goal: %s' % search['goal'])
+        return search
+
+    @cached_property
+    def scaling(self):
+        """Scaling study of the benchmark, given in the ``scaling``
+        section of the campaign benchmark, ``None`` if unspecified
+        """
+        config = self.campaign.benchmarks[self.parent.tag][self.parent.name]
+        return get_scaling(config)
+
+    @cached_property
+    def derived_metrics(self):
+        """Derived metrics of the category, declared by the benchmark
+        and in the ``derived`` section of the campaign benchmark
+        """
+        # NumPy is only imported when metrics are gathered
+        from . derived import get_derived_metrics
+        config = self.campaign.benchmarks[self.parent.tag][self.parent.name]
+        return get_derived_metrics(self.benchmark, config, self.category)
+
+    @property
+    def units(self):
+        """Get units of the category metrics
+
+        :return: dictionary category -> metric name -> unit
+        """
+        units = dict()
+        extractors = self.benchmark.metrics_extractors.get(self.category)
+        if not isinstance(extractors, list):
+            extractors = [extractors] if extractors else []
+        for extractor in extractors:
+            units.setdefault(self.category, {}).update(
+                (name, metric.unit)
+                for name, metric in extractor.metrics.items()
+            )
+        for derived in self.derived_metrics:
+            units.setdefault(derived.category, {})[derived.name] = \
+                derived.metric.unit
+        if self.scaling is not None and \
+                self.scaling.category == self.category:
+            units[SCALING_CATEGORY] = dict(speedup='', efficiency='')
+        return units
+
+    @property
+    def plots(self):
+        """Get description of the category plots"""
+        plots = list(self.benchmark.plots.get(self.category) or [])
+        if self.scaling is not None and \
+                self.scaling.category == self.category:
+            plots += self.scaling.plots
+        return plots
+
     @write_yaml_report
     def __call__(self, **kwargs):
         if "no_exec" not in kwargs:
             runs = dict()
-            for execution in self.benchmark.execution_matrix:
-                category = execution.get('category')
-                if self.category != category:
-                    continue
-                name = execution.get('name') or ''
-                run_dir = osp.join(
-                    name,
-                    str(uuid.uuid4())
+            if self.search is None:
+                run_dirs = (
+                    self.execute(execution, **kwargs)
+                    for execution in self.plan
                 )
-                runs.setdefault(category, []).append(run_dir)
-                with pushd(run_dir, mkdir=True):
-                    driver = ExecutionDriver(
-                        self.campaign,
-                        self.benchmark,
-                        execution
-                    )
-                    driver(**kwargs)
-                    MetricsDriver(self.campaign, self.benchmark)(**kwargs)
-                    yield run_dir
+            else:
+                run_dirs = self.adaptive_search(**kwargs)
+            for run_dir in run_dirs:
+                runs.setdefault(self.category, []).append(run_dir)
+                yield run_dir
             self.gather_metrics(runs)
         elif 'plot' in kwargs:
-            for plot in self.benchmark.plots.get(self.category):
+            for plot in self.plots:
                 self.generate_plot(plot, self.category)
         else:
             runs = dict()
@@ -288,39 +426,182 @@ class BenchmarkCategoryDriver(Enumerator):
                     MetricsDriver(self.campaign, self.benchmark)(**kwargs)
             self.gather_metrics(runs)
 
+    def execute(self, execution, **kwargs):
+        """Execute a plan execution, and extract its metrics
+
+        :return: run directory
+        """
+        run_dir = self.run_dir(execution)
+        with pushd(run_dir, mkdir=True):
+            driver = ExecutionDriver(
+                self.campaign,
+                self.benchmark,
+                execution['execution']
+            )
+            driver(**kwargs)
+            MetricsDriver(self.campaign, self.benchmark)(**kwargs)
+        self.update_textfile(run_dir)
+        return run_dir
+
+    def search_groups(self, dimension):
+        """Group executions of the plan having the same metas, except
+        the searched dimension
+
+        :return: lists of executions, sorted by dimension value
+        """
+        groups = dict()
+        keys = []
+        for execution in self.plan:
+            metas = dict(execution['execution'].get('metas') or {})
+            if dimension not in metas:
+                raise Exception('Search dimension %s is not a meta of '
+                                'category %s' % (dimension, self.category))
+            del metas[dimension]
+            key = json.dumps(metas, sort_keys=True, default=str)
+            if key not in groups:
+                keys.append(key)
+                groups[key] = []
+            groups[key].append(execution)
+        return [
+            sorted(
+                groups[key],
+                key=lambda eax: eax['execution']['metas'][dimension]
+            )
+            for key in keys
+        ]
+
+    def adaptive_search(self, **kwargs):
+        """Execute the candidates selected by the search strategy,
+        based on the metrics of the previous executions. The result of
+        every group of candidates is written in ``JSON_SEARCH_FILE``.
+
+        :return: generator of run directories
+        """
+        search = self.search
+        dimension = search['dimension']
+        category, metric = search['metric'].split('__', 1)
+        strategy = STRATEGIES[search['method']]
+        results = []
+        for candidates in self.search_groups(dimension):
+            run_dirs = dict()
+            values = dict()
+
+            def _evaluate(index, candidates=candidates, run_dirs=run_dirs,
+                          values=values):
+                if index not in values:
+                    run_dirs[index] = self.execute(candidates[index],
+                                                   **kwargs)
+                    run = self.load_run(run_dirs[index])
+                    values[index] = run['metrics'][category][metric]
+                return values[index]
+
+            best = strategy(_evaluate, len(candidates),
+                            goal=search['goal'],
+                            tolerance=search['tolerance'])
+            metas = candidates[best]['execution']['metas']
+            results.append(dict(
+                metas=metas,
+                value=metas[dimension],
+                metric=_evaluate(best),
+                executions=len(run_dirs),
+                candidates=len(candidates),
+            ))
+            for index in sorted(run_dirs):
+                yield run_dirs[index]
+        with open(JSON_SEARCH_FILE, 'w') as ostr:
+            json.dump(dict(search, results=results), ostr, indent=2)
+
+    @cached_property
+    def textfile(self):
+        """OpenMetrics textfile updated after every run, if specified in
+        the ``export.openmetrics.textfile`` campaign key, ``None`` otherwise
+        """
+        path = self.campaign.export.openmetrics.textfile
+        if path:
+            return Textfile(path)
+
+    def update_textfile(self, run_dir):
+        """Write metrics of a run in the OpenMetrics textfile, if any
+        """
+        if self.textfile is not None:
+            run = self.load_run(run_dir)
+            run.update(hostname=socket.gethostname(), category=self.category)
+            self.textfile.add_run(run)
+            self.textfile.write()
+
+    @classmethod
+    def load_run(cls, run_dir):
+        """Load report of a run, and merge metrics provided
+        by the different extractors
+
+        :param run_dir: path to the run directory
+        :return: run, as written in ``JSON_METRICS_FILE``. Paths of
+        array metrics files are relative to the parent of ``run_dir``.
+        :rtype: dictionary
+        """
+        with open(osp.join(run_dir, YAML_REPORT_FILE)) as istr:
+            data = yaml.load(istr)
+        data.pop('category', None)
+        data.pop('command', None)
+        data['id'] = run_dir
+        gathered_metrics = dict()
+        for cat, metricss in data.get('metrics', {}).items():
+            gathered = dict()
+            for metrics in metricss:
+                gathered.update(metrics)
+            gathered_metrics[cat] = arrays.resolve(
+                gathered,
+                lambda ref: arrays.relocate(ref, run_dir)
+            )
+        data['metrics'] = gathered_metrics
+        return data
+
     def gather_metrics(self, runs):
+        """Write runs of the category in ``JSON_METRICS_FILE``,
+        with the derived metrics and the metrics of the scaling study
+        if any, their statistical summary in ``JSON_SUMMARY_FILE``,
+        and units of the metrics in ``JSON_UNITS_FILE``
+        """
+        from . summary import summarize
         for category, run_dirs in runs.items():
+            data = [self.load_run(run_dir) for run_dir in run_dirs]
+            for derived in self.derived_metrics:
+                derived.evaluate(data)
+            if self.scaling is not None:
+                self.scaling.derive_metrics(data)
             with open(JSON_METRICS_FILE, 'w') as ostr:
                 ostr.write('[\n')
-                for i in range(len(run_dirs)):
-                    with open(osp.join(run_dirs[i], YAML_REPORT_FILE)) as istr:
-                        data = yaml.load(istr)
-                        data.pop('category', None)
-                        data.pop('command', None)
-                        data['id'] = run_dirs[i]
-                        gathered_metrics = dict()
-                        for cat, metricss in data.get('metrics', {}).items():
-                            gathered = dict()
-                            for metrics in metricss:
-                                gathered.update(metrics)
-                            gathered_metrics[cat] = gathered
-                        data['metrics'] = gathered_metrics
-                        json.dump(data, ostr, indent=2)
-                    if i != len(run_dirs) - 1:
-                        ostr.write(',')
-                    ostr.write('\n')
-                ostr.write(']\n')
+                for i, run in enumerate(data):
+                    if i:
+                        ostr.write(',\n')
+                    json.dump(run, ostr, indent=2)
+                ostr.write('\n]\n' if run_dirs else ']\n')
+            with open(JSON_SUMMARY_FILE, 'w') as ostr:
+                json.dump(summarize(data), ostr, indent=2)
+            with open(JSON_UNITS_FILE, 'w') as ostr:
+                json.dump(self.units, ostr, indent=2)
 
     @cached_property
     def metrics(self):
         with open(JSON_METRICS_FILE) as istr:
             return yaml.load(istr)
 
+    @cached_property
+    def summary(self):
+        """Get statistical summary of the category runs, grouped by
+        metas, ``None`` if the campaign does not provide it.
+        See ``hpcbench.summary.summarize``
+        """
+        if osp.isfile(JSON_SUMMARY_FILE):
+            with open(JSON_SUMMARY_FILE) as istr:
+                return json.load(istr)
+
     def generate_plot(self, desc, category):
         with open(JSON_METRICS_FILE) as istr:
             metrics = json.load(istr)
         plotter = Plotter(
             metrics,
+            summary=self.summary,
             category=category,
             hostname=socket.gethostname()
         )
@@ -352,9 +633,21 @@ class MetricsDriver(object):
             run_metrics = extractor.extract(os.getcwd(),
                                             self.report.get('metas'))
             self.check_metrics(extractor, run_metrics)
+            self.save_arrays(cat, extractor, run_metrics)
             metrics.setdefault(cat, []).append(run_metrics)
         return self.report
 
+    @classmethod
+    def save_arrays(cls, category, extractor, metrics):
+        """Write values of array metrics in sidecar files, replaced
+        by references to the files in ``metrics``
+        """
+        for name, metric in extractor.metrics.items():
+            if isinstance(metric, ArrayMetric) and name in metrics:
+                metrics[name] = arrays.save(
+                    category, name, metrics[name], metric
+                )
+
     def check_metrics(self, extractor, metrics):
         """Ensure that returned metrics are properly exposed
         """
@@ -364,6 +657,10 @@ class MetricsDriver(object):
             if not metric:
                 message = "Unexpected metric '{}' returned".format(name)
                 raise Exception(message)
+            elif isinstance(metric, ArrayMetric):
+                if not metric.accepts(value):
+                    message = "Unexpected type for metrics {}".format(name)
+                    raise Exception(message)
             elif not isinstance(value, metric.type):
                 message = "Unexpected type for metrics {}".format(name)
                 raise Exception(message)
@@ -380,7 +677,39 @@ class ExecutionDriver(object):
 
     @write_yaml_report
     def __call__(self, **kwargs):
-        self.benchmark.pre_execute()
+        self.call_hook(self.benchmark.pre_execute, self.execution)
+        try:
+            exit_status = self._execute()
+        finally:
+            self.call_hook(self.benchmark.post_execute, self.execution)
+        report = dict(
+            exit_status=exit_status,
+            benchmark=self.benchmark.name,
+        )
+        report.update(self.execution)
+        return report
+
+    @classmethod
+    def call_hook(cls, hook, execution):
+        """Call ``pre_execute`` or ``post_execute`` benchmark method.
+        Methods overridden without the ``execution`` parameter, as
+        before it was introduced, are still supported.
+
+        :param hook: bound method
+        :param execution: one of the dictionaries provided by
+        ``execution_matrix``
+        """
+        code = six.get_function_code(six.get_method_function(hook))
+        if code.co_argcount > 1 or code.co_flags & inspect.CO_VARARGS:
+            return hook(execution)
+        warnings.warn(
+            '%s.%s should accept the execution parameter' %
+            (hook.__self__.__class__.__name__, hook.__name__),
+            DeprecationWarning
+        )
+        return hook()
+
+    def _execute(self):
         with open('stdout.txt', 'w') as stdout, \
                 open('stderr.txt', 'w') as stderr:
             kwargs = dict(stdout=stdout, stderr=stderr)
@@ -393,10 +722,4 @@ class ExecutionDriver(object):
                 self.execution['command'],
                 **kwargs
             )
-            exit_status = process.wait()
-        report = dict(
-            exit_status=exit_status,
-            benchmark=self.benchmark.name,
-        )
-        report.update(self.execution)
-        return report
+            return process.wait()
@@ -2,3 +2,9 @@
 """
 
 from . es import ESExporter  # noqa
+from . local import (  # noqa
+    CSVExporter,
+    NDJSONExporter,
+    ParquetExporter,
+)
+from . openmetrics import OpenMetricsExporter  # noqa
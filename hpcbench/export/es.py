@@ -4,22 +4,26 @@
 import collections
 
 from cached_property import cached_property
-from elasticsearch import Elasticsearch
 import six
 
+from hpcbench import arrays
+from hpcbench.api import Exporter
 from hpcbench.campaign import (
     get_benchmark_types,
-    get_metrics,
+    get_runs,
 )
 from hpcbench.toolbox.collections_ext import dict_merge
 from hpcbench.toolbox.functools_ext import chunks
 
 
-class ESExporter(object):
-    """Export a campaign to Elasticsearch
+class ESExporter(Exporter):
+    """Export a campaign to Elasticsearch.
+    Array metrics are replaced by their summary scalars.
     """
+    name = 'elasticsearch'
 
     PY_TYPE_TO_ES_FIELD_TYPE = {
+        bool: 'boolean',
         float: 'float',
         int: 'long',
         six.text_type: 'text',
@@ -45,17 +49,12 @@ class ESExporter(object):
         ),
     )
 
-    def __init__(self, campaign):
-        """
-        :param campaign: instance of ``hpcbench.driver.CampaignDriver``
-        """
-        self.campaign = campaign
-
     @cached_property
     def es_client(self):
         """Get Elasticsearch client
         """
-        es_conf = self.campaign.campaign.export.elasticsearch
+        from elasticsearch import Elasticsearch
+        es_conf = self.config
         return Elasticsearch(es_conf.hosts, **es_conf.connection_params)
 
     @cached_property
@@ -68,7 +67,7 @@ class ESExporter(object):
     def index_name(self):
         """Get Elasticsearch index name associated to the campaign
         """
-        fmt = self.campaign.campaign.export.elasticsearch.index_name
+        fmt = self.config.index_name
         fields = dict(
             date=self.campaign.report.date,
         )
@@ -121,15 +120,24 @@ class ESExporter(object):
 
     @property
     def _documents(self):
-        for run in ESExporter._get_runs(self.campaign):
-            yield dict(
-                index=dict(
-                    _type=run['benchmark'],
-                    _id=run['id']
-                )
-            )
+        for run in get_runs(self.campaign, arrays.summarize):
+            yield self.bulk_action(run)
             yield run
 
+    @classmethod
+    def bulk_action(cls, run):
+        """Get Elasticsearch bulk API action indexing a run
+
+        :param run: run dictionary
+        :rtype: dictionary
+        """
+        return dict(
+            index=dict(
+                _type=run['benchmark'],
+                _id=run['id']
+            )
+        )
+
     @cached_property
     def _document_types(self):
         return [
@@ -161,6 +169,11 @@ class ESExporter(object):
     def _get_field_mapping(cls, name, value):
         field_type = cls.PROPERTIES_FIELD_TYPE.get(name)
         if field_type is None:
+            if isinstance(value, list):
+                # Elasticsearch fields accept arrays of their type
+                if not value:
+                    return {}
+                value = value[0]
             field_type = cls.PY_TYPE_TO_ES_FIELD_TYPE[type(value)]
         return {
             name: {
@@ -168,21 +181,8 @@ class ESExporter(object):
             }
         }
 
-    @classmethod
-    def _get_runs(cls, campaign):
-        for attrs, metrics in get_metrics(campaign):
-            for run in metrics:
-                eax = dict()
-                eax.update(attrs)
-                eax.update(run)
-                yield eax
-
     @classmethod
     def _get_benchmark_runs(cls, campaign, benchmark):
-        for attrs, metrics in get_metrics(campaign):
-            for run in metrics:
-                if run['benchmark'] == benchmark:
-                    eax = dict()
-                    eax.update(attrs)
-                    eax.update(run)
-                    yield eax
+        for run in get_runs(campaign, arrays.summarize):
+            if run['benchmark'] == benchmark:
+                yield run
@@ -0,0 +1,175 @@
+"""Export campaign data in local files, suitable for analysis tools
+like pandas
+"""
+import collections
+import csv
+import json
+
+from cached_property import cached_property
+import six
+
+from hpcbench import arrays
+from hpcbench.api import Exporter
+from hpcbench.campaign import get_runs
+from hpcbench.toolbox.collections_ext import flatten_dict
+from hpcbench.toolbox.functools_ext import chunks
+from . es import ESExporter
+
+
+class FileExporter(Exporter):  # pylint: disable=abstract-method
+    """Common class of exporters writing campaign runs in a local file.
+
+    Runs are read while traversing the campaign and written by batches
+    of ``batch_size`` elements, so that the entire campaign is never
+    loaded in memory. Values of array metrics are read from their
+    memory-mapped files.
+    """
+
+    @property
+    def path(self):
+        """Get path to the output file
+        """
+        return self.config['path']
+
+    @property
+    def batch_size(self):
+        """Get number of runs written at once
+        """
+        return self.config['batch_size']
+
+    @property
+    def batches(self):
+        """Get campaign runs by batches of ``batch_size`` elements
+
+        :rtype: generator of list of dictionary
+        """
+        return chunks(self.documents, self.batch_size)
+
+    @property
+    def documents(self):
+        """Get campaign runs
+        :rtype: dictionary generator
+        """
+        return get_runs(self.campaign, arrays.values)
+
+
+class TabularExporter(FileExporter):  # pylint: disable=abstract-method
+    """Common class of exporters writing runs as rows of a table.
+    Nested fields of a run are flattened, for instance
+    ``metrics.cpu.average``.
+    """
+    @property
+    def documents(self):
+        for run in super(TabularExporter, self).documents:
+            yield flatten_dict(run)
+
+    @cached_property
+    def columns(self):
+        """Get table columns, deduced from all campaign runs
+
+        :return: column name -> Python type
+        :rtype: ordered dictionary
+        """
+        types = dict()
+        for row in self.documents:
+            for column, value in row.items():
+                if value is not None:
+                    types.setdefault(column, set()).add(type(value))
+        return collections.OrderedDict(
+            (column, self._merge_types(types[column]))
+            for column in sorted(types)
+        )
+
+    @classmethod
+    def _merge_types(cls, types):
+        if len(types) == 1:
+            return types.pop()
+        if types == {int, float}:
+            return float
+        return six.text_type
+
+
+class NDJSONExporter(FileExporter):
+    """Write campaign runs in a newline delimited JSON file.
+    When the ``bulk`` option is set, every run is preceded
+    by the Elasticsearch bulk API action indexing it.
+    """
+    name = 'ndjson'
+
+    def export(self):
+        with open(self.path, 'w') as ostr:
+            for batch in self.batches:
+                ostr.write(''.join(
+                    json.dumps(document) + '\n'
+                    for document in self._bulk(batch)
+                ))
+
+    def _bulk(self, runs):
+        for run in runs:
+            if self.config['bulk']:
+                yield ESExporter.bulk_action(run)
+            yield run
+
+
+class CSVExporter(TabularExporter):
+    """Write campaign runs in a CSV file
+    """
+    name = 'csv'
+
+    def export(self):
+        if six.PY2:
+            ostr = open(self.path, 'wb')
+        else:
+            ostr = open(self.path, 'w', newline='')
+        with ostr:
+            writer = csv.DictWriter(ostr, fieldnames=list(self.columns))
+            writer.writeheader()
+            for batch in self.batches:
+                writer.writerows(batch)
+
+
+class ParquetExporter(TabularExporter):
+    """Write campaign runs in an Apache Parquet file,
+    one row group per batch.
+
+    Requires the ``pyarrow`` package.
+    """
+    name = 'parquet'
+
+    def export(self):
+        import pyarrow
+        import pyarrow.parquet
+        schema = pyarrow.schema([
+            pyarrow.field(column, self._arrow_type(pyarrow, clazz))
+            for column, clazz in self.columns.items()
+        ])
+        writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+        try:
+            for batch in self.batches:
+                arrays = [
+                    pyarrow.array(
+                        [self._cast(clazz, row.get(column)) for row in batch],
+                        type=schema.field_by_name(column).type
+                    )
+                    for column, clazz in self.columns.items()
+                ]
+                writer.write_table(
+                    pyarrow.Table.from_arrays(arrays, schema=schema)
+                )
+        finally:
+            writer.close()
+
+    @classmethod
+    def _arrow_type(cls, pyarrow, clazz):
+        return {
+            bool: pyarrow.bool_(),
+            float: pyarrow.float64(),
+            int: pyarrow.int64(),
+            list: pyarrow.list_(pyarrow.float64()),
+        }.get(clazz, pyarrow.string())
+
+    @classmethod
+    def _cast(cls, clazz, value):
+        if value is None or isinstance(value, clazz):
+            return value
+        return clazz(value)
@@ -0,0 +1,138 @@
+"""Export campaign metrics in an OpenMetrics textfile, that can be
+scraped by the Prometheus node exporter textfile collector
+"""
+import numbers
+import os
+import os.path as osp
+import re
+import tempfile
+
+import six
+
+from hpcbench.api import Exporter
+from hpcbench.campaign import get_runs
+
+
+class Textfile(object):
+    """OpenMetrics textfile providing the latest value of every metric,
+    for every combination of host, benchmark, category and metas.
+
+    Samples already written in the file are loaded first,
+    so that metrics of previous campaigns are kept.
+    """
+    PREFIX = 'hpcbench'
+    LABELS = ('host', 'benchmark', 'category')
+    INVALID_NAME_CHARS = re.compile('[^a-zA-Z0-9_]')
+    SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)\{(.*)\} (\S+)$')
+    LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+    ESCAPES = [('\\', '\\\\'), ('\n', '\\n'), ('"', '\\"')]
+
+    def __init__(self, path):
+        """
+        :param path: path to the textfile
+        """
+        self.path = path
+        self.samples = dict()
+        if osp.isfile(path):
+            self._load()
+
+    def add_run(self, run):
+        """Update samples with metrics of a run
+
+        :param run: run dictionary, as provided by
+        ``hpcbench.campaign.get_runs``
+        """
+        labels = [
+            (label, six.text_type(run[key]))
+            for label, key in zip(self.LABELS,
+                                  ['hostname', 'benchmark', 'category'])
+        ]
+        for meta, value in sorted((run.get('metas') or {}).items()):
+            meta = self._name(meta)
+            if meta in self.LABELS:
+                meta = 'meta_' + meta
+            labels.append((meta, six.text_type(value)))
+        labels = tuple(labels)
+        for category, metrics in run.get('metrics', {}).items():
+            for name, value in metrics.items():
+                if not isinstance(value, numbers.Number):
+                    continue
+                metric = self._name('_'.join([self.PREFIX, category, name]))
+                self.samples.setdefault(metric, {})[labels] = value
+
+    def write(self):
+        """Atomically replace the textfile with current samples
+        """
+        dirname = osp.dirname(osp.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix='.hpcbench')
+        try:
+            with os.fdopen(fd, 'w') as ostr:
+                for metric in sorted(self.samples):
+                    ostr.write('# TYPE {} gauge\n'.format(metric))
+                    samples = self.samples[metric]
+                    for labels in sorted(samples):
+                        ostr.write('{}{{{}}} {}\n'.format(
+                            metric,
+                            ','.join(
+                                '{}="{}"'.format(k, self._escape(v))
+                                for k, v in labels
+                            ),
+                            self._value(samples[labels])
+                        ))
+                ostr.write('# EOF\n')
+            os.chmod(tmp_path, 0o644)
+            os.rename(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _load(self):
+        with open(self.path) as istr:
+            for line in istr:
+                match = self.SAMPLE.match(line.strip())
+                if match is None:
+                    continue
+                metric, labels, value = match.groups()
+                labels = tuple(
+                    (name, self._unescape(value))
+                    for name, value in self.LABEL.findall(labels)
+                )
+                self.samples.setdefault(metric, {})[labels] = float(value)
+
+    @classmethod
+    def _name(cls, name):
+        return cls.INVALID_NAME_CHARS.sub('_', name)
+
+    @classmethod
+    def _value(cls, value):
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, float):
+            return repr(value)
+        return value
+
+    @classmethod
+    def _escape(cls, value):
+        for char, escaped in cls.ESCAPES:
+            value = value.replace(char, escaped)
+        return value
+
+    @classmethod
+    def _unescape(cls, value):
+        return re.sub(
+            r'\\(.)',
+            lambda m: '\n' if m.group(1) == 'n' else m.group(1),
+            value
+        )
+
+
+class OpenMetricsExporter(Exporter):
+    """Write latest metrics of a campaign in an OpenMetrics textfile
+    """
+    name = 'openmetrics'
+
+    def export(self):
+        textfile = Textfile(self.config['path'])
+        for run in get_runs(self.campaign):
+            textfile.add_run(run)
+        textfile.write()
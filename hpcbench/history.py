@@ -0,0 +1,418 @@
+"""History of campaigns metrics, and detection of their change points
+
+The history is an append-only NDJSON file, every line providing the
+summary of one metric for one group of runs of a campaign:
+
+campaign, date:
+    name of the campaign directory and date of its execution
+hostname, tag, suite, benchmark, category, metas:
+    where the runs were executed
+metric:
+    ``<category>__<name>``
+count, mean, stddev, median, min, max:
+    statistics of the metric, see ``hpcbench.summary``
+
+Records having the same host, tag, suite, category, metas and metric
+form a series, ordered by date. A change point is an index of a series
+where the distribution of the values changes, a step change caused by
+a firmware upgrade for instance.
+
+Two detection methods are provided:
+
+e-divisive:
+    hierarchical divisive estimation of multiple change points, with
+    a permutation test of their significance. See Matteson, D. S. and
+    James, N. A. (2014), "A Nonparametric Approach for Multiple Change
+    Point Analysis of Multivariate Data".
+cusum:
+    binary segmentation of the series, split where the cumulative sum
+    of the deviations to the mean exceeds a threshold.
+"""
+import datetime
+import fnmatch
+import json
+import logging
+import os.path as osp
+
+import numpy as np
+
+from . summary import summarize
+from . toolbox.contextlib_ext import pushd
+
+E_DIVISIVE = 'e-divisive'
+CUSUM = 'cusum'
+METHODS = frozenset([E_DIVISIVE, CUSUM])
+
+STATISTICS = ['count', 'mean', 'stddev', 'median', 'min', 'max']
+
+DEFAULT_CONFIG = dict(
+    method=E_DIVISIVE,
+    statistic='mean',
+    metrics=['*'],
+    min_size=3,
+    alpha=0.05,
+    permutations=199,
+    threshold=1.358,
+)
+# seed of the permutations random generator, detection is reproducible
+SEED = 0
+
+LOGGER = logging.getLogger('hpcbench')
+
+
+def campaign_records(driver):
+    """Get history records of a campaign
+
+    :param driver: ``hpcbench.driver.CampaignDriver`` of an existing
+    campaign, whose metrics have been gathered
+    :rtype: dictionary generator
+    """
+    campaign = osp.basename(osp.normpath(osp.abspath(driver.campaign_path)))
+    with pushd(driver.campaign_path):
+        date = _campaign_date(driver)
+        for hostname, host_driver in driver.traverse():
+            for tag, tag_driver in host_driver.traverse():
+                for suite, bench_obj in tag_driver.traverse():
+                    for category, cat_obj in bench_obj.traverse():
+                        summary = cat_obj.summary
+                        if summary is None:
+                            summary = summarize(cat_obj.metrics)
+                        for group in summary:
+                            for cat, metrics in group['metrics'].items():
+                                for name, stats in metrics.items():
+                                    record = dict(
+                                        campaign=campaign,
+                                        date=date,
+                                        hostname=hostname,
+                                        tag=tag,
+                                        suite=suite,
+                                        benchmark=bench_obj.benchmark_type,
+                                        category=category,
+                                        metas=group['metas'],
+                                        metric=cat + '__' + name,
+                                    )
+                                    for stat in STATISTICS:
+                                        record[stat] = stats[stat]
+                                    yield record
+
+
+def _campaign_date(driver):
+    try:
+        date = driver.report['date']
+    except (IOError, OSError, KeyError):
+        # campaign report is not available, use the campaign file date
+        date = datetime.datetime.fromtimestamp(
+            osp.getmtime(driver.campaign_file)
+        )
+    if isinstance(date, datetime.datetime):
+        return date.isoformat()
+    return str(date)
+
+
+def load(history_file):
+    """Load history records
+
+    :rtype: list of dictionary
+    """
+    records = []
+    if osp.isfile(history_file):
+        with open(history_file) as istr:
+            for line in istr:
+                if line.strip():
+                    records.append(json.loads(line))
+    return records
+
+
+def append(driver, history_file):
+    """Append records of a campaign to the history. Campaigns already
+    in the history are not appended again.
+
+    :param driver: see ``campaign_records``
+    :return: number of records appended
+    :rtype: int
+    """
+    records = list(campaign_records(driver))
+    if not records:
+        return 0
+    campaigns = set(record['campaign'] for record in load(history_file))
+    if records[0]['campaign'] in campaigns:
+        LOGGER.warning('Campaign %s already in history %s, skipped',
+                       records[0]['campaign'], history_file)
+        return 0
+    with open(history_file, 'a') as ostr:
+        for record in records:
+            json.dump(record, ostr, sort_keys=True)
+            ostr.write('\n')
+    return len(records)
+
+
+def series_key(record):
+    """Get key of the series a record belongs to
+
+    :rtype: tuple of strings
+    """
+    return (
+        record['hostname'],
+        record['tag'],
+        record['suite'],
+        record['category'],
+        json.dumps(record['metas'], sort_keys=True, default=str),
+        record['metric'],
+    )
+
+
+def get_series(records, statistic='mean', metrics=None):
+    """Group records by series
+
+    :param statistic: statistic used as value of the series
+    :param metrics: optional list of patterns of the metrics to select
+    :return: key -> records, ordered by date. Records whose statistic
+    is not available are ignored.
+    :rtype: dictionary
+    """
+    series = dict()
+    for record in records:
+        if record.get(statistic) is None:
+            continue
+        if metrics and not any(fnmatch.fnmatchcase(record['metric'], pattern)
+                               for pattern in metrics):
+            continue
+        series.setdefault(series_key(record), []).append(record)
+    for values in series.values():
+        values.sort(key=lambda record: record['date'])
+    return series
+
+
+def _energy_statistics(distances, start, end, min_size):
+    """Divergence between the values before and after every candidate
+    split of a segment, with ``alpha = 1``
+
+    :param distances: cumulative sums of the matrix of the pairwise
+    distances of the values, padded with a leading row and column of 0
+    :return: candidate splits, and their statistics
+    """
+    def _block(row_start, row_end, col_start, col_end):
+        return (distances[row_end, col_end] - distances[row_start, col_end] -
+                distances[row_end, col_start] +
+                distances[row_start, col_start])
+    splits = np.arange(start + min_size, end - min_size + 1)
+    left = (splits - start).astype(float)
+    right = (end - splits).astype(float)
+    between = _block(start, splits, splits, end) / (left * right)
+    # every pair is counted twice in the symmetric matrix
+    within_left = _block(start, splits, start, splits) / (left * (left - 1))
+    within_right = _block(splits, end, splits, end) / (right * (right - 1))
+    stats = left * right / (left + right) * (
+        2 * between - within_left - within_right
+    )
+    return splits, stats
+
+
+def _cumulative_distances(values):
+    distances = np.abs(values[:, None] - values[None, :])
+    eax = np.zeros((len(values) + 1, len(values) + 1))
+    eax[1:, 1:] = distances.cumsum(axis=0).cumsum(axis=1)
+    return eax
+
+
+def _best_split(values, start, end, min_size, distances=None):
+    if end - start < 2 * min_size:
+        return None, None
+    if distances is None:
+        distances = _cumulative_distances(values)
+    splits, stats = _energy_statistics(distances, start, end, min_size)
+    best = int(np.argmax(stats))
+    return int(splits[best]), float(stats[best])
+
+
+def e_divisive(values, min_size=3, alpha=0.05, permutations=199,
+               random=None):
+    """Estimate change points with the E-divisive method
+
+    Segments are split where the energy divergence between the values
+    before and after the split is maximal, as long as the split is
+    significant: the divergence is compared to the maximal divergence
+    of the segments whose values are permuted.
+
+    :param values: series values
+    :param min_size: minimal number of values between change points
+    :param alpha: significance level of the permutation test
+    :param permutations: number of permutations of the test
+    :param random: ``numpy.random.RandomState`` instance
+    :return: change points, and their p-values. A change point is the
+    index of the first value after the change.
+    :rtype: list of tuple (int, float)
+    """
+    if random is None:
+        random = np.random.RandomState(SEED)
+    values = np.asarray(values, dtype=float)
+    min_size = max(int(min_size), 2)
+    distances = _cumulative_distances(values)
+    bounds = [0, len(values)]
+    change_points = []
+    while True:
+        candidates = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            split, stat = _best_split(values, start, end, min_size,
+                                      distances)
+            if split is not None:
+                candidates.append((stat, split, start, end))
+        if not candidates:
+            break
+        stat, split, start, end = max(candidates)
+        exceeding = 0
+        for _ in range(permutations):
+            # values are permuted within every segment
+            permuted = np.concatenate([
+                random.permutation(values[start:end])
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ])
+            permuted_distances = _cumulative_distances(permuted)
+            permuted_stat = max(
+                _best_split(permuted, start, end, min_size,
+                            permuted_distances)[1] or 0.0
+                for start, end in zip(bounds[:-1], bounds[1:])
+            )
+            if permuted_stat >= stat:
+                exceeding += 1
+        p_value = (exceeding + 1.0) / (permutations + 1)
+        if p_value > alpha:
+            break
+        change_points.append((split, p_value))
+        bounds = sorted(bounds + [split])
+    return sorted(change_points)
+
+
+def cusum(values, threshold=1.358, min_size=3):
+    """Estimate change points by binary segmentation of the cumulative
+    sums of the deviations to the mean
+
+    A segment is split where the absolute cumulative sum is maximal,
+    if this maximum, normalized by the standard deviation and the
+    square root of the segment size, exceeds the threshold. Without
+    change, the normalized statistic follows the Kolmogorov
+    distribution, whose 95% quantile is the default threshold.
+
+    :param values: series values
+    :param threshold: critical value of the normalized statistic
+    :param min_size: minimal number of values between change points
+    :return: change points, index of the first value after the change
+    :rtype: list of int
+    """
+    values = np.asarray(values, dtype=float)
+    min_size = max(int(min_size), 1)
+    if len(values) < 2 * min_size:
+        return []
+    # robust estimate of the standard deviation, insensitive to
+    # the steps of the series: median absolute successive difference
+    stddev = np.median(np.abs(np.diff(values))) / (0.6745 * np.sqrt(2))
+    if not stddev:
+        # almost constant values
+        stddev = np.abs(np.diff(values)).mean()
+    if not stddev:
+        return []
+    change_points = []
+    segments = [(0, len(values))]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2 * min_size:
+            continue
+        segment = values[start:end]
+        sums = np.cumsum(segment - segment.mean())[min_size - 1:-min_size]
+        best = int(np.argmax(np.abs(sums)))
+        if abs(sums[best]) / (stddev * np.sqrt(end - start)) <= threshold:
+            continue
+        split = start + min_size + best
+        change_points.append(split)
+        segments.extend([(start, split), (split, end)])
+    return sorted(change_points)
+
+
+class ChangePointDetector(object):
+    """Detect change points of the series of a history"""
+    def __init__(self, config=None):
+        """
+        :param config: optional dictionary overriding
+        ``DEFAULT_CONFIG``, providing:
+
+        * ``method``: ``e-divisive`` or ``cusum``
+        * ``statistic``: statistic of the records used as series value
+        * ``metrics``: patterns of the ``<category>__<metric>`` names
+          of the series to analyze
+        * ``min_size``: minimal number of values between change points
+        * ``alpha``, ``permutations``: E-divisive significance test
+        * ``threshold``: critical value of the CUSUM statistic
+        """
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        if self.config['method'] not in METHODS:
+            raise Exception('Unknown change point detection method: %s' %
+                            self.config['method'])
+        if self.config['statistic'] not in STATISTICS:
+            raise Exception('Unknown statistic: %s' %
+                            self.config['statistic'])
+
+    def detect(self, values, random):
+        """Detect change points of a series
+
+        :return: change points, and their p-values
+        :rtype: list of tuple (int, float)
+        """
+        if self.config['method'] == CUSUM:
+            return [
+                (index, None) for index in cusum(
+                    values, self.config['threshold'],
+                    self.config['min_size']
+                )
+            ]
+        return e_divisive(values, self.config['min_size'],
+                          self.config['alpha'], self.config['permutations'],
+                          random)
+
+    def __call__(self, records):
+        """Detect change points of all series
+
+        :param records: history records
+        :return: one dictionary per change point, providing where the
+        change happened: ``hostname``, ``tag``, ``suite``,
+        ``benchmark``, ``category``, ``metas``, ``metric``, when:
+        ``campaign`` and ``date`` of the first record after the
+        change, and the ``previous`` campaign. The change itself is
+        described by the ``before`` and ``after`` means of the values
+        of the adjacent segments, the relative ``change``, and the
+        ``p_value`` of the E-divisive test.
+        :rtype: list of dictionary
+        """
+        random = np.random.RandomState(SEED)
+        statistic = self.config['statistic']
+        reports = []
+        series = get_series(records, statistic, self.config['metrics'])
+        for key in sorted(series):
+            records = series[key]
+            values = [record[statistic] for record in records]
+            change_points = self.detect(values, random)
+            bounds = [0] + [index for index, _ in change_points] + \
+                [len(values)]
+            for i, (index, p_value) in enumerate(change_points):
+                before = float(np.mean(values[bounds[i]:index]))
+                after = float(np.mean(values[index:bounds[i + 2]]))
+                record = records[index]
+                reports.append(dict(
+                    hostname=record['hostname'],
+                    tag=record['tag'],
+                    suite=record['suite'],
+                    benchmark=record['benchmark'],
+                    category=record['category'],
+                    metas=record['metas'],
+                    metric=record['metric'],
+                    statistic=statistic,
+                    campaign=record['campaign'],
+                    date=record['date'],
+                    previous=records[index - 1]['campaign'],
+                    before=before,
+                    after=after,
+                    change=(after - before) / abs(before) if before
+                    else None,
+                    p_value=p_value,
+                ))
+        return reports
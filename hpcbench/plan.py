@@ -0,0 +1,275 @@
+"""Compile a campaign into a flat and immutable execution plan
+"""
+import copy
+import itertools
+import json
+import uuid
+
+from . api import Benchmark
+from . plot import Plotter
+from . scaling import get_scaling
+
+
+PLAN_FILE = 'plan.json'
+# namespace of the execution identifiers
+PLAN_NAMESPACE = uuid.UUID('7e4cb1c6-0f2d-4a49-9d3c-8b5d0f0e52a1')
+
+
+class Plan(object):
+    """Flat list of all executions of a campaign:
+    hosts x tags x benchmarks x executions.
+
+    Every execution is described by a dictionary providing the
+    following keys:
+
+    id:
+        identifier of the execution, stable across plan compilations,
+        also used to name the run directory.
+    host, tag, suite, category:
+        location of the execution in the campaign. ``suite`` is the
+        benchmark name in the campaign file.
+    benchmark:
+        benchmark type
+    execution:
+        dictionary provided by the ``Benchmark.execution_matrix``
+    estimated_duration:
+        expected duration in seconds if known, ``None`` otherwise.
+
+    A plan is never modified once compiled. Selections of a plan
+    are views sharing the same benchmark instances.
+    """
+    VERSION = 1
+    # maximal number of executions of a benchmark on one host,
+    # overridden by the ``max_executions`` campaign key
+    MAX_EXECUTIONS = 100000
+
+    def __init__(self, executions, suites, benchmarks=None):
+        """
+        :param executions: list of execution descriptions
+        :param suites: ``(tag, suite) -> dict`` providing the benchmark
+        ``type``, ``description`` and plot files of every category.
+        :param benchmarks: ``(tag, suite) -> Benchmark`` instance
+        used to compile the plan, if any
+        """
+        self._executions = tuple(executions)
+        self._suites = suites
+        self._benchmarks = {} if benchmarks is None else benchmarks
+
+    def __iter__(self):
+        return iter(self._executions)
+
+    def __len__(self):
+        return len(self._executions)
+
+    def select(self, **kwargs):
+        """Get subset of the plan
+
+        :param kwargs: execution fields values, ``host='srv01'``
+        for instance
+        :rtype: ``Plan``
+        """
+        return Plan(
+            [
+                execution for execution in self._executions
+                if all(execution[k] == v for k, v in kwargs.items())
+            ],
+            self._suites,
+            self._benchmarks
+        )
+
+    def distinct(self, field):
+        """Get values of an execution field
+
+        :return: values of the field, in order of appearance
+        :rtype: list
+        """
+        values = []
+        seen = set()
+        for execution in self._executions:
+            value = execution[field]
+            if value not in seen:
+                seen.add(value)
+                values.append(value)
+        return values
+
+    def suite(self, tag, suite):
+        """Get description of a campaign benchmark
+
+        :return: dictionary providing the benchmark ``type``,
+        ``description``, and ``plots`` files of every category
+        """
+        return self._suites[(tag, suite)]
+
+    def benchmark(self, campaign, tag, suite):
+        """Get ``Benchmark`` instance of a campaign benchmark.
+        The benchmark class is only imported on first call.
+        """
+        key = (tag, suite)
+        benchmark = self._benchmarks.get(key)
+        if benchmark is None:
+            benchmark = create_benchmark(campaign.benchmarks[tag][suite])
+            self._benchmarks[key] = benchmark
+        return benchmark
+
+    @property
+    def estimated_duration(self):
+        """Get estimated duration of the plan
+
+        :return: sum of known durations in seconds, and number of
+        executions whose duration is unknown
+        :rtype: tuple
+        """
+        duration = 0
+        unknown = 0
+        for execution in self._executions:
+            if execution['estimated_duration'] is None:
+                unknown += 1
+            else:
+                duration += execution['estimated_duration']
+        return duration, unknown
+
+    def dump(self, path):
+        """Write plan in a JSON file
+        """
+        with open(path, 'w') as ostr:
+            json.dump(
+                dict(
+                    version=self.VERSION,
+                    suites=list(self._suites.values()),
+                    executions=self._executions,
+                ),
+                ostr,
+                indent=2
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Load plan written by the ``dump`` method
+        """
+        with open(path) as istr:
+            data = json.load(istr)
+        if data['version'] != cls.VERSION:
+            raise Exception('Unsupported plan version: %s' % data['version'])
+        suites = dict(
+            ((suite['tag'], suite['suite']), suite)
+            for suite in data['suites']
+        )
+        return cls(data['executions'], suites)
+
+    @classmethod
+    def build(cls, campaign, hosts):
+        """Compile a campaign
+
+        :param campaign: campaign, as returned by
+        ``hpcbench.campaign.from_file``
+        :param hosts: list of hosts to plan
+        :rtype: ``Plan``
+        :raise Exception: if a benchmark has more executions than
+        the ``max_executions`` campaign key, ``MAX_EXECUTIONS`` by
+        default. Executions are counted before being stored, without
+        keeping them in memory.
+        """
+        executions = []
+        suites = dict()
+        benchmarks = dict()
+        scalings = dict()
+        max_executions = campaign.get('max_executions', cls.MAX_EXECUTIONS)
+        tags_index = campaign.network.tags_index
+        for host in hosts:
+            tags = (
+                {'*'} | tags_index.get('localhost') | tags_index.get(host)
+            )
+            for tag in sorted(tags):
+                for suite in sorted(campaign.benchmarks.get(tag) or {}):
+                    key = (tag, suite)
+                    if key not in benchmarks:
+                        config = campaign.benchmarks[tag][suite]
+                        benchmark = create_benchmark(config)
+                        benchmarks[key] = benchmark
+                        scalings[key] = get_scaling(config)
+                        suites[key] = cls._suite_description(
+                            tag, suite, benchmark, scalings[key]
+                        )
+                        cls._check_size(suite, cls._matrix(
+                            benchmark, scalings[key]
+                        ), max_executions)
+                    benchmark = benchmarks[key]
+                    matrix = cls._matrix(benchmark, scalings[key])
+                    for index, execution in enumerate(matrix):
+                        executions.append(cls._execution(
+                            benchmark,
+                            execution,
+                            host=host,
+                            tag=tag,
+                            suite=suite,
+                            index=index,
+                        ))
+        return cls(executions, suites, benchmarks)
+
+    @classmethod
+    def _matrix(cls, benchmark, scaling):
+        """Get executions of a benchmark, generated lazily"""
+        if scaling is None:
+            return benchmark.execution_matrix
+        return scaling.execution_matrix(benchmark)
+
+    @classmethod
+    def _check_size(cls, suite, matrix, max_executions):
+        """Ensure that an execution matrix is not oversized, by
+        iterating at most ``max_executions + 1`` executions
+        """
+        if next(itertools.islice(matrix, max_executions, None),
+                None) is not None:
+            raise Exception(
+                'Too many executions of benchmark %s, '
+                'more than max_executions: %d' % (suite, max_executions)
+            )
+
+    @classmethod
+    def _suite_description(cls, tag, suite, benchmark, scaling=None):
+        plots = dict(
+            (category, [Plotter.get_filename(plot) for plot in plots])
+            for category, plots in benchmark.plots.items()
+        )
+        if scaling is not None:
+            plots.setdefault(scaling.category, []).extend(
+                Plotter.get_filename(plot) for plot in scaling.plots
+            )
+        return dict(
+            tag=tag,
+            suite=suite,
+            type=benchmark.name,
+            description=benchmark.description,
+            plots=plots,
+        )
+
+    @classmethod
+    def _execution(cls, benchmark, execution, **kwargs):
+        index = kwargs.pop('index')
+        key = json.dumps(
+            [kwargs, index, execution],
+            sort_keys=True,
+            default=str
+        )
+        eax = dict(
+            id=str(uuid.uuid5(PLAN_NAMESPACE, key)),
+            benchmark=benchmark.name,
+            category=execution['category'],
+            execution=copy.deepcopy(execution),
+            estimated_duration=benchmark.estimated_duration(execution),
+        )
+        eax.update(kwargs)
+        return eax
+
+
+def create_benchmark(config):
+    """Instantiate a campaign benchmark
+
+    :param config: benchmark section of the campaign, providing
+    the benchmark ``type`` and optional ``attributes``
+    :rtype: ``hpcbench.api.Benchmark``
+    """
+    benchmark = Benchmark.get_subclass(config['type'])()
+    if 'attributes' in config:
+        benchmark.attributes = copy.deepcopy(config['attributes'])
+    return benchmark
@@ -2,30 +2,61 @@
 """
 import hashlib
 import operator
+import sys
 
+from hpcbench import arrays
 from hpcbench.toolbox.collections_ext import flatten_dict
 from hpcbench.toolbox.edsl import kwargsql
 from hpcbench.toolbox.functools_ext import compose
 
 
+def pyplot():
+    """Import matplotlib pyplot module on-demand, because it takes time.
+
+    :return: ``matplotlib.pyplot`` module, using a non-interactive backend
+    """
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+        matplotlib.use('PS')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 class Plotter(object):
     """Use matplotlib to draw figures
     """
-    def __init__(self, metrics, **kwargs):
+    # statistics providing the error bars of ``errors`` descriptions
+    ERRORS = frozenset(['ci', 'stddev'])
+
+    def __init__(self, metrics, summary=None, **kwargs):
+        """
+        :param metrics: runs, as written in ``metrics.json``
+        :param summary: optional statistical summary of the runs,
+        as written in ``summary.json``
+        :param kwargs: fields of the figure name
+        """
         self.metrics = metrics
+        self.summary = summary
         self.kwargs = kwargs
 
     def __call__(self, desc):
         """Draw figure
         :param desc: Figure description
         """
-
-        metrics = self.select_metrics(desc)
-        metrics = self.sort_metrics(desc, metrics)
-        meta_series, metric_series = self.build_series(desc, metrics)
+        if desc.get('errors') and self.summary is not None:
+            if desc['errors'] not in self.ERRORS:
+                raise Exception('Unknown error bars: %s' % desc['errors'])
+            groups = self.select_metrics(desc, self.summary)
+            groups = self.sort_metrics(desc, groups)
+            meta_series, metric_series = self.build_summary_series(
+                desc, groups
+            )
+        else:
+            metrics = self.select_metrics(desc)
+            metrics = self.sort_metrics(desc, metrics)
+            meta_series, metric_series = self.build_series(desc, metrics)
         title = desc['name'].format(**self.kwargs)
-        import matplotlib.pyplot as plt
-
+        plt = pyplot()
         plt.title(title)
         desc['plotter'](
             plt,
@@ -71,22 +102,27 @@ class Plotter(object):
             metrics.sort(key=_key_builder_func)
         return metrics
 
-    def select_metrics(self, desc):
+    def select_metrics(self, desc, metrics=None):
         """
+        :param metrics: runs or summary groups to select from,
+        default is all runs
         :return: metrics required to draw the figure
         :rtype: dictionary
         """
+        if metrics is None:
+            metrics = self.metrics
         selectables = desc.get('select') or []
         if not selectables:
-            return self.metrics
+            return list(metrics)
         return [
-            m for m in self.metrics
+            m for m in metrics
             if kwargsql.and_(m, **selectables)
         ]
 
     @classmethod
     def build_series(cls, desc, metrics):
-        """Transform JSON metrics to data series used by matplotlib
+        """Transform JSON metrics to data series used by matplotlib.
+        Values of array metrics are memory-mapped NumPy arrays.
         """
         meta_names = [
             m[1:] if m.startswith('-') else m
@@ -102,6 +138,8 @@ class Plotter(object):
                         value = dico.get(name)
                     else:
                         value = kwargsql.get(dico, name)
+                    if arrays.is_reference(value):
+                        value = arrays.load(value)
                     if value is not None:
                         serie.setdefault(name, []).append(value)
             _search_in_dict(meta_names, run.get('metas') or {}, meta_series)
@@ -109,3 +147,53 @@ class Plotter(object):
                             run.get('metrics') or {},
                             metric_series, with_kwargsql=True)
         return meta_series, metric_series
+
+    @classmethod
+    def build_summary_series(cls, desc, groups):
+        """Transform summary groups to data series used by matplotlib.
+        Metric series provide the mean of every group, and series
+        suffixed by ``__error`` the ``(lower, upper)`` error bar
+        lengths, according to the ``errors`` key of the description:
+        ``ci`` for the confidence interval of the mean, or ``stddev``
+        for the standard deviation.
+        """
+        meta_names = [
+            m[1:] if m.startswith('-') else m
+            for m in desc['series'].get('metas') or []
+        ]
+        meta_series = dict()
+        metric_series = dict()
+        for group in groups:
+            for name in meta_names:
+                value = (group.get('metas') or {}).get(name)
+                if value is not None:
+                    meta_series.setdefault(name, []).append(value)
+            for name in desc['series']['metrics']:
+                category, metric = name.split('__', 1)
+                stats = group['metrics'].get(category, {}).get(metric)
+                if stats is None:
+                    continue
+                mean = stats['mean']
+                if desc['errors'] == 'ci':
+                    error = (mean - stats['ci_low'], stats['ci_high'] - mean)
+                else:
+                    error = (stats['stddev'] or 0.0,) * 2
+                metric_series.setdefault(name, []).append(mean)
+                metric_series.setdefault(name + '__error', []).append(error)
+        return meta_series, metric_series
+
+
+def plot_errorbars(plt, description, metas, metrics):
+    """Plot metrics of a figure description providing ``errors``,
+    with the first meta on the X axis, and error bars
+    """
+    meta = description['series']['metas'][0].lstrip('-')
+    for name in description['series']['metrics']:
+        errors = metrics.get(name + '__error')
+        plt.errorbar(
+            metas[meta], metrics[name],
+            yerr=list(zip(*errors)) if errors else None,
+            fmt='o-', capsize=3, label=name,
+        )
+    plt.xlabel(meta)
+    plt.legend(loc='upper left', frameon=False)
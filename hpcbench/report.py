@@ -3,13 +3,10 @@
 import re
 import sys
 
-from jinja2 import Environment, PackageLoader
 import six
 
 
-ENV = Environment(
-    loader=PackageLoader('hpcbench', 'templates'),
-)
+ENV = None
 DEFAULT_TEMPLATE = 'report.tex.jinja'
 
 
@@ -44,7 +41,18 @@ def tex_escape(text):
     return regex.sub(lambda match: conv[match.group()], text)
 
 
-ENV.filters['texscape'] = tex_escape
+def get_env():
+    """Get Jinja environment, created on first call
+    because importing jinja2 takes time.
+    """
+    global ENV  # pylint: disable=global-statement
+    if ENV is None:
+        from jinja2 import Environment, PackageLoader
+        ENV = Environment(
+            loader=PackageLoader('hpcbench', 'templates'),
+        )
+        ENV.filters['texscape'] = tex_escape
+    return ENV
 
 
 def render(campaign_driver, template=None, ostr=None):
@@ -57,5 +65,5 @@ def render(campaign_driver, template=None, ostr=None):
     """
     template = template or DEFAULT_TEMPLATE
     ostr = ostr or sys.stdout
-    jinja_template = ENV.get_template(template)
+    jinja_template = get_env().get_template(template)
     jinja_template.stream(campaign=campaign_driver).dump(ostr)
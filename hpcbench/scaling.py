@@ -0,0 +1,209 @@
+"""Strong and weak scaling studies of campaign benchmarks
+"""
+import copy
+import json
+
+from . toolbox.process import thread_counts
+from . toolbox.search import (
+    GOALS,
+    MINIMIZE,
+)
+from . toolbox.sweep import values
+
+STRONG = 'strong'
+WEAK = 'weak'
+MODES = frozenset([STRONG, WEAK])
+# pseudo category of the derived metrics
+CATEGORY = 'scaling'
+
+
+def get_scaling(config):
+    """Get scaling study of a campaign benchmark
+
+    :param config: benchmark section of the campaign
+    :return: ``Scaling`` instance, ``None`` if the benchmark has no
+    ``scaling`` section
+    """
+    scaling = config.get('scaling')
+    if scaling:
+        return Scaling(scaling)
+
+
+class Scaling(object):
+    """Scaling study, described by the ``scaling`` section of a
+    campaign benchmark, providing the following keys:
+
+    attribute:
+        benchmark attribute providing the list of resources to test,
+        ``threads`` for instance
+    meta:
+        meta providing the resources of an execution, default is
+        ``attribute``
+    ladder:
+        resources to test, default is powers of 2 up to the number of
+        CPUs. Sweep series are supported, see ``hpcbench.toolbox.sweep``.
+    mode:
+        ``strong`` (default) or ``weak``
+    metric:
+        metric used to compute the speedup, as ``<category>__<metric>``
+    goal:
+        ``minimize`` (default) when lower values of the metric are
+        better, a duration for instance, or ``maximize`` for a throughput
+    problem:
+        weak scaling only, optional dictionary describing the problem
+        size, growing linearly with the resources: ``attribute`` is the
+        benchmark attribute providing the list of problem sizes,
+        ``meta`` the meta providing the problem size of an execution
+        (default is ``attribute``), and ``size`` the problem size of
+        the first step of the ladder.
+    """
+    def __init__(self, config):
+        self.attribute = config['attribute']
+        self.meta = config.get('meta') or self.attribute
+        self.mode = config.get('mode') or STRONG
+        if self.mode not in MODES:
+            raise Exception('Unknown scaling mode: %s' % self.mode)
+        ladder = config.get('ladder')
+        self.ladder = thread_counts() if ladder is None else list(
+            values(ladder)
+        )
+        self.category, self.metric = config['metric'].split('__', 1)
+        self.goal = config.get('goal') or MINIMIZE
+        if self.goal not in GOALS:
+            raise Exception('Unknown scaling goal: %s' % self.goal)
+        self.problem = config.get('problem')
+        if self.problem:
+            self.problem = dict(self.problem)
+            self.problem.setdefault('meta', self.problem['attribute'])
+
+    def problem_size(self, resources):
+        """Get problem size of a step of the ladder, in weak mode"""
+        return int(round(
+            self.problem['size'] * float(resources) / self.ladder[0]
+        ))
+
+    def execution_matrix(self, benchmark):
+        """Generate executions of every step of the ladder, where the
+        benchmark attribute only provides the resources of the step.
+        Benchmark attributes are restored afterward.
+        """
+        attributes = benchmark.attributes
+        try:
+            for resources in self.ladder:
+                benchmark.attributes = copy.deepcopy(attributes)
+                self._set_attribute(benchmark, self.attribute, resources)
+                if self.mode == WEAK and self.problem:
+                    self._set_attribute(
+                        benchmark, self.problem['attribute'],
+                        self.problem_size(resources)
+                    )
+                for execution in benchmark.execution_matrix:
+                    yield execution
+        finally:
+            benchmark.attributes = attributes
+
+    @classmethod
+    def _set_attribute(cls, benchmark, name, value):
+        """Set the single value of a benchmark attribute, in a list
+        if the attribute lists values, ``threads: [1, 2]`` for instance,
+        as is otherwise, like the ``process_count`` of HPL.
+        """
+        current = benchmark.attributes.get(
+            name, benchmark.DEFAULT_ATTRIBUTES.get(name)
+        )
+        if isinstance(current, (list, tuple, dict)):
+            value = [value]
+        benchmark.attributes[name] = value
+
+    def _group_key(self, run):
+        metas = dict(run.get('metas') or {})
+        metas.pop(self.meta, None)
+        if self.problem:
+            metas.pop(self.problem['meta'], None)
+        return json.dumps(metas, sort_keys=True, default=str)
+
+    def _value(self, run):
+        return (run.get('metrics') or {}).get(
+            self.category, {}
+        ).get(self.metric)
+
+    def derive_metrics(self, runs):
+        """Add ``speedup`` and ``efficiency`` metrics of the ``scaling``
+        pseudo category to runs. The baseline of a run is the run
+        with the least resources having the same metas, except the
+        resources and problem size.
+
+        In strong mode, the speedup is the performance ratio with the
+        baseline, and the efficiency is the speedup divided by the
+        resources ratio. In weak mode, the efficiency is the performance
+        ratio, and the speedup is the efficiency multiplied by the
+        resources ratio. Runs whose ratios are undefined, because of
+        a value of 0 for instance, are left without these metrics.
+
+        :param runs: runs, as written in ``metrics.json``
+        """
+        groups = dict()
+        for run in runs:
+            if self._value(run) is not None:
+                groups.setdefault(self._group_key(run), []).append(run)
+        for group in groups.values():
+            baseline = min(group, key=lambda run: run['metas'][self.meta])
+            base_resources = float(baseline['metas'][self.meta])
+            base_value = float(self._value(baseline))
+            for run in group:
+                value = float(self._value(run))
+                if self.goal == MINIMIZE:
+                    numerator, denominator = base_value, value
+                else:
+                    numerator, denominator = value, base_value
+                if not denominator or not base_resources:
+                    continue
+                ratio = numerator / denominator
+                resources_ratio = run['metas'][self.meta] / base_resources
+                if self.mode == STRONG:
+                    speedup = ratio
+                    efficiency = ratio / resources_ratio
+                else:
+                    speedup = ratio * resources_ratio
+                    efficiency = ratio
+                run['metrics'][CATEGORY] = dict(
+                    speedup=speedup,
+                    efficiency=efficiency,
+                )
+
+    @property
+    def plots(self):
+        """Get figures of the scaling study"""
+        return [
+            dict(
+                name="{hostname} {category} %s scaling" % self.mode,
+                series=dict(
+                    metas=[self.meta],
+                    metrics=[
+                        CATEGORY + '__speedup',
+                        CATEGORY + '__efficiency',
+                    ],
+                ),
+                plotter=plot_scaling,
+            )
+        ]
+
+
+def plot_scaling(plt, description, metas, metrics):
+    """Plot speedup by resources, with the ideal speedup, and
+    the parallel efficiency on a secondary axis
+    """
+    meta = description['series']['metas'][0]
+    speedup, efficiency = description['series']['metrics']
+    resources = metas[meta]
+    base = float(min(resources))
+    plt.plot(resources, metrics[speedup], 'o', label='speedup')
+    plt.plot(sorted(resources), [r / base for r in sorted(resources)],
+             '--', color='gray', label='ideal')
+    plt.xlabel(meta)
+    plt.ylabel('speedup')
+    plt.legend(loc='upper left', frameon=False)
+    axis = plt.gca().twinx()
+    axis.plot(resources, metrics[efficiency], 'x', color='r')
+    axis.set_ylabel('efficiency')
+    axis.set_ylim(0, 1.1 * max(1.0, max(metrics[efficiency])))
@@ -0,0 +1,130 @@
+"""Statistical summary of the runs of a category, grouped by metas
+
+Runs having the same metas are repetitions of the same execution.
+For every group and every scalar metric, the summary provides:
+
+count:
+    number of runs providing the metric
+mean, stddev, median, min, max:
+    usual statistics. ``stddev`` is the sample standard deviation,
+    ``None`` for a single run.
+p5, p25, p75, p95, p99:
+    percentiles
+ci_low, ci_high:
+    percentile bootstrap confidence interval of the mean
+
+Statistics of a metric are computed for all groups at once: values are
+stored in a ``groups x runs`` NumPy array, padded with ``NaN``.
+"""
+import json
+import numbers
+import warnings
+
+import numpy as np
+
+PERCENTILES = [5, 25, 75, 95, 99]
+CONFIDENCE = 0.95
+RESAMPLES = 1000
+# seed of the bootstrap random generator, summaries are reproducible
+SEED = 0
+
+
+def summarize(runs, confidence=CONFIDENCE, resamples=RESAMPLES):
+    """Compute summary of runs
+
+    :param runs: runs, as written in ``metrics.json``
+    :param confidence: level of the confidence intervals
+    :param resamples: number of bootstrap resamples
+    :return: one dictionary per group, in order of appearance, providing
+    the group ``metas``, the number of runs ``count``, and the
+    ``metrics`` statistics, category -> metric -> statistic -> value
+    :rtype: list of dictionary
+    """
+    groups = []
+    indices = {}
+    values = {}
+    for run in runs:
+        metas = run.get('metas') or {}
+        key = json.dumps(metas, sort_keys=True, default=str)
+        index = indices.get(key)
+        if index is None:
+            index = indices[key] = len(groups)
+            groups.append(dict(metas=metas, count=0, metrics={}))
+        groups[index]['count'] += 1
+        for category, metrics in (run.get('metrics') or {}).items():
+            for name, value in metrics.items():
+                if isinstance(value, numbers.Number) and \
+                        not isinstance(value, bool):
+                    values.setdefault((category, name), {}).setdefault(
+                        index, []
+                    ).append(value)
+    random = np.random.RandomState(SEED)
+    for (category, name), samples in sorted(values.items()):
+        group_indices = sorted(samples)
+        stats = _statistics(
+            [samples[index] for index in group_indices],
+            confidence, resamples, random
+        )
+        for index, group_stats in zip(group_indices, stats):
+            groups[index]['metrics'].setdefault(category, {})[name] = \
+                group_stats
+    return groups
+
+
+def _statistics(samples, confidence, resamples, random):
+    """Compute statistics of several samples at once
+
+    :param samples: list of samples, every sample is a list of values
+    :return: statistics of every sample
+    :rtype: list of dictionary
+    """
+    counts = np.array([len(sample) for sample in samples])
+    data = np.full((len(samples), counts.max()), np.nan)
+    for row, sample in enumerate(samples):
+        data[row, :len(sample)] = sample
+    with warnings.catch_warnings():
+        # standard deviation of single values
+        warnings.simplefilter('ignore', RuntimeWarning)
+        columns = dict(
+            mean=np.nanmean(data, axis=1),
+            stddev=np.nanstd(data, axis=1, ddof=1),
+            median=np.nanmedian(data, axis=1),
+            min=np.nanmin(data, axis=1),
+            max=np.nanmax(data, axis=1),
+        )
+    for percentile, column in zip(
+            PERCENTILES, np.nanpercentile(data, PERCENTILES, axis=1)):
+        columns['p%d' % percentile] = column
+    columns['ci_low'], columns['ci_high'] = _bootstrap(
+        data, counts, confidence, resamples, random
+    )
+    stats = []
+    for row, count in enumerate(counts):
+        sample_stats = dict(
+            (stat, float(column[row]))
+            for stat, column in columns.items()
+        )
+        sample_stats['count'] = int(count)
+        if count < 2:
+            sample_stats['stddev'] = None
+        stats.append(sample_stats)
+    return stats
+
+
+def _bootstrap(data, counts, confidence, resamples, random):
+    """Percentile bootstrap confidence intervals of the means of
+    the rows of a padded array
+
+    :return: lower and upper bounds of every row
+    """
+    samples, width = data.shape
+    # resample i-th row among its ``counts[i]`` values
+    picks = (
+        random.random_sample((samples, resamples, width)) *
+        counts[:, None, None]
+    ).astype(int)
+    resampled = data[np.arange(samples)[:, None, None], picks]
+    mask = np.arange(width)[None, None, :] < counts[:, None, None]
+    means = np.where(mask, resampled, 0).sum(axis=2) / counts[:, None]
+    alpha = (1 - confidence) / 2 * 100
+    return np.percentile(means, [alpha, 100 - alpha], axis=1)
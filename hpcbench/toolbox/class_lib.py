@@ -1,6 +1,7 @@
 """Provide metaclass to allow top-hierarchy classes
 to access its subclasses
 """
+import inspect
 
 __all__ = [
     'ClassRegistrar'
@@ -31,14 +32,22 @@ class ClassLibrary(object):
             yield clazz
 
     @classmethod
-    def register_subclass(cls, clazz):
-        """Register a subclass
+    def register_subclass(cls, clazz, name=None):
+        """Register a subclass. Abstract classes, and classes inheriting
+        the name of a registered parent are ignored.
 
         :param clazz: Class to register
+        :param name: Name of the class, default is the class ``name``
+        attribute if any, the class name otherwise
         """
-        name = getattr(clazz, 'name', clazz.__name__)
+        if inspect.isabstract(clazz):
+            return
+        name = name or getattr(clazz, 'name', clazz.__name__)
         classes = cls.SUB_CLASSES  # pylint: disable=no-member
-        if name in classes:
+        registered = classes.get(name)
+        if registered is not None:
+            if issubclass(clazz, registered):
+                return
             raise Exception('class %s is already registered' % name)
         classes[name] = clazz
 
@@ -61,11 +70,16 @@ class ClassRegistrar(type):
             name = "awesome-class"
     >>> Foo.get_subclass('awesome-class')
     <class '__main__.EmbarassingClassName'>
+
+    It can be combined with other metaclasses, ``abc.ABCMeta`` for instance:
+
+    >>> class RegistrarABCMeta(ClassRegistrar, ABCMeta):
+            pass
     """
     def __new__(mcs, name, bases, attrs):
         if not bases or bases == (object,):
             attrs['SUB_CLASSES'] = {}
             bases = (ClassLibrary,) + bases
-        cls = type.__new__(mcs, name, bases, attrs)
+        cls = super(ClassRegistrar, mcs).__new__(mcs, name, bases, attrs)
         cls.register_subclass(cls)
         return cls
@@ -0,0 +1,70 @@
+"""Expand compact lists of hostnames, like the ones used by
+cluster resource managers: ``srv[001-512]``, ``rack[1-2]-cn[01-16]``
+"""
+import itertools
+import re
+
+__all__ = ['expand_hostlist']
+
+_HOSTLIST_PART = re.compile(r'\[([^\]]*)\]')
+
+
+def _split(hostlist):
+    """Split comma separated hostlist expressions,
+    ignoring commas inside brackets
+    """
+    depth = 0
+    token = ''
+    for char in hostlist:
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        if char == ',' and depth == 0:
+            yield token
+            token = ''
+        else:
+            token += char
+    yield token
+
+
+def _expand_range(hostrange):
+    """Expand content of brackets: ``001-003,7`` for instance
+    """
+    for item in hostrange.split(','):
+        item = item.strip()
+        if '-' not in item:
+            yield item
+            continue
+        start, end = item.split('-', 1)
+        width = len(start) if start.startswith('0') else 0
+        start, end = int(start), int(end)
+        if start > end:
+            raise Exception('Invalid hostlist range: ' + item)
+        for index in range(start, end + 1):
+            yield str(index).zfill(width)
+
+
+def expand_hostlist(hostlist):
+    """Expand a hostlist expression
+
+    :param hostlist: comma separated hostlist expressions, for instance
+    ``srv[001-003,7],gpu-srv[1-2]``
+    :return: hostnames, in order of appearance
+    :rtype: string generator
+
+    >>> list(expand_hostlist('srv[01-02],gpu[1-2]-ib'))
+    ['srv01', 'srv02', 'gpu1-ib', 'gpu2-ib']
+    """
+    for expr in _split(hostlist):
+        expr = expr.strip()
+        if not expr:
+            continue
+        parts = _HOSTLIST_PART.split(expr)
+        # even indices are constant parts, odd ones are bracket contents
+        choices = [
+            [part] if i % 2 == 0 else list(_expand_range(part))
+            for i, part in enumerate(parts)
+        ]
+        for host in itertools.product(*choices):
+            yield ''.join(host)
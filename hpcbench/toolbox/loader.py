@@ -1,61 +1,116 @@
 """Load symbols referenced in setuptools entry points
+
+Importing ``pkg_resources`` and scanning ``sys.path`` are expensive,
+so entry points are discovered only when a component is requested,
+and discovery results are cached for the lifetime of the process.
 """
 
 import logging
 
-from pkg_resources import (
-    DistributionNotFound,
-    Environment,
-    UnknownExtra,
-    VersionConflict,
-    working_set,
-)
-
 
 LOGGER = logging.getLogger()
+_ENTRY_POINTS = {}
+_EGGS_LOADED = []
+
+
+def _log_error(item, err):
+    from pkg_resources import (
+        DistributionNotFound,
+        UnknownExtra,
+        VersionConflict,
+    )
+    if isinstance(err, DistributionNotFound):
+        LOGGER.debug('Skipping "%s": ("%s" not found)', item, err)
+    elif isinstance(err, VersionConflict):
+        LOGGER.error('Skipping "%s": (version conflict "%s")',
+                     item, err)
+    elif isinstance(err, UnknownExtra):
+        LOGGER.error('Skipping "%s": (unknown extra "%s")', item, err)
+    else:
+        LOGGER.error('Skipping "%s": %s', item, err)
+
+
+def _add_eggs():
+    """Add to the working set the distributions found in `sys.path`.
+    The scan is performed at most once.
+    """
+    if _EGGS_LOADED:
+        return
+    _EGGS_LOADED.append(True)
+    from pkg_resources import Environment, working_set
+    distributions, errors = working_set.find_plugins(
+        Environment()
+    )
+    for dist in distributions:
+        # pylint: disable=unsupported-membership-test
+        if dist not in working_set:
+            LOGGER.debug('Adding plugin %s from %s', dist, dist.location)
+            working_set.add(dist)
+    for dist, err in errors.items():
+        _log_error(dist, err)
+    _ENTRY_POINTS.clear()
+
+
+def entry_points(group):
+    """Get entry points of a group, without loading them
+
+    :param group: entry points group name, ``hpcbench.benchmarks`` for
+    instance
+    :return: entry points indexed by name
+    :rtype: dictionary of string -> list of ``pkg_resources.EntryPoint``
+    """
+    eax = _ENTRY_POINTS.get(group)
+    if eax is None:
+        from pkg_resources import working_set
+        eax = dict()
+        for entry in working_set.iter_entry_points(group):
+            eax.setdefault(entry.name, []).append(entry)
+        _ENTRY_POINTS[group] = eax
+    return eax
+
+
+def _load_entry(entry):
+    LOGGER.debug(
+        'Loading %s from %s',
+        entry.name,
+        entry.dist.location
+    )
+    try:
+        return entry.load(require=True)
+    except Exception as exc:  # pylint: disable=broad-except
+        _log_error(entry, exc)
+
+
+def load_entry_point(group, name):
+    """Load symbols referenced by the entry points of a group having
+    a given name. Distributions of `sys.path` are only looked up if
+    the entry point is not part of the installed distributions.
+
+    :param group: entry points group name
+    :param name: entry point name
+    :return: loaded symbols
+    :rtype: list
+    """
+    entries = entry_points(group).get(name)
+    if entries is None:
+        _add_eggs()
+        entries = entry_points(group).get(name, [])
+    return [_load_entry(entry) for entry in entries]
 
 
 def load_eggs(entry_point_name):
     """Loader that loads any eggs in `sys.path`."""
     def _load_eggs():
-        distributions, errors = working_set.find_plugins(
-            Environment()
-        )
-        for dist in distributions:
-            # pylint: disable=unsupported-membership-test
-            if dist not in working_set:
-                LOGGER.debug('Adding plugin %s from %s', dist, dist.location)
-                working_set.add(dist)
-
-        def _log_error(item, err):
-            if isinstance(err, DistributionNotFound):
-                LOGGER.debug('Skipping "%s": ("%s" not found)', item, err)
-            elif isinstance(err, VersionConflict):
-                LOGGER.error('Skipping "%s": (version conflict "%s")',
-                             item, err)
-            elif isinstance(err, UnknownExtra):
-                LOGGER.error('Skipping "%s": (unknown extra "%s")', item, err)
-            else:
-                LOGGER.error('Skipping "%s": %s', item, err)
-
-        for dist, err in errors.items():
-            _log_error(dist, err)
-
-        for entry in sorted(working_set.iter_entry_points(entry_point_name),
-                            key=lambda entry: entry.name):
-            LOGGER.debug(
-                'Loading %s from %s',
-                entry.name,
-                entry.dist.location
-            )
-            try:
-                entry.load(require=True)
-            except Exception as exc:  # pylint: disable=broad-except
-                _log_error(entry, exc)
+        _add_eggs()
+        entries = entry_points(entry_point_name)
+        for name in sorted(entries):
+            for entry in entries[name]:
+                _load_entry(entry)
     return _load_eggs
 
 
-def load_components(loaders=(load_eggs('hpcbench.benchmarks'),)):
+def load_components(loaders=(load_eggs('hpcbench.benchmarks'),
+                             load_eggs('hpcbench.exporters'))):
     """Load all plugin components found in `sys.path`."""
     for loadfunc in loaders:
         loadfunc()
@@ -0,0 +1,122 @@
+"""Tools related to the processes executed by benchmarks
+"""
+import glob
+import hashlib
+import multiprocessing
+import os
+import os.path as osp
+import shlex
+import subprocess
+
+from hpcbench.toolbox.contextlib_ext import pushd
+
+
+def thread_counts(limit=None):
+    """Get the numbers of threads usually tested by benchmarks:
+    powers of 2 up to a limit.
+
+    :param limit: maximum number of threads, default is the number
+    of CPUs of the current host
+    :rtype: list of int
+
+    >>> thread_counts(12)
+    [1, 2, 4, 8]
+    """
+    if limit is None:
+        limit = multiprocessing.cpu_count()
+    counts = []
+    count = 1
+    while count <= limit:
+        counts.append(count)
+        count *= 2
+    return counts
+
+
+def physical_memory():
+    """Get amount of physical memory of the current host
+
+    :return: memory size in bytes
+    :rtype: int
+    """
+    return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+
+def launcher_command(launcher, command, **kwargs):
+    """Prefix a command with a launcher, typically an MPI launcher
+
+    :param launcher: launcher command line, where ``{name}`` fields
+    are replaced by ``kwargs`` values,
+    ``mpirun -np {process_count}`` for instance
+    :param command: command to launch
+    :type command: list of string
+    :rtype: list of string
+
+    >>> launcher_command('srun -n {process_count}', ['a.out'],
+    ...                  process_count=4)
+    ['srun', '-n', '4', 'a.out']
+    """
+    return [
+        arg.format(**kwargs) for arg in shlex.split(launcher or '')
+    ] + list(command)
+
+
+def build_once(command, executable, build_root=osp.pardir):
+    """Compile an executable unless an identical build command already
+    did, and link it in the current directory.
+
+    Executables are kept in a subdirectory of ``build_root`` named
+    after a digest of the command, so that executions sharing the
+    same build configuration reuse the executable compiled by the
+    first one.
+
+    :param command: build command, writing ``executable`` in the
+    current directory
+    :type command: list of string
+    :param executable: name of the file written by ``command``
+    :param build_root: directory where executables are kept, default
+    is the parent of the current directory, shared by the executions
+    of a benchmark category
+    :return: path to the executable in the build directory
+    """
+    digest = hashlib.sha1(' '.join(command).encode('utf-8')).hexdigest()
+    build_dir = osp.abspath(osp.join(build_root, 'build-' + digest[:12]))
+    path = osp.join(build_dir, executable)
+    if not osp.exists(path):
+        if not osp.isdir(build_dir):
+            os.makedirs(build_dir)
+        with pushd(build_dir), open('build.log', 'w') as log:
+            subprocess.check_call(command, stdout=log,
+                                  stderr=subprocess.STDOUT)
+    if osp.lexists(executable):
+        os.remove(executable)
+    os.symlink(osp.relpath(path), executable)
+    return path
+
+
+def cache_sizes(cpu=0):
+    """Get sizes of the data and unified caches of a CPU, as
+    reported by Linux sysfs
+
+    :return: cache level -> size in bytes, empty if unknown
+    :rtype: dictionary
+    """
+    units = dict(K=1024, M=1024 ** 2, G=1024 ** 3)
+    sizes = {}
+    pattern = '/sys/devices/system/cpu/cpu%d/cache/index*' % cpu
+    for path in glob.glob(pattern):
+        try:
+            with open(osp.join(path, 'type')) as istr:
+                if istr.read().strip() == 'Instruction':
+                    continue
+            with open(osp.join(path, 'level')) as istr:
+                level = int(istr.read())
+            with open(osp.join(path, 'size')) as istr:
+                size = istr.read().strip()
+        except (IOError, ValueError):
+            continue
+        if size and size[-1] in units:
+            size = int(size[:-1]) * units[size[-1]]
+        else:
+            size = int(size)
+        sizes[level] = size
+    return sizes
@@ -0,0 +1,15 @@
+"""Extra tools for working with regular expressions
+"""
+import re
+
+
+def has_flags(regex, flags=0):
+    """Check if a compiled regular expression has flags, inline
+    ``(?i)`` for instance, other than the default ones
+
+    :param regex: compiled regular expression
+    :param flags: flags given to ``re.compile``
+    :rtype: bool
+    """
+    # default flags depend on the pattern type, str or bytes
+    return bool(regex.flags & ~re.compile(regex.pattern[:0], flags).flags)
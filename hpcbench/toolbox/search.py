@@ -0,0 +1,125 @@
+"""Adaptive search strategies over an ordered list of candidates
+
+Every strategy looks for a candidate index, evaluating as few candidates
+as possible. ``evaluate`` is a function taking a candidate index, and
+returning the value of the searched metric. Strategies may call it
+several times with the same index, results should be cached by the
+caller.
+"""
+import math
+
+MAXIMIZE = 'maximize'
+MINIMIZE = 'minimize'
+GOALS = frozenset([MAXIMIZE, MINIMIZE])
+
+# 1 / golden ratio
+INVERSE_PHI = (math.sqrt(5) - 1) / 2
+
+
+def improves(previous, value, goal=MAXIMIZE, tolerance=0.05):
+    """Tell whether a value is significantly better than the previous
+    one
+
+    :param goal: ``maximize`` or ``minimize``
+    :param tolerance: minimal relative improvement
+    :rtype: bool
+
+    >>> improves(100, 110)
+    True
+    >>> improves(100, 102)
+    False
+    >>> improves(100, 90, goal='minimize')
+    True
+    """
+    if goal == MAXIMIZE:
+        delta = value - previous
+    else:
+        delta = previous - value
+    return delta > tolerance * abs(previous)
+
+
+def bisection(evaluate, size, goal=MAXIMIZE, tolerance=0.05):
+    """Locate the saturation point of a metric, assuming that
+    candidates improve the metric up to this point, and not beyond.
+
+    :param evaluate: function index -> metric value
+    :param size: number of candidates
+    :return: index of the first candidate not improved by the next one
+    :rtype: int
+    """
+    low, high = 0, size - 1
+    while low < high:
+        middle = (low + high) // 2
+        if improves(evaluate(middle), evaluate(middle + 1), goal, tolerance):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def golden_section(evaluate, size, goal=MAXIMIZE, tolerance=0.05):
+    """Locate the best candidate of a unimodal metric
+
+    :param evaluate: function index -> metric value
+    :param size: number of candidates
+    :param tolerance: unused, for interface consistency
+    :return: index of the best candidate
+    :rtype: int
+    """
+    del tolerance  # unused
+
+    def _better(lhs, rhs):
+        if goal == MAXIMIZE:
+            return evaluate(lhs) >= evaluate(rhs)
+        return evaluate(lhs) <= evaluate(rhs)
+
+    low, high = 0, size - 1
+    while high - low > 2:
+        left = low + int(round((high - low) * (1 - INVERSE_PHI)))
+        right = low + int(round((high - low) * INVERSE_PHI))
+        if left == right:
+            right += 1
+        if _better(left, right):
+            high = right
+        else:
+            low = left
+    best = low
+    for index in range(low + 1, high + 1):
+        if not _better(best, index):
+            best = index
+    return best
+
+
+def refinement(evaluate, size, goal=MAXIMIZE, tolerance=0.05, points=5):
+    """Locate the saturation point of a metric by successive
+    refinements: the knee is looked for on a coarse grid of candidates,
+    then on a finer grid around it, until adjacent candidates are
+    evaluated.
+
+    :param evaluate: function index -> metric value
+    :param size: number of candidates
+    :param points: number of candidates of every grid
+    :return: index of the first candidate not improved by the next one
+    :rtype: int
+    """
+    low, high = 0, size - 1
+    while True:
+        step = max(1, (high - low) // (points - 1))
+        grid = list(range(low, high, step)) + [high]
+        position = len(grid) - 1
+        for i in range(len(grid) - 1):
+            if not improves(evaluate(grid[i]), evaluate(grid[i + 1]),
+                            goal, tolerance):
+                position = i
+                break
+        if step == 1:
+            return grid[position]
+        low = grid[max(position - 1, 0)]
+        high = grid[min(position + 1, len(grid) - 1)]
+
+
+STRATEGIES = dict(
+    bisection=bisection,
+    golden=golden_section,
+    refine=refinement,
+)
@@ -0,0 +1,203 @@
+"""Expand parameter sweeps described in campaign files
+
+A sweep is made of the following nodes:
+
+* a dictionary of parameter name -> values: the Cartesian product
+  of the values of every parameter, sorted by name. Values are:
+
+  - a list of values
+  - a ``range``: dictionary of ``start``, ``stop`` (inclusive) and
+    optional ``step`` (default is 1)
+  - a ``geometric`` series: dictionary of ``start``, ``stop``
+    (inclusive) and optional ``factor`` (default is 2)
+  - any other value, a single value
+
+* ``product``: the Cartesian product of a list of sweeps
+* ``zip``: the sweeps of a list, iterated in parallel. Iteration
+  stops with the shortest one.
+* ``chain``: the points of every sweep of a list, one after the other
+
+Every node may also provide an ``exclude`` list of ``kwargsql``
+expressions. Points matching any of them are skipped.
+
+For instance:
+
+.. code-block:: yaml
+
+    product:
+      - threads:
+          geometric: {start: 1, stop: 64}
+      - zip:
+          - block_size: [4K, 1M]
+          - mode: [rndrw, seqwr]
+    exclude:
+      - threads__gt: 16
+        block_size: 4K
+
+Points are generated lazily: only the current point of every node is
+kept in memory, whatever the size of the sweep.
+"""
+import six
+
+from hpcbench.toolbox.edsl import kwargsql
+
+OPERATORS = frozenset(['product', 'zip', 'chain'])
+SERIES = frozenset(['range', 'geometric'])
+
+
+def sweep(spec):
+    """Generate points of a sweep
+
+    :param spec: sweep description
+    :return: generator of dictionaries, parameter name -> value
+
+    >>> list(sweep(dict(a=[1, 2], b=3)))
+    [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]
+    """
+    if not spec:
+        return iter([{}])
+    return _Node.create(spec).points()
+
+
+def values(spec):
+    """Generate values of a single dimension of a sweep
+
+    :param spec: list of values, ``range``, or ``geometric`` series
+    description, or any other value
+    :return: generator of values
+
+    >>> list(values(dict(geometric=dict(start=1, stop=100, factor=4))))
+    [1, 4, 16, 64]
+    >>> list(values(dict(range=dict(start=2, stop=8, step=3))))
+    [2, 5, 8]
+    """
+    if isinstance(spec, dict) and len(spec) == 1 and set(spec) <= SERIES:
+        kind, bounds = next(iter(spec.items()))
+        if kind == 'range':
+            step = bounds.get('step', 1)
+            if not step > 0:
+                raise Exception('Sweep range step must be positive: %s' %
+                                (step,))
+            return _series(bounds['start'], bounds['stop'],
+                           lambda value: value + step)
+        factor = bounds.get('factor', 2)
+        if not factor > 1:
+            raise Exception('Sweep geometric factor must be greater '
+                            'than 1: %s' % (factor,))
+        if not bounds['start'] > 0:
+            raise Exception('Sweep geometric start must be positive: %s' %
+                            (bounds['start'],))
+        return _series(bounds['start'], bounds['stop'],
+                       lambda value: value * factor)
+    if isinstance(spec, (list, tuple)):
+        return iter(spec)
+    return iter([spec])
+
+
+def _series(start, stop, step):
+    value = start
+    # tolerance for accumulated floating point errors
+    epsilon = 1e-9 * abs(stop) if isinstance(stop, float) else 0
+    previous = None
+    while value <= stop + epsilon:
+        if value == previous:
+            raise Exception('Sweep series does not progress: %s' % value)
+        yield value
+        previous = value
+        value = step(value)
+
+
+class _Node(object):
+    """Node of a sweep, iterable several times"""
+    def __init__(self, exclude):
+        self.exclude = exclude or []
+
+    @classmethod
+    def create(cls, spec):
+        if not isinstance(spec, dict):
+            raise Exception('Invalid sweep: %r' % (spec,))
+        spec = dict(spec)
+        exclude = spec.pop('exclude', None)
+        operators = OPERATORS & set(spec)
+        if operators:
+            if len(spec) != 1:
+                raise Exception('Invalid sweep, unexpected keys: %s' %
+                                ' '.join(sorted(set(spec) - operators)))
+            operator, children = spec.popitem()
+            return _Operator(operator,
+                             [cls.create(child) for child in children],
+                             exclude)
+        return _Parameters(spec, exclude)
+
+    def points(self):
+        for point in self._points():
+            if not any(self._matches(point, condition)
+                       for condition in self.exclude):
+                yield point
+
+    @classmethod
+    def _matches(cls, point, condition):
+        """Evaluate an exclusion condition. Conditions on parameters
+        missing from the point are not fulfilled.
+        """
+        for expr in condition:
+            if expr.split('__', 1)[0] not in point:
+                return False
+        return kwargsql.and_(point, **condition)
+
+    def _points(self):
+        raise NotImplementedError
+
+
+class _Parameters(_Node):
+    """Cartesian product of parameter values"""
+    def __init__(self, parameters, exclude=None):
+        super(_Parameters, self).__init__(exclude)
+        self.names = sorted(parameters)
+        self.parameters = parameters
+
+    def _points(self):
+        return self._product(0, {})
+
+    def _product(self, index, point):
+        if index == len(self.names):
+            yield dict(point)
+            return
+        name = self.names[index]
+        for value in values(self.parameters[name]):
+            point[name] = value
+            for result in self._product(index + 1, point):
+                yield result
+
+
+class _Operator(_Node):
+    """Combination of sweeps"""
+    def __init__(self, operator, children, exclude=None):
+        super(_Operator, self).__init__(exclude)
+        self.operator = operator
+        self.children = children
+
+    def _points(self):
+        if self.operator == 'chain':
+            return (
+                point for child in self.children for point in child.points()
+            )
+        elif self.operator == 'zip':
+            return self._zip()
+        return self._product(0, {})
+
+    def _zip(self):
+        for points in six.moves.zip(*[c.points() for c in self.children]):
+            result = {}
+            for point in points:
+                result.update(point)
+            yield result
+
+    def _product(self, index, point):
+        if index == len(self.children):
+            yield dict(point)
+            return
+        for child_point in self.children[index].points():
+            child_point.update(point)
+            for result in self._product(index + 1, child_point):
+                yield result
@@ -23,6 +23,7 @@ setup(
     url='https://github.com/tristan0x/hpcbench',
     license=license,
     packages=find_packages(exclude=('tests', 'docs')),
+    include_package_data=True,
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Environment :: Console',
@@ -45,17 +46,42 @@ setup(
         'docopt==0.6.2',
         'elasticsearch==5.4.0',
         'matplotlib==2.0.2',
+        'numpy>=1.13',
         'PyYAML>=3.12',
         'six==1.10',
     ],
+    extras_require={
+        'parquet': ['pyarrow'],
+    },
     entry_points="""
         [console_scripts]
+        ben-diff = hpcbench.cli.bendiff:main
         ben-doc = hpcbench.cli.bendoc:main
         ben-elk = hpcbench.cli.benelk:main
+        ben-export = hpcbench.cli.benexport:main
+        ben-history = hpcbench.cli.benhistory:main
         ben-plot = hpcbench.cli.benplot:main
         ben-sh = hpcbench.cli.bensh:main
+        ben-tags = hpcbench.cli.bentags:main
         ben-umb = hpcbench.cli.benumb:main
         [hpcbench.benchmarks]
+        command = hpcbench.benchmark.command
+        fio = hpcbench.benchmark.fio
+        hpcg = hpcbench.benchmark.hpcg
+        hpl = hpcbench.benchmark.hpl
+        iperf3 = hpcbench.benchmark.iperf
+        mdtest = hpcbench.benchmark.mdtest
+        memlat = hpcbench.benchmark.memlat
+        osu = hpcbench.benchmark.osu
+        python = hpcbench.benchmark.python
+        stress-ng = hpcbench.benchmark.stress_ng
+        stream = hpcbench.benchmark.stream
         sysbench = hpcbench.benchmark.sysbench
+        [hpcbench.exporters]
+        csv = hpcbench.export.local
+        elasticsearch = hpcbench.export.es
+        ndjson = hpcbench.export.local
+        openmetrics = hpcbench.export.openmetrics
+        parquet = hpcbench.export.local
     """
 )
@@ -1,3 +1,4 @@
+import glob
 import inspect
 import os
 import os.path as osp
@@ -6,6 +7,7 @@ import yaml
 from six import with_metaclass
 from abc import ABCMeta, abstractmethod
 
+from hpcbench import arrays
 from hpcbench.api import (
     Benchmark,
     MetricsExtractor,
@@ -42,12 +44,51 @@ class AbstractBenchmarkTest(with_metaclass(ABCMeta, object)):
         """
         raise NotImplementedError
 
-    def create_sample_run(self, category):
+    def get_metas(self, category):
+        """
+        :return: metas of the sample run
+        :rtype: dictionary
+        """
+        return dict()
+
+    def get_attributes(self):
+        """
+        :return: attributes of the tested benchmark instances,
+        ``None`` to keep the default ones
+        :rtype: dictionary
+        """
+        return None
+
+    def create_benchmark(self):
+        """
+        :return: instance of the tested benchmark class
+        """
+        benchmark = self.get_benchmark_clazz()()
+        attributes = self.get_attributes()
+        if attributes is not None:
+            benchmark.attributes = attributes
+        return benchmark
+
+    def get_sample_prefix(self):
+        """
+        :return: path prefix of the sample outputs files,
+        default is the path to the test module without extension.
+        """
         pyfile = inspect.getfile(self.__class__)
-        for output in ['stdout', 'stderr']:
-            out = osp.splitext(pyfile)[0] + '.' + category + '.' + output
-            if osp.isfile(out):
-                shutil.copy(out, output + '.txt')
+        return osp.splitext(pyfile)[0]
+
+    def create_sample_run(self, category):
+        """Copy sample outputs of a category in the current directory.
+        ``<prefix>.<category>.stdout`` and ``.stderr`` files provide the
+        standard outputs, other ``<prefix>.<category>.<file>``
+        files are copied as ``<file>``.
+        """
+        prefix = self.get_sample_prefix() + '.' + category + '.'
+        for path in glob.glob(prefix + '*'):
+            output = path[len(prefix):]
+            if output in ['stdout', 'stderr']:
+                output += '.txt'
+            shutil.copy(path, output)
 
     def test_class_has_name(self):
         clazz_name = self.get_benchmark_clazz().name
@@ -77,13 +118,21 @@ class AbstractBenchmarkTest(with_metaclass(ABCMeta, object)):
                 )
             with pushd('sample-run'):
                 self.create_sample_run(category)
-                clazz = self.get_benchmark_clazz()
-                benchmark = clazz()
+                benchmark = self.create_benchmark()
                 with open(YAML_REPORT_FILE, 'w') as ostr:
-                    yaml.dump(dict(category=category), ostr)
+                    yaml.dump(
+                        dict(
+                            category=category,
+                            metas=self.get_metas(category)
+                        ),
+                        ostr
+                    )
                 md = MetricsDriver('test-category', benchmark)
                 report = md()
-                parsed_metrics = report.get('metrics', {})
+                # array metrics are read from their sidecar files
+                parsed_metrics = arrays.resolve(
+                    report.get('metrics', {}), arrays.values
+                )
                 expected_metrics = {
                         category: [
                             self.get_expected_metrics(category)
@@ -96,13 +145,12 @@ class AbstractBenchmarkTest(with_metaclass(ABCMeta, object)):
         assert isinstance(clazz.description, str)
 
     def test_execution_matrix(self):
-        clazz = self.get_benchmark_clazz()
-        benchmark = clazz()
+        benchmark = self.create_benchmark()
         exec_matrix = benchmark.execution_matrix
         exec_matrix = list(exec_matrix)
         assert isinstance(exec_matrix, list)
 
-        run_keys = {'category', 'command', 'metas'}
+        run_keys = {'category', 'command', 'metas', 'environment'}
         for runs in exec_matrix:
             assert isinstance(runs, dict)
             assert 'category' in runs
@@ -113,12 +161,14 @@ class AbstractBenchmarkTest(with_metaclass(ABCMeta, object)):
             assert runs['command']
             for arg in runs['command']:
                 assert isinstance(arg, str)
+            for name, value in runs.get('environment', {}).items():
+                assert isinstance(name, str)
+                assert isinstance(value, str)
             keys = set(runs.keys())
             assert keys.issubset(run_keys)
 
     def test_metrics_extractors(self):
-        clazz = self.get_benchmark_clazz()
-        benchmark = clazz()
+        benchmark = self.create_benchmark()
         all_extractors = benchmark.metrics_extractors
         assert isinstance(all_extractors, dict)
         for name, extractors in all_extractors.items():
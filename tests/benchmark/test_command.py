@@ -0,0 +1,104 @@
+import sys
+import unittest
+
+from hpcbench.benchmark.command import (
+    Command,
+    RegexExtractor,
+)
+from hpcbench.toolbox.contextlib_ext import mkdtemp
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestCommand(AbstractBenchmarkTest, unittest.TestCase):
+    ATTRIBUTES = dict(
+        command='solver --cells {cells} --threads {threads}',
+        parameters=dict(
+            cells=[65536, 262144],
+            threads=[1, 4],
+        ),
+        environment=dict(OMP_NUM_THREADS='{threads}'),
+        metrics=dict(
+            performance=dict(
+                match=r'^Performance:\s+([0-9.]+)', unit='Gflops'
+            ),
+            time=dict(match=r'^Elapsed time:\s+([0-9.]+)', unit='s'),
+            iterations=dict(match=r'^Converged in (\d+)', type='int'),
+            version=dict(match=r'^Solver (\S+)', type='str'),
+        ),
+        category='main',
+    )
+
+    def get_benchmark_clazz(self):
+        return Command
+
+    def get_attributes(self):
+        return self.ATTRIBUTES
+
+    def get_expected_metrics(self, category):
+        return dict(
+            performance=41.7,
+            time=12.48,
+            iterations=2,
+            version='v2.1',
+        )
+
+    def get_benchmark_categories(self):
+        return ['main']
+
+    def test_execution_matrix_grid(self):
+        benchmark = self.create_benchmark()
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 4)
+        self.assertEqual(
+            executions[1],
+            dict(
+                category='main',
+                command=['solver', '--cells', '65536', '--threads', '4'],
+                environment=dict(OMP_NUM_THREADS='4'),
+                metas=dict(cells=65536, threads=4),
+            )
+        )
+
+    def test_invalid_metrics(self):
+        with self.assertRaises(Exception):
+            RegexExtractor(dict(foo=dict(match=r'foo')))
+        with self.assertRaises(Exception):
+            RegexExtractor(dict(foo=dict(match=r'(f)(o)')))
+        with self.assertRaises(Exception):
+            RegexExtractor(dict(foo=dict(match=r'(f)', type='complex')))
+
+    def test_combined_expressions(self):
+        # inline flags, named groups, back-references, and
+        # expressions matching the same text
+        extractor = RegexExtractor(dict(
+            performance=dict(match=r'(?i)^performance:\s+([0-9.]+)'),
+            value=dict(match=r'^Performance:\s+([0-9]+)', type='int'),
+            unit=dict(match=r'^Performance: [0-9.]+ (\S+)', type='str'),
+            step=dict(match=r'^step (?P<step>\d+)', type='int'),
+            twice=dict(match=r'^(\w+) \1$', type='str'),
+        ))
+        self.assertEqual(len(extractor._regexes), 4)
+        with mkdtemp() as path:
+            with open(extractor.stdout(path), 'w') as ostr:
+                ostr.write('step 1\nstep 2\nok ok\n'
+                           'Performance: 41.7 GFlop/s\n')
+            self.assertEqual(
+                extractor.extract(path, {}),
+                dict(performance=41.7, value=41, unit='GFlop/s', step=1,
+                     twice='ok')
+            )
+
+    def test_missing_command(self):
+        with self.assertRaises(Exception):
+            list(Command().execution_matrix)
+
+    def test_single_command(self):
+        benchmark = Command()
+        benchmark.attributes = dict(
+            command=[sys.executable, '-c', 'print(42)'],
+            metrics=dict(answer=dict(match=r'^(\d+)$', type='int')),
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(executions[0]['metas'], {})
+        self.assertEqual(set(benchmark.metrics_extractors), {'command'})
@@ -0,0 +1,40 @@
+import unittest
+
+from hpcbench.benchmark.fio import Fio
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestFio(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Fio
+
+    def get_expected_metrics(self, category):
+        return dict(
+            read_bandwidth=170666.0,
+            read_iops=42666.533333,
+            read_clat_p50=733.184,
+            read_clat_p95=1073.152,
+            read_clat_p99=1236.992,
+            read_clat_p99_9=1843.2,
+        )
+
+    def get_benchmark_categories(self):
+        return ['io']
+
+    def test_execution_matrix_sweep(self):
+        benchmark = Fio()
+        benchmark.attributes = dict(
+            target='/scratch',
+            rw=['randrw'],
+            block_size=['4k', '64k'],
+            iodepth=[1, 8, 64],
+            numjobs=[1, 4],
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 12)
+        for execution in executions:
+            self.assertIn('--directory=/scratch', execution['command'])
+            self.assertIn('--output-format=json', execution['command'])
+        # mixed workloads are plotted in both directions
+        self.assertEqual(len(benchmark.plots['io']), 2 * 2 * 2)
+        self.assertEqual(benchmark.estimated_duration(executions[0]), 30.0)
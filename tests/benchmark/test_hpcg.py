@@ -0,0 +1,40 @@
+import unittest
+
+from hpcbench.benchmark.hpcg import HPCG
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestHPCG(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return HPCG
+
+    def get_expected_metrics(self, category):
+        return dict(
+            gflops=7.45213,
+            time=61.7423,
+            residual=0.00395638,
+            passed=True,
+        )
+
+    def get_benchmark_categories(self):
+        return ['hpcg']
+
+    def test_input_file(self):
+        benchmark = HPCG()
+        benchmark.attributes = dict(
+            process_count=[2, 4],
+            domain=[32, 32, 64],
+            runtime=10,
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 2)
+        self.assertEqual(benchmark.estimated_duration(executions[0]), 10.0)
+        with mkdtemp() as path, pushd(path):
+            benchmark.pre_execute(executions[1])
+            with open('hpcg.dat') as istr:
+                lines = istr.read().splitlines()
+        self.assertEqual(lines[2:], ['32 32 64', '10'])
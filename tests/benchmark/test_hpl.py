@@ -0,0 +1,68 @@
+import unittest
+
+from hpcbench.benchmark.hpl import HPL
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestHPL(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return HPL
+
+    def get_expected_metrics(self, category):
+        return dict(
+            gflops=53.043,
+            time=312.45,
+            residual=0.0028564,
+            passed=True,
+        )
+
+    def get_benchmark_categories(self):
+        return ['linpack']
+
+    def test_process_grids(self):
+        self.assertEqual(HPL.process_grids(16), [(4, 4), (2, 8), (1, 16)])
+        self.assertEqual(HPL.process_grids(6), [(2, 3), (1, 6)])
+        self.assertEqual(HPL.process_grids(7), [(1, 7)])
+
+    def test_default_input(self):
+        benchmark = HPL()
+        benchmark.attributes = dict(process_count=12)
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 1)
+        metas = executions[0]['metas']
+        self.assertEqual((metas['P'], metas['Q']), (3, 4))
+        self.assertEqual(metas['NB'], 192)
+        self.assertGreater(metas['N'], 0)
+        self.assertEqual(metas['N'] % 192, 0)
+        self.assertEqual(executions[0]['command'][-3:],
+                         ['-np', '12', 'xhpl'])
+        with mkdtemp() as path, pushd(path):
+            benchmark.pre_execute(executions[0])
+            with open('HPL.dat') as istr:
+                lines = [line.split()[0] for line in istr][4:12]
+        self.assertEqual(
+            lines,
+            ['1', str(metas['N']), '1', '192', '0', '1', '3', '4']
+        )
+
+    def test_search(self):
+        benchmark = HPL()
+        benchmark.attributes = dict(
+            process_count=4,
+            problem_size=10000,
+            search=True,
+            search_block_size=[128, 256],
+        )
+        self.assertEqual(
+            [
+                (execution['metas']['NB'], execution['metas']['P'],
+                 execution['metas']['Q'], execution['metas']['N'])
+                for execution in benchmark.execution_matrix
+            ],
+            [(128, 2, 2, 10000), (128, 1, 4, 10000),
+             (256, 2, 2, 10000), (256, 1, 4, 10000)]
+        )
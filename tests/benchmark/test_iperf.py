@@ -0,0 +1,94 @@
+import os
+import os.path as osp
+import stat
+import sys
+from textwrap import dedent
+import unittest
+
+from hpcbench.benchmark.iperf import Iperf
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+FAKE_SERVER = dedent("""\
+    #!{python}
+    import socket
+    import sys
+
+    port = int(sys.argv[sys.argv.index('--port') + 1])
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(('127.0.0.1', port))
+    server.listen(1)
+    print('Server listening on %d' % port)
+    sys.stdout.flush()
+    while True:
+        server.accept()[0].close()
+""")
+
+
+class TestIperf(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Iperf
+
+    def get_expected_metrics(self, category):
+        return dict(
+            sent_throughput=42357560858.74,
+            received_throughput=42356224547.29,
+            retransmits=3,
+            local_cpu=99.73121,
+            remote_cpu=71.480263,
+        )
+
+    def get_benchmark_categories(self):
+        return ['tcp']
+
+    def test_sweep(self):
+        benchmark = Iperf()
+        benchmark.attributes = dict(
+            server='node02',
+            parallel=[1, 4],
+            window=[None, '1M'],
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 4)
+        self.assertEqual(
+            executions[3]['command'],
+            [
+                'iperf3', '--client', 'node02', '--port', '5201',
+                '--parallel', '4', '--time', '10', '--json',
+                '--window', '1M',
+            ]
+        )
+        self.assertEqual(
+            executions[3]['metas'],
+            dict(server='node02', parallel=4, window='1M')
+        )
+        self.assertFalse(benchmark.starts_server)
+
+    def test_loopback_server(self):
+        with mkdtemp() as path, pushd(path):
+            executable = osp.join(path, 'fake-iperf3')
+            with open(executable, 'w') as ostr:
+                ostr.write(FAKE_SERVER.format(python=sys.executable))
+            os.chmod(executable, stat.S_IRWXU)
+            benchmark = Iperf()
+            benchmark.attributes = dict(
+                executable=executable,
+                port=15201,
+                parallel=[1],
+            )
+            self.assertTrue(benchmark.starts_server)
+            execution = next(iter(benchmark.execution_matrix))
+            self.assertEqual(execution['command'][2], '127.0.0.1')
+            benchmark.pre_execute(execution)
+            server = benchmark._server
+            self.assertIsNone(server.poll())
+            benchmark.post_execute(execution)
+            self.assertIsNotNone(server.poll())
+            self.assertIsNone(benchmark._server)
+            with open(Iperf.SERVER_LOG) as istr:
+                self.assertIn('listening', istr.read())
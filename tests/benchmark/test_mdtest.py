@@ -0,0 +1,80 @@
+import os
+import subprocess
+import unittest
+
+from hpcbench.benchmark.mdtest import (
+    Mdtest,
+    MdtestExtractor,
+    tree_directories,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestMdtest(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Mdtest
+
+    def get_expected_metrics(self, category):
+        return dict(
+            directory_creation=31852.403,
+            directory_stat=412385.951,
+            directory_removal=24120.870,
+            file_creation=38457.210,
+            file_stat=398014.352,
+            file_removal=45981.035,
+            tree_creation=2891.448,
+            tree_removal=1412.307,
+        )
+
+    def get_benchmark_categories(self):
+        return ['metadata']
+
+    def test_tree_directories(self):
+        directories = tree_directories('root', 3, 2, 2)
+        self.assertEqual(len(directories), 7)
+        self.assertEqual(directories[0], 'root/mdtest_tree.3.0')
+        self.assertEqual(
+            directories[-1],
+            'root/mdtest_tree.3.0/mdtest_tree.3.2/mdtest_tree.3.6'
+        )
+
+    def test_mdtest_command(self):
+        benchmark = Mdtest()
+        benchmark.attributes = dict(
+            executable='mdtest',
+            directory='/scratch/hpcbench',
+            process_count=[4],
+            branching=[10],
+        )
+        execution = next(iter(benchmark.execution_matrix))
+        self.assertEqual(
+            execution['command'],
+            [
+                'mpirun', '-np', '4', 'mdtest', '-u', '-n', '1000',
+                '-b', '10', '-z', '1', '-i', '1', '-d', '/scratch/hpcbench',
+            ]
+        )
+
+    def test_python_stressor(self):
+        benchmark = Mdtest()
+        benchmark.attributes = dict(
+            process_count=[2],
+            branching=[2],
+            items=50,
+            iterations=2,
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 1)
+        with mkdtemp() as path, pushd(path):
+            with open('stdout.txt', 'w') as ostr:
+                subprocess.check_call(executions[0]['command'], stdout=ostr)
+            metrics = MdtestExtractor().extract(os.getcwd(),
+                                                executions[0]['metas'])
+            self.assertEqual(sorted(os.listdir(path)), ['stdout.txt'])
+        self.assertEqual(set(metrics), set(MdtestExtractor().metrics))
+        for value in metrics.values():
+            self.assertGreater(value, 0)
@@ -0,0 +1,80 @@
+from distutils.spawn import find_executable
+import glob
+import os
+import os.path as osp
+import subprocess
+import unittest
+
+from hpcbench.benchmark.memlat import (
+    Memlat,
+    MemlatExtractor,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestMemlat(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Memlat
+
+    def get_expected_metrics(self, category):
+        return dict(
+            size=[4096, 6144, 8192, 32768, 65536, 524288, 1048576,
+                  8388608, 33554432, 134217728],
+            latency=[1.102, 1.101, 1.104, 1.120, 3.841, 4.207, 6.932,
+                     14.380, 38.664, 91.025],
+        )
+
+    def get_benchmark_categories(self):
+        return ['latency']
+
+    def test_working_set_sizes(self):
+        self.assertEqual(
+            Memlat.working_set_sizes(4096, 65536),
+            [4096, 6144, 8192, 12288, 16384, 24576, 32768, 49152, 65536]
+        )
+        self.assertEqual(Memlat.working_set_sizes(5000, 7000), [6144])
+
+    def test_execution_matrix(self):
+        benchmark = Memlat()
+        benchmark.attributes = dict(
+            min_size=1024,
+            max_size=4096,
+            accesses=1000,
+            cflags=['-O1', '-O2'],
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 2)
+        self.assertEqual(
+            executions[0]['command'],
+            ['./memlat', '1000', '1024', '1536', '2048', '3072', '4096']
+        )
+        self.assertEqual(executions[1]['metas']['cflags'], '-O2')
+
+    @unittest.skipIf(find_executable('cc') is None, 'no C compiler')
+    def test_bundled_source(self):
+        benchmark = Memlat()
+        benchmark.attributes = dict(
+            min_size=4096,
+            max_size=65536,
+            accesses=10000,
+        )
+        execution = next(iter(benchmark.execution_matrix))
+        with mkdtemp() as path, pushd(path):
+            for run_dir in ['run1', 'run0']:
+                with pushd(run_dir, mkdir=True):
+                    benchmark.pre_execute(execution)
+            # run directories share the same executable
+            self.assertEqual(len(glob.glob(osp.join(path, 'build-*'))), 1)
+            os.chdir('run0')
+            with open('stdout.txt', 'w') as ostr:
+                subprocess.check_call(execution['command'], stdout=ostr)
+            metrics = MemlatExtractor().extract(os.getcwd(),
+                                                execution['metas'])
+        self.assertEqual(metrics['size'],
+                         Memlat.working_set_sizes(4096, 65536))
+        for value in metrics['latency']:
+            self.assertGreater(value, 0)
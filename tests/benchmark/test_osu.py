@@ -0,0 +1,84 @@
+from distutils.spawn import find_executable
+import os
+import subprocess
+import unittest
+
+from hpcbench.benchmark.osu import OSU
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestOSU(AbstractBenchmarkTest, unittest.TestCase):
+    _expected_metrics = dict(
+        latency=dict(
+            size=[0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024],
+            latency=[0.23, 0.25, 0.25, 0.25, 0.26, 0.27, 0.30, 0.31,
+                     0.41, 0.45, 0.54, 0.70],
+        ),
+        bandwidth=dict(
+            size=[1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024],
+            bandwidth=[5.67, 11.43, 22.91, 45.88, 90.02, 176.54, 341.28,
+                       612.30, 1120.69, 1981.27, 3312.48],
+        ),
+        allreduce=dict(
+            size=[4, 8, 16, 32, 64, 128, 256, 512, 1024],
+            latency=[1.03, 1.01, 1.05, 1.12, 1.19, 1.38, 1.72, 2.05, 2.84],
+        ),
+    )
+
+    def get_benchmark_clazz(self):
+        return OSU
+
+    def get_expected_metrics(self, category):
+        return self._expected_metrics[category]
+
+    def get_benchmark_categories(self):
+        return ['latency', 'bandwidth', 'allreduce']
+
+    def test_launcher(self):
+        benchmark = OSU()
+        benchmark.attributes = dict(
+            launcher='srun -n {process_count} --mpi=pmi2',
+            process_count=[2, 8],
+            path='/opt/osu/bin',
+        )
+        self.assertEqual(
+            [execution['command'] for execution in
+             benchmark.execution_matrix],
+            [
+                ['srun', '-n', '2', '--mpi=pmi2', '/opt/osu/bin/osu_latency'],
+                ['srun', '-n', '2', '--mpi=pmi2', '/opt/osu/bin/osu_bw'],
+                ['srun', '-n', '2', '--mpi=pmi2',
+                 '/opt/osu/bin/osu_allreduce'],
+                ['srun', '-n', '8', '--mpi=pmi2',
+                 '/opt/osu/bin/osu_allreduce'],
+            ]
+        )
+
+    @unittest.skipIf(
+        find_executable('mpirun') is None or
+        find_executable('osu_latency') is None,
+        'Open MPI or OSU micro-benchmarks not installed'
+    )
+    def test_localhost(self):
+        benchmark = OSU()
+        benchmark.attributes = dict(
+            tests=['latency'],
+            launcher='mpirun --oversubscribe -np {process_count}',
+            options='-m 1:64',
+        )
+        env = dict(os.environ)
+        env.update(OMPI_ALLOW_RUN_AS_ROOT='1',
+                   OMPI_ALLOW_RUN_AS_ROOT_CONFIRM='1')
+        execution = next(iter(benchmark.execution_matrix))
+        with mkdtemp() as path, pushd(path):
+            with open('stdout.txt', 'w') as ostr:
+                subprocess.check_call(execution['command'], stdout=ostr,
+                                      env=env)
+            extractor = benchmark.metrics_extractors['latency']
+            metrics = extractor.extract(path, execution['metas'])
+        self.assertEqual(metrics['size'], [1, 2, 4, 8, 16, 32, 64])
+        self.assertEqual(len(metrics['latency']), 7)
@@ -0,0 +1,60 @@
+import json
+import subprocess
+import unittest
+
+from hpcbench.benchmark.python import (
+    autorange,
+    measure,
+    Python,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestPython(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Python
+
+    def get_expected_metrics(self, category):
+        return dict(
+            best=0.0125,
+            median=0.0131,
+            loops=20,
+            repeat=5,
+            rate=5368709120.0,
+        )
+
+    def get_benchmark_categories(self):
+        return ['memcpy']
+
+    def get_metas(self, category):
+        return dict(size=67108864)
+
+    def test_autorange(self):
+        calls = []
+        loops, _ = autorange(lambda: calls.append(None), 0.0)
+        self.assertEqual(loops, 1)
+        results = measure(lambda: None, repeat=4, min_time=0.001)
+        self.assertEqual(results['repeat'], 4)
+        self.assertGreaterEqual(results['median'], results['best'])
+
+    def test_worker(self):
+        benchmark = Python()
+        benchmark.attributes = dict(
+            workloads=dict(
+                memcpy=dict(
+                    callable='hpcbench.benchmark.python_workloads.memcpy',
+                    params=[dict(size=1024)],
+                ),
+            ),
+            repeat=3,
+            min_time=0.01,
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(executions[0]['metas'], dict(size=1024))
+        output = subprocess.check_output(executions[0]['command'])
+        results = json.loads(output.decode('utf-8'))
+        self.assertEqual(results['repeat'], 3)
+        self.assertEqual(
+            set(results), {'best', 'median', 'loops', 'repeat', 'rate'}
+        )
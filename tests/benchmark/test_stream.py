@@ -0,0 +1,78 @@
+from distutils.spawn import find_executable
+import glob
+import os
+import os.path as osp
+import subprocess
+import unittest
+
+from hpcbench.benchmark.stream import (
+    Stream,
+    StreamExtractor,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestStream(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return Stream
+
+    def get_expected_metrics(self, category):
+        return dict(
+            copy_bandwidth=21443.5,
+            scale_bandwidth=14875.2,
+            add_bandwidth=16526.9,
+            triad_bandwidth=16612.4,
+        )
+
+    def get_benchmark_categories(self):
+        return ['bandwidth']
+
+    def test_build_flags_sweep(self):
+        benchmark = Stream()
+        benchmark.attributes = dict(
+            cflags=['-O2', '-O3 -march=native'],
+            threads=[1, 2],
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(
+            [
+                (execution['metas']['cflags'],
+                 execution['environment']['OMP_NUM_THREADS'])
+                for execution in executions
+            ],
+            [('-O2', '1'), ('-O2', '2'),
+             ('-O3 -march=native', '1'), ('-O3 -march=native', '2')]
+        )
+        command = benchmark.build_command(executions[-1]['metas'])
+        self.assertEqual(command[:3], ['cc', '-O3', '-march=native'])
+        self.assertIn('-DSTREAM_ARRAY_SIZE=10000000', command)
+        self.assertEqual(len(benchmark.plots['bandwidth']), 2)
+
+    @unittest.skipIf(find_executable('cc') is None, 'no C compiler')
+    def test_bundled_source(self):
+        benchmark = Stream()
+        benchmark.attributes = dict(
+            array_size=[100000],
+            ntimes=3,
+            cflags=['-O2'],
+            threads=[1],
+        )
+        execution = next(iter(benchmark.execution_matrix))
+        with mkdtemp() as path, pushd(path):
+            for run_dir in ['run1', 'run0']:
+                with pushd(run_dir, mkdir=True):
+                    benchmark.pre_execute(execution)
+            # run directories share the same executable
+            self.assertEqual(len(glob.glob(osp.join(path, 'build-*'))), 1)
+            os.chdir('run0')
+            with open('stdout.txt', 'w') as ostr:
+                subprocess.check_call(execution['command'], stdout=ostr)
+            metrics = StreamExtractor().extract(os.getcwd(),
+                                                execution['metas'])
+        self.assertEqual(set(metrics), set(StreamExtractor().metrics))
+        for value in metrics.values():
+            self.assertGreater(value, 0)
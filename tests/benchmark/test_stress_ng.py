@@ -0,0 +1,43 @@
+import unittest
+
+from hpcbench.benchmark.stress_ng import StressNg
+from . benchmark import AbstractBenchmarkTest
+
+
+class TestStressNg(AbstractBenchmarkTest, unittest.TestCase):
+    def get_benchmark_clazz(self):
+        return StressNg
+
+    def get_expected_metrics(self, category):
+        return dict(
+            bogo_ops=9316.0,
+            bogo_ops_per_second=931.422011,
+            bogo_ops_per_second_usr_sys=231.893367,
+            wall_clock_time=10.001911,
+        )
+
+    def get_benchmark_categories(self):
+        return ['cpu']
+
+    def get_metas(self, category):
+        return dict(stressor=category, method='matrixprod', workers=4)
+
+    def test_stressors_sweep(self):
+        benchmark = StressNg()
+        benchmark.attributes = dict(
+            stressors=dict(cpu=['fft'], pipe=None),
+            workers=[1, 8],
+            timeout=30,
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(
+            [execution['command'][1:4] for execution in executions],
+            [
+                ['--cpu', '1', '--cpu-method=fft'],
+                ['--cpu', '8', '--cpu-method=fft'],
+                ['--pipe', '1', '--timeout'],
+                ['--pipe', '8', '--timeout'],
+            ]
+        )
+        self.assertEqual(set(benchmark.metrics_extractors), {'cpu', 'pipe'})
+        self.assertEqual(benchmark.estimated_duration(executions[0]), 30.0)
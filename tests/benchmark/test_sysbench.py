@@ -4,21 +4,167 @@ from hpcbench.benchmark.sysbench import Sysbench
 from . benchmark import AbstractBenchmarkTest
 
 
-
 class TestSysbench(AbstractBenchmarkTest, unittest.TestCase):
+    """Extract metrics from sysbench 0.4 outputs"""
     _expected_metrics = dict(
-        minimum=0.03,
-        average=0.03,
-        maximum=0.19,
-        percentile95=0.04,
-        total_time=0.0876,
+        cpu=dict(
+            minimum=0.03,
+            average=0.03,
+            maximum=0.19,
+            percentile95=0.04,
+            total_time=0.0876,
+        ),
+        memory=dict(
+            minimum=0.0,
+            average=0.0,
+            maximum=0.05,
+            percentile95=0.0,
+            total_time=0.8828,
+            operations_rate=1187766.67,
+            bandwidth=1159.93,
+        ),
+        fileio=dict(
+            minimum=0.01,
+            average=0.36,
+            maximum=84.41,
+            percentile95=0.04,
+            total_time=6.265,
+            requests_rate=10460.67,
+            throughput=163.45,
+        ),
+        threads=dict(
+            minimum=0.22,
+            average=0.41,
+            maximum=4.12,
+            percentile95=0.61,
+            total_time=2.0734,
+        ),
+        mutex=dict(
+            minimum=42.14,
+            average=43.48,
+            maximum=44.81,
+            percentile95=10000000.0,
+            total_time=0.0452,
+        ),
     )
 
     def get_benchmark_clazz(self):
         return Sysbench
 
     def get_expected_metrics(self, category):
-        return self._expected_metrics
+        return self._expected_metrics[category]
 
     def get_benchmark_categories(self):
-        return ['cpu']
+        return ['cpu', 'memory', 'fileio', 'threads', 'mutex']
+
+    def test_thread_sweep(self):
+        benchmark = Sysbench()
+        threads = benchmark.threads
+        self.assertEqual(threads[0], 1)
+        for prev, thread in zip(threads, threads[1:]):
+            self.assertEqual(thread, 2 * prev)
+        benchmark.attributes = dict(threads=[3, 5])
+        self.assertEqual(
+            sorted(set(
+                execution['metas']['thread']
+                for execution in benchmark.execution_matrix
+            )),
+            [3, 5]
+        )
+
+    def test_default_features(self):
+        categories = set(
+            execution['category']
+            for execution in Sysbench().execution_matrix
+        )
+        self.assertEqual(categories, {'cpu'})
+
+    def test_default_attributes(self):
+        benchmark = Sysbench()
+        benchmark.attributes['features'].append('memory')
+        self.assertEqual(Sysbench().attribute('features'), ['cpu'])
+        benchmark.attributes = dict()
+        self.assertEqual(benchmark.attribute('max_prime'), [30])
+
+    def test_memory_matrix(self):
+        benchmark = Sysbench()
+        benchmark.attributes = dict(
+            features=['memory'],
+            threads=[1],
+            memory_block_size=['4K', '1M'],
+        )
+        self.assertEqual(
+            [
+                (execution['metas']['access_mode'],
+                 execution['metas']['block_size'])
+                for execution in benchmark.execution_matrix
+            ],
+            [('seq', 4096), ('seq', 1048576),
+             ('rnd', 4096), ('rnd', 1048576)]
+        )
+
+    def test_fileio_scratch_dir(self):
+        benchmark = Sysbench()
+        benchmark.attributes = dict(
+            features=['fileio'],
+            threads=[2],
+            scratch_dir='/scratch/my dir',
+        )
+        executions = list(benchmark.execution_matrix)
+        self.assertEqual(
+            [execution['metas']['test_mode'] for execution in executions],
+            ['seqwr', 'rndrw']
+        )
+        command = executions[0]['command']
+        self.assertEqual(command[:2], ['sh', '-c'])
+        self.assertIn("mktemp -d '/scratch/my dir'/sysbench", command[2])
+        for step in ['prepare', 'run', 'cleanup']:
+            self.assertIn('--file-test-mode=seqwr ' + step, command[2])
+
+
+class TestSysbenchV1(TestSysbench):
+    """Extract metrics from sysbench 1.x outputs"""
+    _expected_metrics = dict(
+        cpu=dict(
+            minimum=0.0,
+            average=0.01,
+            maximum=4.04,
+            percentile95=0.01,
+            total_time=10.0001,
+        ),
+        memory=dict(
+            minimum=0.0,
+            average=0.0,
+            maximum=0.04,
+            percentile95=0.0,
+            total_time=0.6695,
+            operations_rate=1563487.51,
+            bandwidth=1526.84,
+        ),
+        fileio=dict(
+            minimum=0.0,
+            average=0.69,
+            maximum=36.31,
+            percentile95=2.43,
+            total_time=10.0187,
+            requests_rate=1534.21 + 1022.80,
+            throughput=23.97 + 15.98,
+        ),
+        threads=dict(
+            minimum=0.21,
+            average=0.48,
+            maximum=5.87,
+            percentile95=0.68,
+            total_time=10.0004,
+        ),
+        mutex=dict(
+            minimum=203.10,
+            average=205.44,
+            maximum=208.75,
+            percentile95=207.82,
+            total_time=0.2107,
+        ),
+    )
+
+    def get_sample_prefix(self):
+        return super(TestSysbenchV1, self).get_sample_prefix() + '_v1'
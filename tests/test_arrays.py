@@ -0,0 +1,185 @@
+import json
+import os
+import os.path as osp
+import socket
+import sys
+from textwrap import dedent
+import unittest
+
+import numpy as np
+
+from hpcbench import arrays
+from hpcbench.api import (
+    ArrayMetric,
+    Benchmark,
+    MetricsExtractor,
+)
+from hpcbench.cli import (
+    benexport,
+    benplot,
+    bensh,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+
+
+class HistogramExtractor(MetricsExtractor):
+    @property
+    def metrics(self):
+        return dict(
+            latency=ArrayMetric('us', float),
+            histogram=ArrayMetric('', int, shape=(None, 2)),
+        )
+
+    def extract(self, outdir, metas):
+        with open(self.stdout(outdir)) as istr:
+            latency = [float(value) for value in istr.read().split()]
+        return dict(
+            latency=latency,
+            histogram=np.array([[1, 10], [2, 20], [3, 30]]),
+        )
+
+
+class HistogramBenchmark(Benchmark):
+    name = 'histogram'
+
+    description = '''
+        fake benchmark for array metrics testing purpose
+    '''
+
+    @property
+    def execution_matrix(self):
+        yield dict(
+            category='main',
+            command=[
+                sys.executable, '-c',
+                'print(" ".join(str(i) for i in range(1, 101)))'
+            ],
+            metas=dict(),
+        )
+
+    @property
+    def metrics_extractors(self):
+        return dict(main=HistogramExtractor())
+
+    @property
+    def plots(self):
+        return dict(main=[
+            dict(
+                name='{hostname} {category} latency',
+                series=dict(metas=[], metrics=['main__latency']),
+                plotter=self.plot_latency,
+            )
+        ])
+
+    @classmethod
+    def plot_latency(cls, plt, description, metas, metrics):
+        for latency in metrics['main__latency']:
+            assert isinstance(latency, np.memmap)
+            plt.plot(latency)
+
+
+class TestArrayMetric(unittest.TestCase):
+    def test_accepts(self):
+        metric = ArrayMetric('us', float)
+        self.assertEqual(metric.shape, (None,))
+        self.assertEqual(metric.dtype, np.dtype(float))
+        self.assertTrue(metric.accepts([1.0, 2.0]))
+        self.assertTrue(metric.accepts([1, 2]))
+        self.assertTrue(metric.accepts([]))
+        self.assertTrue(metric.accepts(np.zeros(3, dtype=np.float32)))
+        self.assertFalse(metric.accepts(['a']))
+        self.assertFalse(metric.accepts([[1.0]]))
+        self.assertFalse(metric.accepts(1.0))
+        self.assertFalse(ArrayMetric('B', int).accepts([1.5]))
+
+    def test_shape(self):
+        metric = ArrayMetric('', int, shape=(None, 2))
+        self.assertTrue(metric.accepts([[1, 2], [3, 4], [5, 6]]))
+        self.assertFalse(metric.accepts([[1, 2, 3]]))
+        self.assertFalse(metric.accepts([1, 2]))
+
+
+class TestArrays(unittest.TestCase):
+    def test_save(self):
+        with mkdtemp() as path, pushd(path):
+            reference = arrays.save(
+                'main', 'latency', list(range(1, 101)),
+                ArrayMetric('us', float)
+            )
+            self.assertTrue(arrays.is_reference(reference))
+            self.assertEqual(reference['array'], 'main.latency.npy')
+            self.assertEqual(reference['dtype'], 'float64')
+            self.assertEqual(reference['shape'], [100])
+            self.assertEqual(reference['summary']['min'], 1.0)
+            self.assertEqual(reference['summary']['median'], 50.5)
+            self.assertAlmostEqual(reference['summary']['p99'], 99.01)
+            self.assertEqual(reference['summary']['max'], 100.0)
+            array = arrays.load(reference)
+            self.assertIsInstance(array, np.memmap)
+            self.assertEqual(array[-1], 100.0)
+
+    def test_empty(self):
+        with mkdtemp() as path, pushd(path):
+            reference = arrays.save('main', 'latency', [],
+                                    ArrayMetric('us', float))
+            self.assertEqual(reference['summary'], {})
+            self.assertEqual(arrays.values(reference), [])
+
+    def test_resolve(self):
+        with mkdtemp() as path, pushd(path):
+            os.mkdir('run')
+            reference = arrays.save('main', 'size', [1, 2],
+                                    ArrayMetric('B', int), outdir='run')
+            data = dict(metrics=dict(main=dict(
+                size=arrays.relocate(reference, 'run'),
+                time=1.0,
+            )))
+            self.assertEqual(
+                arrays.resolve(data, arrays.values),
+                dict(metrics=dict(main=dict(size=[1, 2], time=1.0)))
+            )
+            self.assertEqual(
+                arrays.resolve(data, arrays.summarize)['metrics']['main']
+                ['size']['max'],
+                2.0
+            )
+
+
+class TestArrayCampaign(unittest.TestCase):
+    def test_campaign(self):
+        with mkdtemp() as path, pushd(path):
+            campaign_file = osp.join(path, 'campaign.yaml')
+            with open(campaign_file, 'w') as ostr:
+                ostr.write(dedent("""\
+                benchmarks:
+                  '*':
+                    test01:
+                      type: histogram
+                """))
+            driver = bensh.main(campaign_file)
+            benplot.main(driver.campaign_path)
+            category_dir = osp.join(
+                path, driver.campaign_path, socket.gethostname(),
+                '*', 'test01', 'main'
+            )
+            with open(osp.join(category_dir, 'metrics.json')) as istr:
+                run = json.load(istr)[0]
+            reference = run['metrics']['main']['latency']
+            self.assertEqual(
+                reference['array'], osp.join(run['id'], 'main.latency.npy')
+            )
+            self.assertTrue(osp.isfile(osp.join(category_dir,
+                                                reference['array'])))
+            self.assertTrue(any(f.endswith('.png')
+                                for f in os.listdir(category_dir)))
+            ndjson_file = osp.join(path, 'runs.ndjson')
+            benexport.main(['-o', ndjson_file, driver.campaign_path])
+            with open(ndjson_file) as istr:
+                run = json.loads(istr.readline())
+            self.assertEqual(run['metrics']['main']['latency'],
+                             [float(i) for i in range(1, 101)])
+            self.assertEqual(run['metrics']['main']['histogram'],
+                             [[1, 10], [2, 20], [3, 30]])
@@ -0,0 +1,58 @@
+import os.path as osp
+import re
+import unittest
+
+from hpcbench.campaign import (
+    from_file,
+    TagsIndex,
+)
+from hpcbench.cli import bentags
+from hpcbench.toolbox.contextlib_ext import capture_stdout
+
+
+class TestTagsIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.campaign = from_file(osp.splitext(__file__)[0] + '.yaml')
+
+    def test_nodes_expansion(self):
+        self.assertEqual(len(self.campaign.network.nodes), 514)
+        self.assertEqual(self.campaign.network.nodes[0], 'srv001')
+
+    def test_get(self):
+        tags_index = self.campaign.network.tags_index
+        self.assertEqual(tags_index.get('srv001'), {'cpu', 'all'})
+        self.assertEqual(tags_index.get('srv256'), {'all'})
+        self.assertEqual(tags_index.get('gpu-srv01'), {'gpu', 'all'})
+        self.assertEqual(tags_index.get('unknown'), set())
+        # patterns are anchored at the beginning of the hostname
+        self.assertEqual(tags_index.get('my-gpu-srv01'), {'all'})
+
+    def test_patterns_with_groups(self):
+        tags_index = self.campaign.network.tags_index
+        self.assertEqual(tags_index.get('ib-ib'), {'loopback'})
+
+    def test_patterns_with_flags(self):
+        tags_index = TagsIndex(
+            dict(
+                upper=[dict(match=re.compile('(?i)SRV0'))],
+                lower=[dict(match=re.compile('srv0'))],
+            ),
+            ['srv001', 'SRV001']
+        )
+        self.assertEqual(tags_index.get('srv001'), {'upper', 'lower'})
+        # flags do not apply to other patterns
+        self.assertEqual(tags_index.get('SRV001'), {'upper'})
+
+    def test_matrix(self):
+        with capture_stdout() as stdout:
+            bentags.main([osp.splitext(__file__)[0] + '.yaml'])
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0].split(), ['node', 'all', 'cpu', 'gpu',
+                                            'loopback'])
+        self.assertEqual(lines[1].split(), ['srv001', 'x', 'x'])
+        self.assertEqual(len(lines), 515)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+
+from hpcbench.api import Benchmark
+from hpcbench.derived import (
+    Columns,
+    DerivedMetric,
+    Expression,
+    get_derived_metrics,
+)
+
+
+def make_runs():
+    runs = []
+    for threads in [1, 2, 4]:
+        for mode in ['seq', 'rnd']:
+            runs.append(dict(
+                metas=dict(threads=threads, mode=mode, ops=1000),
+                metrics=dict(cpu=dict(
+                    total_time=10.0 / threads * (2 if mode == 'rnd' else 1)
+                )),
+            ))
+    # failed run
+    runs.append(dict(metas=dict(threads=8, mode='seq', ops=1000),
+                     metrics=dict()))
+    return runs
+
+
+class DerivedBenchmark(Benchmark):
+    name = 'derived'
+
+    description = '''
+        fake benchmark for derived metrics testing purpose
+    '''
+
+    @property
+    def execution_matrix(self):
+        return []
+
+    @property
+    def metrics_extractors(self):
+        return dict()
+
+    @property
+    def plots(self):
+        return dict()
+
+    @property
+    def derived_metrics(self):
+        return dict(cpu=dict(
+            throughput=dict(
+                expression='metas.ops / cpu__total_time',
+                unit='ops/s',
+            ),
+            rate='cpu__throughput / 1000',
+        ))
+
+
+class TestExpression(unittest.TestCase):
+    def evaluate(self, source, reference=None):
+        return list(Expression(source).evaluate(
+            Columns(make_runs(), reference)
+        ))
+
+    def test_arithmetic(self):
+        values = self.evaluate('metas.ops / cpu__total_time')
+        self.assertEqual(values[:6], [100, 50, 200, 100, 400, 200])
+        self.assertNotEqual(values[6], values[6])  # NaN
+
+    def test_functions(self):
+        self.assertEqual(
+            self.evaluate('log2(metas.threads)')[:6],
+            [0, 0, 1, 1, 2, 2]
+        )
+        self.assertEqual(
+            self.evaluate('cpu__total_time / min(cpu__total_time)')[:2],
+            [4.0, 8.0]
+        )
+        self.assertEqual(
+            self.evaluate('where(metas.threads > 1, 1, 0)'),
+            [0, 0, 1, 1, 1, 1, 1]
+        )
+
+    def test_reference(self):
+        values = self.evaluate(
+            'ref.cpu__total_time / cpu__total_time',
+            reference=dict(threads=1)
+        )
+        self.assertEqual(values[:6], [1, 1, 2, 2, 4, 4])
+        self.assertNotEqual(values[6], values[6])
+
+    def test_variables(self):
+        self.assertEqual(
+            Expression('ref.cpu__a / (cpu__b + metas.c)').variables,
+            set([(True, 'cpu', 'a'), (False, 'cpu', 'b'),
+                 (False, 'metas', 'c')])
+        )
+
+    def test_rejected(self):
+        for source in [
+                '__import__("os")',
+                'cpu__a.__class__',
+                'foo',
+                '"string"',
+                'lambda: 0',
+                'cpu__a if cpu__b else 0',
+                '[cpu__a]',
+                'cpu__a +',
+        ]:
+            with self.assertRaises(Exception):
+                Expression(source)
+
+
+class TestDerivedMetric(unittest.TestCase):
+    def test_evaluate(self):
+        runs = make_runs()
+        derived = DerivedMetric('cpu', 'throughput', dict(
+            expression='metas.ops / cpu__total_time',
+            unit='ops/s',
+        ))
+        self.assertEqual(derived.metric.unit, 'ops/s')
+        derived.evaluate(runs)
+        self.assertEqual(runs[0]['metrics']['cpu']['throughput'], 100.0)
+        self.assertIsInstance(runs[0]['metrics']['cpu']['throughput'],
+                              float)
+        # metric of the failed run is not set
+        self.assertEqual(runs[6]['metrics'], dict())
+
+    def test_dependencies(self):
+        benchmark = DerivedBenchmark()
+        derived = get_derived_metrics(benchmark, dict(), 'cpu')
+        self.assertEqual([d.name for d in derived], ['throughput', 'rate'])
+        runs = make_runs()
+        for metric in derived:
+            metric.evaluate(runs)
+        self.assertEqual(runs[0]['metrics']['cpu']['rate'], 0.1)
+
+    def test_campaign_override(self):
+        config = dict(derived=dict(cpu=dict(
+            rate='cpu__throughput',
+            time='cpu__total_time * 1000'
+        )))
+        derived = get_derived_metrics(DerivedBenchmark(), config, 'cpu')
+        self.assertEqual(
+            [d.expression.source for d in derived],
+            ['metas.ops / cpu__total_time',
+             'cpu__total_time * 1000',
+             'cpu__throughput']
+        )
+        self.assertEqual(get_derived_metrics(DerivedBenchmark(),
+                                             config, 'mem'), [])
+
+    def test_circular_dependency(self):
+        config = dict(derived=dict(cpu=dict(a='cpu__b', b='cpu__a')))
+        with self.assertRaises(Exception):
+            get_derived_metrics(DerivedBenchmark(), config, 'cpu')
@@ -0,0 +1,156 @@
+import json
+import os.path as osp
+import unittest
+
+from hpcbench.cli import (
+    bendiff,
+    bensh,
+)
+from hpcbench.diff import (
+    Comparison,
+    mann_whitney,
+    rank,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    capture_stdout,
+    mkdtemp,
+    pushd,
+)
+
+from .test_driver import FakeBenchmark  # noqa
+
+
+def make_runs(times, bandwidths):
+    return [
+        dict(
+            hostname='srv01', tag='*', suite='test01', category='main',
+            benchmark='fake', metas=dict(threads=4),
+            metrics=dict(main=dict(time=time, bandwidth=bandwidth)),
+        )
+        for time, bandwidth in zip(times, bandwidths)
+    ]
+
+
+BASE = make_runs([10.0, 10.2, 9.9, 10.1, 10.0], [100, 101, 99, 100, 102])
+SLOWER = make_runs([12.0, 12.1, 11.9, 12.2, 12.0], [100, 99, 101, 100, 102])
+UNITS = dict(main=dict(time='s', bandwidth='MB/s'))
+
+
+class TestStatistics(unittest.TestCase):
+    def test_rank(self):
+        self.assertEqual(list(rank([3, 1, 2, 2])), [4.0, 1.0, 2.5, 2.5])
+
+    def test_mann_whitney(self):
+        # same as scipy.stats.mannwhitneyu, two-sided with continuity
+        self.assertAlmostEqual(
+            mann_whitney([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), 0.0122, 4
+        )
+        self.assertEqual(mann_whitney([1, 2, 3], [1, 2, 3]), 1.0)
+        self.assertEqual(mann_whitney([1, 1], [1, 1]), 1.0)
+
+
+class TestComparison(unittest.TestCase):
+    def test_regression(self):
+        verdict = Comparison()(BASE, SLOWER, UNITS)
+        self.assertEqual(verdict['verdict'], 'fail')
+        self.assertEqual(verdict['regressions'], 1)
+        self.assertEqual(verdict['unchanged'], 1)
+        time = [c for c in verdict['comparisons']
+                if c['metric'] == 'main__time'][0]
+        self.assertEqual(time['status'], 'regression')
+        self.assertEqual(time['direction'], 'lower')
+        self.assertTrue(time['significant'])
+        self.assertAlmostEqual(time['change'], 0.1992, 4)
+        self.assertGreater(time['ci'][0], 0)
+        self.assertLess(time['p_value'], 0.05)
+        self.assertEqual(time['metas'], dict(threads=4))
+
+    def test_improvement(self):
+        verdict = Comparison()(SLOWER, BASE, UNITS)
+        self.assertEqual(verdict['verdict'], 'pass')
+        self.assertEqual(verdict['improvements'], 1)
+
+    def test_direction(self):
+        config = dict(metrics={'main__t*': dict(direction='higher')})
+        verdict = Comparison(config)(BASE, SLOWER, UNITS)
+        self.assertEqual(verdict['improvements'], 1)
+        self.assertEqual(verdict['regressions'], 0)
+        with self.assertRaises(Exception):
+            Comparison(dict(metrics=dict(time=dict(direction='up'))))
+
+    def test_threshold(self):
+        verdict = Comparison(dict(threshold=0.25))(BASE, SLOWER, UNITS)
+        self.assertEqual(verdict['verdict'], 'pass')
+
+    def test_few_samples(self):
+        # statistical tests are skipped, only the threshold matters
+        verdict = Comparison()(BASE[:2], SLOWER[:2], UNITS)
+        time = [c for c in verdict['comparisons']
+                if c['metric'] == 'main__time'][0]
+        self.assertIsNone(time['p_value'])
+        self.assertIsNone(time['significant'])
+        self.assertEqual(time['status'], 'regression')
+
+    def test_zero_base_mean(self):
+        base = make_runs([10.0] * 5, [0] * 5)
+        new = make_runs([10.0] * 5, [3, 4, 5, 3, 4])
+        config = dict(metrics=dict(main__bandwidth=dict(direction='lower')))
+        verdict = Comparison(config)(base, new, UNITS)
+        self.assertEqual(verdict['regressions'], 1)
+        bandwidth = [c for c in verdict['comparisons']
+                     if c['metric'] == 'main__bandwidth'][0]
+        self.assertIsNone(bandwidth['change'])
+        self.assertEqual(bandwidth['difference'], 3.8)
+        self.assertTrue(bandwidth['significant'])
+        self.assertGreater(bandwidth['ci'][0], 0)
+        # unchanged null values
+        verdict = Comparison(config)(base, base, UNITS)
+        self.assertEqual(verdict['unchanged'], 2)
+
+    def test_alignment(self):
+        other = make_runs([10.0], [100.0])
+        other[0]['metas'] = dict(threads=8)
+        verdict = Comparison()(BASE, other)
+        self.assertEqual(verdict['comparisons'], [])
+        self.assertEqual(len(verdict['missing']), 2)
+        self.assertEqual(len(verdict['added']), 2)
+        self.assertEqual(verdict['added'][0]['metas'], dict(threads=8))
+
+
+class TestBenDiff(unittest.TestCase):
+    def test_ndjson(self):
+        with mkdtemp() as path, pushd(path):
+            for name, runs in [('base', BASE), ('new', SLOWER)]:
+                with open(name + '.ndjson', 'w') as ostr:
+                    for run in runs:
+                        ostr.write(json.dumps(dict(index=dict())) + '\n')
+                        ostr.write(json.dumps(run) + '\n')
+            with open('diff.yaml', 'w') as ostr:
+                ostr.write('metrics:\n  main__time:\n    direction: lower\n')
+            status = bendiff.main([
+                '-c', 'diff.yaml', '-o', 'verdict.json',
+                'base.ndjson', 'new.ndjson'
+            ])
+            self.assertEqual(status, bendiff.EXIT_REGRESSION)
+            with open('verdict.json') as istr:
+                verdict = json.load(istr)
+            self.assertEqual(verdict['regressions'], 1)
+            status = bendiff.main(['-o', 'verdict.json', '--threshold',
+                                   '0.5', 'base.ndjson', 'new.ndjson'])
+            self.assertEqual(status, 0)
+
+    def test_campaign_directories(self):
+        campaign_file = osp.join(osp.dirname(__file__), 'test_driver.yaml')
+        with mkdtemp() as path, pushd(path):
+            driver = bensh.main(campaign_file)
+            with capture_stdout() as stdout:
+                status = bendiff.main([driver.campaign_path,
+                                       driver.campaign_path])
+            self.assertEqual(status, 0)
+        verdict = json.loads(stdout.getvalue())
+        self.assertEqual(verdict['verdict'], 'pass')
+        self.assertEqual(verdict['unchanged'], 6)
+        self.assertEqual(
+            set(c['metric'] for c in verdict['comparisons']),
+            set(['main__performance', 'main__standard_error'])
+        )
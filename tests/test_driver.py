@@ -1,3 +1,4 @@
+import csv
 import json
 import os
 import os.path as osp
@@ -7,6 +8,7 @@ import sys
 import tempfile
 from textwrap import dedent
 import unittest
+import warnings
 from cached_property import cached_property
 
 from hpcbench.api import (
@@ -14,13 +16,22 @@ from hpcbench.api import (
     Metric,
     MetricsExtractor,
 )
+from hpcbench.benchmark.hpl import HPL
+from hpcbench.driver import ExecutionDriver
+from hpcbench.plan import (
+    Plan,
+    PLAN_FILE,
+)
+from hpcbench.scaling import Scaling
 from hpcbench.toolbox.contextlib_ext import (
     capture_stdout,
+    mkdtemp,
     pushd,
 )
 from hpcbench.cli import (
     bendoc,
     benelk,
+    benexport,
     benplot,
     bensh,
     benumb,
@@ -53,7 +64,7 @@ class FakeBenchmark(Benchmark):
         fake benchmark for HPCBench testing purpose
     '''
 
-    def pre_execute(self):
+    def pre_execute(self, execution):
         with open('test.py', 'w') as ostr:
             ostr.write(dedent("""\
             from __future__ import print_function
@@ -120,6 +131,272 @@ class TestFakeBenchmark(AbstractBenchmarkTest, unittest.TestCase):
         return ['main']
 
 
+class SaturatingBenchmark(Benchmark):
+    """Benchmark whose performance stops improving at 12 threads"""
+    name = 'saturating'
+
+    description = '''
+        fake benchmark for adaptive search testing purpose
+    '''
+
+    @property
+    def execution_matrix(self):
+        for mode in ['a', 'b']:
+            for thread in range(1, 65):
+                performance = min(thread, 12) * (10 if mode == 'a' else 1)
+                yield dict(
+                    category='main',
+                    command=[
+                        sys.executable, '-c',
+                        'print(%s); print(0.0)' % performance
+                    ],
+                    metas=dict(thread=thread, mode=mode),
+                )
+
+    @property
+    def metrics_extractors(self):
+        return dict(main=FakeExtractor())
+
+    @property
+    def plots(self):
+        return dict(main=[])
+
+
+class TestAdaptiveSearch(unittest.TestCase):
+    def run_search(self, method):
+        with mkdtemp() as path, pushd(path):
+            campaign_file = osp.join(path, 'campaign.yaml')
+            with open(campaign_file, 'w') as ostr:
+                ostr.write(dedent("""\
+                benchmarks:
+                  '*':
+                    test01:
+                      type: saturating
+                      search:
+                        main:
+                          dimension: thread
+                          metric: main__performance
+                          method: {}
+                """.format(method)))
+            driver = bensh.main(campaign_file)
+            category_dir = osp.join(
+                path, driver.campaign_path, socket.gethostname(),
+                '*', 'test01', 'main'
+            )
+            with open(osp.join(category_dir, 'search.json')) as istr:
+                search = json.load(istr)
+            with open(osp.join(category_dir, 'metrics.json')) as istr:
+                runs = json.load(istr)
+        return search, runs
+
+    def test_bisection(self):
+        search, runs = self.run_search('bisection')
+        self.assertEqual(len(search['results']), 2)
+        for result, mode in zip(search['results'], ['a', 'b']):
+            self.assertEqual(result['value'], 12)
+            self.assertEqual(result['metas'], dict(thread=12, mode=mode))
+            self.assertEqual(result['candidates'], 64)
+        self.assertEqual(
+            len(runs),
+            sum(result['executions'] for result in search['results'])
+        )
+        self.assertLess(len(runs), 32)
+
+    def test_refine(self):
+        search, _ = self.run_search('refine')
+        self.assertEqual(
+            [result['value'] for result in search['results']], [12, 12]
+        )
+
+
+class ScalableBenchmark(Benchmark):
+    """Benchmark whose duration stops decreasing at 4 threads"""
+    name = 'scalable'
+
+    description = '''
+        fake benchmark for scaling studies testing purpose
+    '''
+
+    def __init__(self):
+        super(ScalableBenchmark, self).__init__(
+            attributes=dict(threads=[1], size=[100])
+        )
+
+    @property
+    def execution_matrix(self):
+        for threads in self.attributes['threads']:
+            for size in self.attributes['size']:
+                duration = float(size) / min(threads, 4) / 100
+                yield dict(
+                    category='main',
+                    command=[
+                        sys.executable, '-c',
+                        'print(%s); print(0.0)' % duration
+                    ],
+                    metas=dict(threads=threads, size=size),
+                )
+
+    @property
+    def metrics_extractors(self):
+        return dict(main=FakeExtractor())
+
+    @property
+    def plots(self):
+        return dict(main=[])
+
+
+class TestScaling(unittest.TestCase):
+    def run_study(self, mode):
+        with mkdtemp() as path, pushd(path):
+            campaign_file = osp.join(path, 'campaign.yaml')
+            with open(campaign_file, 'w') as ostr:
+                ostr.write(dedent("""\
+                benchmarks:
+                  '*':
+                    test01:
+                      type: scalable
+                      scaling:
+                        attribute: threads
+                        ladder:
+                          geometric: {{start: 1, stop: 8}}
+                        mode: {}
+                        metric: main__performance
+                        problem:
+                          attribute: size
+                          size: 100
+                      derived:
+                        main:
+                          rate:
+                            expression: metas.size / main__performance
+                            unit: items/s
+                """.format(mode)))
+            driver = bensh.main(campaign_file)
+            benplot.main(driver.campaign_path)
+            category_dir = osp.join(
+                path, driver.campaign_path, socket.gethostname(),
+                '*', 'test01', 'main'
+            )
+            with open(osp.join(category_dir, 'metrics.json')) as istr:
+                runs = json.load(istr)
+            with open(osp.join(category_dir, 'units.json')) as istr:
+                units = json.load(istr)
+            self.assertEqual(units['main']['rate'], 'items/s')
+            self.assertEqual(units['main']['performance'], 'm')
+            self.assertEqual(
+                len([f for f in os.listdir(category_dir)
+                     if f.endswith('.png')]),
+                1
+            )
+        runs = sorted(runs, key=lambda run: run['metas']['threads'])
+        self.assertEqual(
+            [run['metrics']['main']['rate'] for run in runs],
+            [run['metas']['size'] / run['metrics']['main']['performance']
+             for run in runs]
+        )
+        return (
+            [run['metas'] for run in runs],
+            [run['metrics']['scaling'] for run in runs]
+        )
+
+    def test_strong(self):
+        metas, metrics = self.run_study('strong')
+        self.assertEqual(
+            metas,
+            [dict(threads=threads, size=100) for threads in [1, 2, 4, 8]]
+        )
+        self.assertEqual(
+            [m['speedup'] for m in metrics], [1.0, 2.0, 4.0, 4.0]
+        )
+        self.assertEqual(
+            [m['efficiency'] for m in metrics], [1.0, 1.0, 1.0, 0.5]
+        )
+
+    def test_weak(self):
+        metas, metrics = self.run_study('weak')
+        self.assertEqual(
+            [meta['size'] for meta in metas], [100, 200, 400, 800]
+        )
+        self.assertEqual(
+            [m['speedup'] for m in metrics], [1.0, 2.0, 4.0, 4.0]
+        )
+        self.assertEqual(
+            [m['efficiency'] for m in metrics], [1.0, 1.0, 1.0, 0.5]
+        )
+
+
+    def test_scalar_attribute(self):
+        scaling = Scaling(dict(
+            attribute='process_count', ladder=[1, 2, 4],
+            metric='hpl__gflops', goal='maximize',
+        ))
+        self.assertEqual(
+            [
+                execution['metas']['process_count']
+                for execution in scaling.execution_matrix(HPL())
+            ],
+            [1, 2, 4]
+        )
+
+    def test_null_values(self):
+        scaling = Scaling(dict(
+            attribute='threads', ladder=[1, 2], metric='main__time',
+        ))
+        runs = [
+            dict(metas=dict(threads=threads),
+                 metrics=dict(main=dict(time=time)))
+            for threads, time in [(1, 2.0), (2, 0.0)]
+        ]
+        scaling.derive_metrics(runs)
+        self.assertEqual(runs[0]['metrics']['scaling']['speedup'], 1.0)
+        self.assertNotIn('scaling', runs[1]['metrics'])
+
+
+class TestExecutionHooks(unittest.TestCase):
+    class LegacyBenchmark(FakeBenchmark):
+        name = 'legacy-hooks'
+
+        def __init__(self):
+            super(TestExecutionHooks.LegacyBenchmark, self).__init__()
+            self.calls = []
+
+        def pre_execute(self):
+            self.calls.append('pre')
+
+        def post_execute(self, *args):
+            self.calls.append(args)
+
+    def test_legacy_signature(self):
+        benchmark = self.LegacyBenchmark()
+        execution = dict(category='main', command=['true'])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            ExecutionDriver.call_hook(benchmark.pre_execute, execution)
+        self.assertEqual(caught[0].category, DeprecationWarning)
+        ExecutionDriver.call_hook(benchmark.post_execute, execution)
+        self.assertEqual(benchmark.calls, ['pre', (execution,)])
+
+
+class TestUnknownBenchmarkTypes(unittest.TestCase):
+    def test_report_all_unknown_types(self):
+        with mkdtemp() as path, pushd(path):
+            campaign_file = osp.join(path, 'campaign.yaml')
+            with open(campaign_file, 'w') as ostr:
+                ostr.write(dedent("""\
+                benchmarks:
+                  '*':
+                    test01:
+                      type: unknown01
+                    test02:
+                      type: fake
+                    test03:
+                      type: unknown02
+                """))
+            with self.assertRaises(NameError) as exc:
+                bensh.main(campaign_file)
+            self.assertIn('unknown01, unknown02', str(exc.exception))
+            self.assertEqual(os.listdir(path), ['campaign.yaml'])
+
+
 class TestDriver(unittest.TestCase):
     @staticmethod
     def get_campaign_file():
@@ -175,6 +452,8 @@ class TestDriver(unittest.TestCase):
             bendoc.main(TestDriver.CAMPAIGN_PATH)
         content = stdout.getvalue()
         self.assertTrue(content)
+        self.assertIn('Summary of metrics', content)
+        self.assertIn(r'main\_\_performance', content)
 
     def test_05_es_dump(self):
         # Push documents to Elasticsearch
@@ -191,6 +470,119 @@ class TestDriver(unittest.TestCase):
             # Cleanup
             exporter.remove_index()
 
+    def test_06_local_export(self):
+        ndjson_file = osp.join(TestDriver.TEST_DIR, 'runs.ndjson')
+        benexport.main(['-o', ndjson_file, TestDriver.CAMPAIGN_PATH])
+        with open(ndjson_file) as istr:
+            runs = [json.loads(line) for line in istr]
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(
+            sorted(run['metrics']['main']['performance'] for run in runs),
+            [10.0, 50.0, 100.0]
+        )
+
+        csv_file = osp.join(TestDriver.TEST_DIR, 'runs.csv')
+        benexport.main(['-t', 'csv', '-o', csv_file,
+                        TestDriver.CAMPAIGN_PATH])
+        with open(csv_file) as istr:
+            rows = list(csv.DictReader(istr))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            sorted(float(row['metrics.main.performance']) for row in rows),
+            [10.0, 50.0, 100.0]
+        )
+
+    def test_07_parquet_export(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise unittest.SkipTest('pyarrow is not installed')
+        parquet_file = osp.join(TestDriver.TEST_DIR, 'runs.parquet')
+        benexport.main(['-t', 'parquet', '-o', parquet_file,
+                        TestDriver.CAMPAIGN_PATH])
+        table = pyarrow.parquet.read_table(parquet_file).to_pydict()
+        self.assertEqual(
+            sorted(table['metrics.main.performance']),
+            [10.0, 50.0, 100.0]
+        )
+
+    def test_08_openmetrics_textfile(self):
+        # textfile is updated after every run by ben-sh
+        textfile = osp.join(TestDriver.TEST_DIR, 'hpcbench.prom')
+        with open(textfile) as istr:
+            content = istr.read()
+        self.assertEqual(content.count('hpcbench_main_performance{'), 3)
+        self.assertTrue(content.endswith('# EOF\n'))
+
+    def test_09_plan(self):
+        plan = Plan.load(osp.join(TestDriver.CAMPAIGN_PATH, PLAN_FILE))
+        self.assertEqual(len(plan), 3)
+        # run directories are named after plan identifiers
+        category_dir = osp.join(
+            TestDriver.CAMPAIGN_PATH,
+            socket.gethostname(),
+            '*',
+            'test01',
+            'main',
+        )
+        self.assertEqual(
+            sorted(execution['id'] for execution in plan),
+            sorted(
+                entry for entry in os.listdir(category_dir)
+                if osp.isdir(osp.join(category_dir, entry))
+            )
+        )
+        # identifiers are stable across plan compilations
+        with pushd(TestDriver.TEST_DIR):
+            driver = bensh.main(['--dry-run', self.get_campaign_file()])
+        self.assertEqual(
+            [execution['id'] for execution in driver.plan],
+            [execution['id'] for execution in plan],
+        )
+
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(cls.TEST_DIR)
+
+
+class TestDryRun(unittest.TestCase):
+    def test_print_plan(self):
+        campaign_file = osp.splitext(__file__)[0] + '.yaml'
+        with mkdtemp() as path, pushd(path):
+            with capture_stdout() as stdout:
+                driver = bensh.main(['-n', campaign_file])
+            self.assertEqual(os.listdir(path), [])
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        for execution, line in zip(driver.plan, lines):
+            self.assertTrue(line.startswith(execution['id'] + ' '))
+            self.assertIn('/*/test01/main ? ', line)
+        self.assertEqual(
+            lines[-1],
+            '3 executions, estimated duration 0:00:00, 3 unknown'
+        )
+
+
+class TestPlanLimit(unittest.TestCase):
+    def test_max_executions(self):
+        with mkdtemp() as path, pushd(path):
+            campaign_file = osp.join(path, 'campaign.yaml')
+            with open(campaign_file, 'w') as ostr:
+                ostr.write(dedent("""\
+                max_executions: 100
+                benchmarks:
+                  '*':
+                    test01:
+                      type: command
+                      attributes:
+                        command: echo {a} {b} {c}
+                        parameters:
+                          a: {range: {start: 1, stop: 1000}}
+                          b: {range: {start: 1, stop: 1000}}
+                          c: {range: {start: 1, stop: 1000}}
+                        metrics:
+                          a: {match: '^(\\d+)'}
+                """))
+            with self.assertRaises(Exception) as exc:
+                bensh.main(['-n', campaign_file])
+            self.assertIn('max_executions: 100', str(exc.exception))
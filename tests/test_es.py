@@ -0,0 +1,32 @@
+import unittest
+
+from hpcbench.export.es import ESExporter
+
+
+class TestMapping(unittest.TestCase):
+    def test_dict_mapping(self):
+        run = dict(
+            id='42',
+            date='2018-01-01T00:00:00',
+            metas=dict(threads=4),
+            metrics=dict(main=dict(
+                gflops=41.7,
+                passed=True,
+                latency=[1.0, 2.0],
+                version='v2.1',
+            )),
+        )
+        mapping = ESExporter._get_dict_mapping('hpl', run)['hpl']
+        properties = mapping['properties']
+        self.assertEqual(properties['date'], dict(type='date'))
+        self.assertEqual(properties['metas']['properties'],
+                         dict(threads=dict(type='long')))
+        self.assertEqual(
+            properties['metrics']['properties']['main']['properties'],
+            dict(
+                gflops=dict(type='float'),
+                passed=dict(type='boolean'),
+                latency=dict(type='float'),
+                version=dict(type='text'),
+            )
+        )
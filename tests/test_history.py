@@ -0,0 +1,132 @@
+import json
+import os.path as osp
+import unittest
+
+import numpy as np
+
+from hpcbench import history
+from hpcbench.cli import (
+    benhistory,
+    bensh,
+    benumb,
+)
+from hpcbench.history import (
+    ChangePointDetector,
+    cusum,
+    e_divisive,
+)
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+
+from .test_driver import FakeBenchmark  # noqa
+
+
+def make_values(*levels):
+    random = np.random.RandomState(1)
+    values = []
+    for level in levels:
+        values.extend(level + random.normal(0, 0.1, 10))
+    return values
+
+
+def make_records(values, threads=4):
+    return [
+        dict(
+            campaign='hpcbench-%02d' % i,
+            date='2018-01-%02dT00:00:00' % (i + 1),
+            hostname='srv01', tag='*', suite='test01', benchmark='fake',
+            category='main', metas=dict(threads=threads),
+            metric='main__time', count=5, mean=value, stddev=0.1,
+            median=value, min=value, max=value,
+        )
+        for i, value in enumerate(values)
+    ]
+
+
+class TestChangePoints(unittest.TestCase):
+    def test_e_divisive(self):
+        self.assertEqual(
+            [index for index, _ in e_divisive(make_values(10, 11, 10.5))],
+            [10, 20]
+        )
+        change_points = e_divisive(make_values(10, 11))
+        self.assertEqual(change_points[0][0], 10)
+        self.assertLess(change_points[0][1], 0.05)
+        self.assertEqual(e_divisive(make_values(10, 10)), [])
+        self.assertEqual(e_divisive([1.0] * 10), [])
+        self.assertEqual(e_divisive([1.0, 2.0]), [])
+
+    def test_cusum(self):
+        self.assertEqual(cusum(make_values(10, 11, 10.5)), [10, 20])
+        self.assertEqual(cusum(make_values(10, 10)), [])
+        self.assertEqual(cusum([1.0] * 10), [])
+        self.assertEqual(cusum([1, 1, 1, 2, 2, 2]), [3])
+
+
+class TestDetector(unittest.TestCase):
+    def test_detect(self):
+        records = make_records(make_values(10, 11))
+        # shuffled records are ordered by date
+        records = records[::2] + records[1::2]
+        records += make_records(make_values(10, 10), threads=8)
+        for method in ['e-divisive', 'cusum']:
+            reports = ChangePointDetector(dict(method=method))(records)
+            self.assertEqual(len(reports), 1)
+            report = reports[0]
+            self.assertEqual(report['metas'], dict(threads=4))
+            self.assertEqual(report['campaign'], 'hpcbench-10')
+            self.assertEqual(report['previous'], 'hpcbench-09')
+            self.assertEqual(report['date'], '2018-01-11T00:00:00')
+            self.assertAlmostEqual(report['change'], 0.1, 1)
+
+    def test_config(self):
+        records = make_records(make_values(10, 11))
+        detector = ChangePointDetector(dict(metrics=['main__bandwidth']))
+        self.assertEqual(detector(records), [])
+        detector = ChangePointDetector(dict(statistic='stddev'))
+        self.assertEqual(detector(records), [])
+        with self.assertRaises(Exception):
+            ChangePointDetector(dict(method='pelt'))
+        with self.assertRaises(Exception):
+            ChangePointDetector(dict(statistic='p42'))
+
+
+class TestHistory(unittest.TestCase):
+    def test_benumb(self):
+        campaign_file = osp.join(osp.dirname(__file__), 'test_driver.yaml')
+        with mkdtemp() as path, pushd(path):
+            driver = bensh.main(campaign_file)
+            history_file = osp.join(path, 'history.ndjson')
+            for _ in range(2):
+                # campaign is appended once
+                benumb.main(['--history', history_file,
+                             driver.campaign_path])
+            records = history.load(history_file)
+            self.assertEqual(
+                set(record['metric'] for record in records),
+                set(['main__performance', 'main__standard_error'])
+            )
+            self.assertEqual(len(records), 6)
+            record = records[0]
+            self.assertEqual(record['campaign'],
+                             osp.basename(driver.campaign_path))
+            self.assertEqual(record['benchmark'], 'fake')
+            self.assertEqual(record['count'], 1)
+            self.assertIsNotNone(record['date'])
+
+    def test_benhistory(self):
+        with mkdtemp() as path, pushd(path):
+            with open('history.ndjson', 'w') as ostr:
+                for record in make_records(make_values(10, 11)):
+                    ostr.write(json.dumps(record) + '\n')
+            status = benhistory.main(['-o', 'changes.json',
+                                      'history.ndjson'])
+            self.assertEqual(status, benhistory.EXIT_CHANGE)
+            with open('changes.json') as istr:
+                reports = json.load(istr)
+            self.assertEqual(reports[0]['campaign'], 'hpcbench-10')
+            status = benhistory.main(['-o', 'changes.json', '--metric',
+                                      'main__bandwidth', 'history.ndjson'])
+            self.assertEqual(status, 0)
@@ -0,0 +1,55 @@
+import os.path as osp
+import unittest
+
+from hpcbench.export.openmetrics import Textfile
+from hpcbench.toolbox.contextlib_ext import mkdtemp
+
+
+class TestTextfile(unittest.TestCase):
+    RUN = dict(
+        hostname='node01',
+        benchmark='sysbench',
+        category='cpu',
+        metas=dict(thread=4, host='n"1'),
+        metrics=dict(
+            cpu=dict(average=0.03, total_time=1, label='ignored')
+        ),
+    )
+
+    def test_write(self):
+        with mkdtemp() as path:
+            textfile = Textfile(osp.join(path, 'hpcbench.prom'))
+            textfile.add_run(self.RUN)
+            textfile.write()
+            with open(textfile.path) as istr:
+                content = istr.read()
+        labels = ('host="node01",benchmark="sysbench",category="cpu",'
+                  'meta_host="n\\"1",thread="4"')
+        self.assertEqual(
+            content,
+            '# TYPE hpcbench_cpu_average gauge\n'
+            'hpcbench_cpu_average{' + labels + '} 0.03\n'
+            '# TYPE hpcbench_cpu_total_time gauge\n'
+            'hpcbench_cpu_total_time{' + labels + '} 1\n'
+            '# EOF\n'
+        )
+
+    def test_keep_previous_samples(self):
+        with mkdtemp() as path:
+            textfile = Textfile(osp.join(path, 'hpcbench.prom'))
+            textfile.add_run(self.RUN)
+            textfile.write()
+            other_run = dict(self.RUN, metas=dict(thread=8))
+            other_run['metrics'] = dict(cpu=dict(average=0.05))
+            textfile = Textfile(textfile.path)
+            textfile.add_run(other_run)
+            textfile.add_run(other_run)
+            textfile.write()
+            samples = Textfile(textfile.path).samples
+        self.assertEqual(len(samples['hpcbench_cpu_average']), 2)
+        self.assertEqual(len(samples['hpcbench_cpu_total_time']), 1)
+        self.assertIn(0.05, samples['hpcbench_cpu_average'].values())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import unittest
+
+from hpcbench.plot import (
+    plot_errorbars,
+    Plotter,
+)
+from hpcbench.summary import summarize
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+
+
+def make_runs():
+    runs = []
+    for threads in [1, 2]:
+        for repetition in range(5):
+            runs.append(dict(
+                metas=dict(threads=threads),
+                metrics=dict(main=dict(
+                    time=10.0 / threads + repetition,
+                    label='run',
+                    valid=True,
+                )),
+            ))
+    runs.append(dict(metas=dict(threads=4), metrics=dict(
+        main=dict(time=1.0)
+    )))
+    return runs
+
+
+class TestSummary(unittest.TestCase):
+    def test_summarize(self):
+        groups = summarize(make_runs())
+        self.assertEqual(
+            [(group['metas'], group['count']) for group in groups],
+            [(dict(threads=1), 5), (dict(threads=2), 5),
+             (dict(threads=4), 1)]
+        )
+        # only numeric metrics are summarized
+        self.assertEqual(list(groups[0]['metrics']['main']), ['time'])
+        stats = groups[0]['metrics']['main']['time']
+        self.assertEqual(stats['count'], 5)
+        self.assertEqual(stats['mean'], 12.0)
+        self.assertEqual(stats['median'], 12.0)
+        self.assertEqual(stats['min'], 10.0)
+        self.assertEqual(stats['max'], 14.0)
+        self.assertAlmostEqual(stats['stddev'], 2.5 ** 0.5)
+        self.assertEqual(stats['p25'], 11.0)
+        self.assertLessEqual(stats['ci_low'], stats['mean'])
+        self.assertGreaterEqual(stats['ci_high'], stats['mean'])
+        self.assertGreaterEqual(stats['ci_low'], stats['min'])
+        self.assertLessEqual(stats['ci_high'], stats['max'])
+
+    def test_single_run(self):
+        stats = summarize(make_runs())[2]['metrics']['main']['time']
+        self.assertIsNone(stats['stddev'])
+        self.assertEqual((stats['ci_low'], stats['ci_high']), (1.0, 1.0))
+
+    def test_reproducible(self):
+        self.assertEqual(summarize(make_runs()), summarize(make_runs()))
+
+    def test_empty(self):
+        self.assertEqual(summarize([]), [])
+
+
+class TestErrorBars(unittest.TestCase):
+    DESCRIPTION = dict(
+        name='{category} time',
+        series=dict(metas=['threads'], metrics=['main__time']),
+        errors='ci',
+        plotter=plot_errorbars,
+    )
+
+    def test_series(self):
+        groups = summarize(make_runs())
+        metas, metrics = Plotter.build_summary_series(
+            self.DESCRIPTION, groups
+        )
+        self.assertEqual(metas, dict(threads=[1, 2, 4]))
+        self.assertEqual(metrics['main__time'], [12.0, 7.0, 1.0])
+        self.assertEqual(len(metrics['main__time__error']), 3)
+        self.assertEqual(metrics['main__time__error'][2], (0.0, 0.0))
+
+    def test_plot(self):
+        runs = make_runs()
+        with mkdtemp() as path, pushd(path):
+            plotter = Plotter(runs, summary=summarize(runs), category='main')
+            plotter(self.DESCRIPTION)
+            self.assertEqual(os.listdir(path),
+                             [Plotter.get_filename(self.DESCRIPTION)])
@@ -0,0 +1,59 @@
+from abc import ABCMeta, abstractmethod
+import unittest
+
+from six import with_metaclass
+
+from hpcbench.toolbox.class_lib import ClassRegistrar
+
+
+class RegistrarABCMeta(ClassRegistrar, ABCMeta):
+    pass
+
+
+class Base(with_metaclass(RegistrarABCMeta, object)):
+    @abstractmethod
+    def run(self):
+        pass
+
+
+class Direct(Base):
+    name = 'direct'
+
+    def run(self):
+        pass
+
+
+class Indirect(Direct):
+    name = 'indirect'
+
+
+class InheritedName(Direct):
+    pass
+
+
+class TestClassRegistrar(unittest.TestCase):
+    def test_get_subclass(self):
+        self.assertIs(Base.get_subclass('direct'), Direct)
+        self.assertIs(Base.get_subclass('indirect'), Indirect)
+
+    def test_abstract_not_registered(self):
+        self.assertEqual(set(Base.get_subclasses()), {'direct', 'indirect'})
+        with self.assertRaises(TypeError):
+            Base()
+
+    def test_alias(self):
+        Base.register_subclass(Indirect, 'alias')
+        self.assertIs(Base.get_subclass('alias'), Indirect)
+        del Base.SUB_CLASSES['alias']
+
+    def test_conflict(self):
+        with self.assertRaises(Exception):
+            class Conflict(Base):
+                name = 'direct'
+
+                def run(self):
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
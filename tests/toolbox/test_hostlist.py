@@ -0,0 +1,30 @@
+import unittest
+
+from hpcbench.toolbox.hostlist import expand_hostlist
+
+
+class TestHostlist(unittest.TestCase):
+    def expand(self, hostlist):
+        return list(expand_hostlist(hostlist))
+
+    def test_plain(self):
+        self.assertEqual(self.expand('srv01'), ['srv01'])
+        self.assertEqual(self.expand('srv01,srv02'), ['srv01', 'srv02'])
+
+    def test_range(self):
+        self.assertEqual(self.expand('srv[1-3]'), ['srv1', 'srv2', 'srv3'])
+        self.assertEqual(self.expand('srv[008-010,42]'),
+                         ['srv008', 'srv009', 'srv010', 'srv42'])
+        self.assertEqual(len(self.expand('srv[001-512]')), 512)
+
+    def test_product(self):
+        self.assertEqual(self.expand('r[1-2]-cn[01-02],gpu'),
+                         ['r1-cn01', 'r1-cn02', 'r2-cn01', 'r2-cn02', 'gpu'])
+
+    def test_invalid_range(self):
+        with self.assertRaises(Exception):
+            self.expand('srv[3-1]')
+
+
+if __name__ == '__main__':
+    unittest.main()
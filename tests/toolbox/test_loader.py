@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import unittest
+
+from hpcbench.api import Benchmark
+from hpcbench.toolbox.loader import (
+    entry_points,
+    load_entry_point,
+)
+
+
+class TestLoader(unittest.TestCase):
+    def test_entry_points(self):
+        self.assertIn('sysbench', entry_points('hpcbench.benchmarks'))
+        self.assertIn('csv', entry_points('hpcbench.exporters'))
+
+    def test_load_entry_point(self):
+        module, = load_entry_point('hpcbench.benchmarks', 'sysbench')
+        self.assertEqual(module.__name__, 'hpcbench.benchmark.sysbench')
+        self.assertEqual(load_entry_point('hpcbench.benchmarks', 'unknown'),
+                         [])
+
+    def test_get_subclass(self):
+        self.assertEqual(Benchmark.get_subclass('sysbench').name, 'sysbench')
+        with self.assertRaises(NameError):
+            Benchmark.get_subclass('unknown')
+
+    def test_lazy_cli_imports(self):
+        code = (
+            'import sys\n'
+            'import hpcbench.cli.bensh\n'
+            'for module in ["matplotlib", "elasticsearch", "jinja2", "numpy",\n'
+            '               "pkg_resources", "hpcbench.benchmark.sysbench"]:\n'
+            '    assert module not in sys.modules, module\n'
+        )
+        subprocess.check_call([sys.executable, '-c', code])
+
+
+if __name__ == '__main__':
+    unittest.main()
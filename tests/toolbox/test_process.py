@@ -0,0 +1,34 @@
+import os
+import os.path as osp
+import unittest
+
+from hpcbench.toolbox.contextlib_ext import (
+    mkdtemp,
+    pushd,
+)
+from hpcbench.toolbox.process import build_once
+
+
+class TestBuildOnce(unittest.TestCase):
+    def test_build_once(self):
+        with mkdtemp() as path, pushd(path):
+            builds = osp.join(path, 'builds')
+            command = ['sh', '-c', 'echo >> %s; echo 42 > tool' % builds]
+            executables = set()
+            for run_dir in ['run0', 'run1']:
+                with pushd(run_dir, mkdir=True):
+                    executables.add(build_once(command, 'tool'))
+                    with open('tool') as istr:
+                        self.assertEqual(istr.read(), '42\n')
+            with open(builds) as istr:
+                self.assertEqual(len(istr.readlines()), 1)
+            # another build configuration is compiled separately
+            with pushd('run2', mkdir=True):
+                executables.add(build_once(command + ['-O2'], 'tool'))
+            with open(builds) as istr:
+                self.assertEqual(len(istr.readlines()), 2)
+            self.assertEqual(len(executables), 2)
+            self.assertEqual(set(map(osp.dirname, executables)),
+                             set(osp.join(path, name)
+                                 for name in os.listdir(path)
+                                 if name.startswith('build-')))
@@ -0,0 +1,16 @@
+import re
+import unittest
+
+from hpcbench.toolbox.re_ext import has_flags
+
+
+class TestHasFlags(unittest.TestCase):
+    def test_has_flags(self):
+        self.assertFalse(has_flags(re.compile('srv0')))
+        self.assertFalse(has_flags(re.compile(b'srv0')))
+        self.assertTrue(has_flags(re.compile('(?i)srv0')))
+        self.assertTrue(has_flags(re.compile('srv0', re.MULTILINE)))
+        self.assertFalse(has_flags(re.compile('srv0', re.MULTILINE),
+                                   re.MULTILINE))
+        self.assertTrue(has_flags(re.compile('(?s)srv0', re.MULTILINE),
+                                  re.MULTILINE))
@@ -0,0 +1,60 @@
+import unittest
+
+from hpcbench.toolbox.search import (
+    bisection,
+    golden_section,
+    improves,
+    refinement,
+)
+
+
+class Counter(object):
+    """Memoized evaluation of a list of values, counting evaluations"""
+    def __init__(self, values):
+        self.values = values
+        self.evaluated = set()
+
+    def __call__(self, index):
+        self.evaluated.add(index)
+        return self.values[index]
+
+
+# throughput by thread count, saturating at index 11
+SATURATION = [10.0 * min(i, 11) + 1 for i in range(64)]
+
+
+class TestSearch(unittest.TestCase):
+    def test_improves(self):
+        self.assertTrue(improves(10, 11, tolerance=0.05))
+        self.assertFalse(improves(10, 10.4, tolerance=0.05))
+        self.assertFalse(improves(10, 11, goal='minimize'))
+        self.assertTrue(improves(10, 8, goal='minimize'))
+
+    def test_bisection(self):
+        evaluate = Counter(SATURATION)
+        self.assertEqual(bisection(evaluate, len(SATURATION)), 11)
+        self.assertLessEqual(len(evaluate.evaluated), 14)
+        self.assertEqual(bisection(Counter([1.0]), 1), 0)
+        self.assertEqual(bisection(Counter([1.0, 2.0, 4.0]), 3), 2)
+
+    def test_bisection_minimize(self):
+        durations = [100.0 / min(i + 1, 5) for i in range(20)]
+        self.assertEqual(
+            bisection(Counter(durations), 20, goal='minimize'), 4
+        )
+
+    def test_golden_section(self):
+        values = [-(i - 37) ** 2 for i in range(100)]
+        evaluate = Counter(values)
+        self.assertEqual(golden_section(evaluate, len(values)), 37)
+        self.assertLess(len(evaluate.evaluated), 25)
+        evaluate = Counter([(i - 3) ** 2 for i in range(10)])
+        self.assertEqual(golden_section(evaluate, 10, goal='minimize'), 3)
+        self.assertEqual(golden_section(Counter([5, 4]), 2), 0)
+
+    def test_refinement(self):
+        evaluate = Counter(SATURATION)
+        self.assertEqual(refinement(evaluate, len(SATURATION)), 11)
+        self.assertLess(len(evaluate.evaluated), 20)
+        self.assertEqual(refinement(Counter([1.0, 2.0, 4.0]), 3), 2)
+        self.assertEqual(refinement(Counter([1.0, 1.0, 1.0]), 3), 0)
@@ -0,0 +1,131 @@
+import itertools
+import unittest
+
+from hpcbench.toolbox.sweep import (
+    sweep,
+    values,
+)
+
+
+class TestValues(unittest.TestCase):
+    def test_literals(self):
+        self.assertEqual(list(values([1, 2, 3])), [1, 2, 3])
+        self.assertEqual(list(values('foo')), ['foo'])
+        self.assertEqual(list(values(None)), [None])
+
+    def test_range(self):
+        self.assertEqual(list(values(dict(range=dict(start=1, stop=4)))),
+                         [1, 2, 3, 4])
+        self.assertEqual(
+            list(values(dict(range=dict(start=0.0, stop=0.3, step=0.1)))),
+            [0.0, 0.1, 0.2, 0.30000000000000004]
+        )
+
+    def test_geometric(self):
+        self.assertEqual(
+            list(values(dict(geometric=dict(start=1, stop=64)))),
+            [1, 2, 4, 8, 16, 32, 64]
+        )
+        self.assertEqual(
+            list(values(dict(geometric=dict(start=3, stop=100, factor=3)))),
+            [3, 9, 27, 81]
+        )
+
+    def test_stalled_series(self):
+        with self.assertRaises(Exception):
+            list(values(dict(range=dict(start=1, stop=2, step=0))))
+
+    def test_diverging_series(self):
+        invalid_series = [
+            dict(range=dict(start=1, stop=2, step=-1)),
+            dict(geometric=dict(start=1, stop=64, factor=1)),
+            dict(geometric=dict(start=1, stop=64, factor=0.5)),
+            dict(geometric=dict(start=-1, stop=64)),
+            dict(geometric=dict(start=0, stop=64)),
+        ]
+        for spec in invalid_series:
+            with self.assertRaises(Exception):
+                values(spec)
+
+
+class TestSweep(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(list(sweep(None)), [{}])
+
+    def test_parameters_product(self):
+        self.assertEqual(
+            list(sweep(dict(b=[1, 2], a=dict(range=dict(start=0, stop=1))))),
+            [
+                dict(a=0, b=1), dict(a=0, b=2),
+                dict(a=1, b=1), dict(a=1, b=2),
+            ]
+        )
+
+    def test_zip(self):
+        self.assertEqual(
+            list(sweep(dict(zip=[
+                dict(block_size=['4K', '1M', '4M']),
+                dict(mode=['rndrw', 'seqwr']),
+            ]))),
+            [
+                dict(block_size='4K', mode='rndrw'),
+                dict(block_size='1M', mode='seqwr'),
+            ]
+        )
+
+    def test_chain(self):
+        self.assertEqual(
+            list(sweep(dict(chain=[dict(a=[1, 2]), dict(b=3)]))),
+            [dict(a=1), dict(a=2), dict(b=3)]
+        )
+
+    def test_product_exclude(self):
+        spec = dict(
+            product=[
+                dict(threads=dict(geometric=dict(start=1, stop=32))),
+                dict(zip=[
+                    dict(block_size=['4K', '1M']),
+                    dict(mode=['rndrw', 'seqwr']),
+                ]),
+            ],
+            exclude=[
+                dict(threads__gt=4, block_size='4K'),
+                dict(threads=1),
+                dict(unknown=42),
+            ]
+        )
+        points = list(sweep(spec))
+        self.assertEqual(len(points), 12 - 2 - 3)
+        self.assertEqual(
+            points[:3],
+            [
+                dict(threads=2, block_size='4K', mode='rndrw'),
+                dict(threads=2, block_size='1M', mode='seqwr'),
+                dict(threads=4, block_size='4K', mode='rndrw'),
+            ]
+        )
+        self.assertEqual(list(sweep(spec)), points)
+
+    def test_nested_exclude(self):
+        spec = dict(product=[
+            dict(a=[1, 2, 3], exclude=[dict(a=2)]),
+            dict(b=[1, 2]),
+        ])
+        self.assertEqual([p['a'] for p in sweep(spec)], [1, 1, 3, 3])
+
+    def test_lazy(self):
+        # 10^12 points, never materialized
+        spec = dict(product=[
+            dict(a=dict(range=dict(start=1, stop=10 ** 6))),
+            dict(b=dict(range=dict(start=1, stop=10 ** 6))),
+        ])
+        self.assertEqual(
+            list(itertools.islice(sweep(spec), 3)),
+            [dict(a=1, b=1), dict(a=1, b=2), dict(a=1, b=3)]
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(Exception):
+            list(sweep(dict(product=[[1, 2]])))
+        with self.assertRaises(Exception):
+            list(sweep(dict(product=[], a=[1])))